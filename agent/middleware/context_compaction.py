@@ -0,0 +1,190 @@
+# agent/middleware/context_compaction.py
+"""History compaction for long agent sessions.
+
+Every model call normally receives the full message history, including large
+tool outputs (doc files, scraper logs, HTML dumps) and large tool-call
+arguments (whole scripts passed to write_file). This middleware rewrites the
+*request* sent to the model - the stored conversation state is untouched -
+replacing stale tool payloads with short digests:
+
+- the system prompt is never touched (it's outside the message list)
+- the last `keep_recent_turns` assistant turns and everything after them stay verbatim
+- older tool outputs become a digest (head, tail, and key lines such as
+  returncode / errors / log paths) once they are `stale_after_turns` turns
+  old or longer than `max_tool_chars`
+- older tool-call string arguments longer than `max_arg_chars` are truncated
+
+Per-turn token counts (before/after compaction, and the provider's reported
+input tokens when available) are printed and kept in `.metrics`.
+"""
+import json
+import re
+from dataclasses import dataclass, field
+
+from langchain.agents.middleware import AgentMiddleware, ModelRequest
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:  # optional; fall back to ~4 chars per token
+    _ENCODING = None
+
+# Lines worth keeping from a compacted tool output
+KEY_LINE = re.compile(r"returncode=|Return Code:|Error|Traceback|Exception|📝|Saved this run|✓|✗", re.IGNORECASE)
+
+
+def count_tokens(text: str) -> int:
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return len(text) // 4
+
+
+def _text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, str):
+        text = content
+    else:
+        text = json.dumps(content, default=str)
+    if isinstance(message, AIMessage) and message.tool_calls:
+        text += json.dumps([call.get("args") for call in message.tool_calls], default=str)
+    return text
+
+
+def digest(text: str, head_chars: int = 600, tail_chars: int = 400, max_key_lines: int = 12) -> str:
+    """Short stand-in for a long tool output: head, key lines from the middle, tail."""
+    if len(text) <= head_chars + tail_chars:
+        return text
+    head = text[:head_chars]
+    tail = text[-tail_chars:]
+    middle = text[head_chars:-tail_chars]
+    key_lines = [line.strip() for line in middle.splitlines() if KEY_LINE.search(line)][:max_key_lines]
+    parts = [head, f"\n[... compacted {len(text)} chars / {text.count(chr(10)) + 1} lines ...]"]
+    if key_lines:
+        parts.append("\n" + "\n".join(key_lines))
+    parts.append("\n[...]\n" + tail)
+    return "".join(parts)
+
+
+@dataclass
+class TurnMetrics:
+    turn: int
+    messages: int
+    tokens_before: int
+    tokens_after: int
+    compacted_messages: int
+    input_tokens_reported: int | None = None
+
+
+@dataclass
+class ContextCompactionMiddleware(AgentMiddleware):
+    """Replace stale tool payloads in the model request with short digests."""
+
+    keep_recent_turns: int = 4
+    stale_after_turns: int = 2
+    max_tool_chars: int = 4000
+    max_arg_chars: int = 1500
+    verbose: bool = True
+    metrics: list[TurnMetrics] = field(default_factory=list)
+    _cache: dict = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        super().__init__()
+
+    # -- compaction --------------------------------------------------------
+
+    def _compact_tool(self, message: ToolMessage) -> ToolMessage:
+        key = ("tool", message.tool_call_id)
+        if key not in self._cache:
+            text = message.content if isinstance(message.content, str) else json.dumps(message.content, default=str)
+            self._cache[key] = message.model_copy(update={"content": digest(text)})
+        return self._cache[key]
+
+    def _compact_ai(self, message: AIMessage) -> AIMessage:
+        key = ("ai", message.id or id(message))
+        if key not in self._cache:
+            calls = []
+            for call in message.tool_calls:
+                args = {
+                    name: (
+                        value[: self.max_arg_chars] + f"\n[... compacted {len(value)} chars ...]"
+                        if isinstance(value, str) and len(value) > self.max_arg_chars
+                        else value
+                    )
+                    for name, value in (call.get("args") or {}).items()
+                }
+                calls.append({**call, "args": args})
+            self._cache[key] = message.model_copy(update={"tool_calls": calls})
+        return self._cache[key]
+
+    def compact(self, messages: list[BaseMessage]) -> tuple[list[BaseMessage], int]:
+        """Return (compacted messages, number of messages rewritten)."""
+        ai_positions = [i for i, m in enumerate(messages) if isinstance(m, AIMessage)]
+        # Everything from the start of the k-th most recent assistant turn stays verbatim
+        if len(ai_positions) <= self.keep_recent_turns:
+            return messages, 0
+        verbatim_from = ai_positions[-self.keep_recent_turns]
+
+        out = []
+        rewritten = 0
+        for i, message in enumerate(messages):
+            if i >= verbatim_from:
+                out.append(message)
+                continue
+            turns_since = sum(1 for p in ai_positions if p > i)
+            if isinstance(message, ToolMessage):
+                size = len(_text(message))
+                if size > 1000 and (turns_since >= self.stale_after_turns or size > self.max_tool_chars):
+                    message = self._compact_tool(message)
+                    rewritten += 1
+            elif isinstance(message, AIMessage) and message.tool_calls:
+                if any(
+                    isinstance(v, str) and len(v) > self.max_arg_chars
+                    for call in message.tool_calls
+                    for v in (call.get("args") or {}).values()
+                ):
+                    message = self._compact_ai(message)
+                    rewritten += 1
+            out.append(message)
+        return out, rewritten
+
+    def _prepare(self, request: ModelRequest) -> tuple[ModelRequest, TurnMetrics]:
+        before = sum(count_tokens(_text(m)) for m in request.messages)
+        compacted, rewritten = self.compact(list(request.messages))
+        after = sum(count_tokens(_text(m)) for m in compacted) if rewritten else before
+        turn = TurnMetrics(
+            turn=len(self.metrics) + 1,
+            messages=len(compacted),
+            tokens_before=before,
+            tokens_after=after,
+            compacted_messages=rewritten,
+        )
+        return request.override(messages=compacted), turn
+
+    def _record(self, turn: TurnMetrics, response) -> None:
+        for message in getattr(response, "result", None) or []:
+            usage = getattr(message, "usage_metadata", None)
+            if usage:
+                turn.input_tokens_reported = usage.get("input_tokens")
+        self.metrics.append(turn)
+        if self.verbose:
+            reported = f" reported_input={turn.input_tokens_reported}" if turn.input_tokens_reported else ""
+            print(
+                f"[context] turn={turn.turn} messages={turn.messages} "
+                f"tokens={turn.tokens_before}->{turn.tokens_after} compacted={turn.compacted_messages}{reported}"
+            )
+
+    # -- middleware hooks --------------------------------------------------
+
+    def wrap_model_call(self, request, handler):
+        request, turn = self._prepare(request)
+        response = handler(request)
+        self._record(turn, response)
+        return response
+
+    async def awrap_model_call(self, request, handler):
+        request, turn = self._prepare(request)
+        response = await handler(request)
+        self._record(turn, response)
+        return response
@@ -0,0 +1,119 @@
+"""Parse only what you need: helpers for extraction hot loops.
+
+Scroll loops re-parse the whole page every round, but usually only need one
+kind of element (job rows, company headers, the <main> of a docs page) or
+just the links. These helpers avoid building the full tree:
+
+- parse_only(html, strainer): BeautifulSoup with a SoupStrainer, so only
+  matching elements (and their descendants) are turned into Tag objects
+- compile_selector(css): soupsieve selectors compiled once and reused
+  across calls instead of re-parsing the CSS string every round
+- scan_hrefs(html): every <a href> on the page without building a tree at
+  all (a regex by default, or html.parser's tokenizer with strict=True)
+
+    JOB_ROWS = class_strainer("job-list-job")
+    JOB_ROW = compile_selector(".job-list-job")
+
+    soup = parse_only(html, JOB_ROWS)
+    for row in JOB_ROW.select(soup):
+        ...
+
+    external = {url for url in scan_hrefs(html, base_url) if is_external(url)}
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from html import unescape
+from html.parser import HTMLParser
+from typing import Iterator, List, Optional
+from urllib.parse import urljoin
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+DEFAULT_PARSER = "html.parser"
+
+
+# ---------------------------------------------------------------------------
+# Partial trees
+# ---------------------------------------------------------------------------
+
+def class_strainer(class_name: str, tag: str | None = None) -> SoupStrainer:
+    """Keep only elements having CSS class `class_name` (optionally of one tag)."""
+    # While parsing, the strainer sees the raw class attribute ("a b"), so a
+    # plain string would only match elements with exactly that one class
+    return SoupStrainer(tag, class_=re.compile(rf"(?:^|\s){re.escape(class_name)}(?:\s|$)"))
+
+
+def tag_strainer(*names: str) -> SoupStrainer:
+    """Keep only elements with one of these tag names, e.g. tag_strainer("main")."""
+    return SoupStrainer(list(names) if len(names) > 1 else names[0])
+
+
+def parse_only(html: str, strainer: SoupStrainer, parser: str = DEFAULT_PARSER) -> BeautifulSoup:
+    """
+    Parse just the parts of `html` matched by `strainer`.
+
+    Matching elements keep their full subtree; everything else is skipped
+    while parsing. Note that html5lib ignores `parse_only`.
+    """
+    return BeautifulSoup(html, parser, parse_only=strainer)
+
+
+@lru_cache(maxsize=256)
+def compile_selector(css: str) -> soupsieve.SoupSieve:
+    """
+    Compile a CSS selector once. The result has .select(tag), .select_one(tag),
+    .match(tag) and .filter(tag); calls with the same string share one object.
+    """
+    return soupsieve.compile(css)
+
+
+# ---------------------------------------------------------------------------
+# Link-only harvests
+# ---------------------------------------------------------------------------
+
+_HREF_RE = re.compile(
+    r"""<a\b[^>]*?\shref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""",
+    re.IGNORECASE,
+)
+
+
+class _HrefParser(HTMLParser):
+    """Collects <a href> values with html.parser's tokenizer (skips scripts and comments)."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.hrefs: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            for name, value in attrs:
+                if name == "href" and value:
+                    self.hrefs.append(value)
+                    break
+
+
+def scan_hrefs(html: str, base_url: Optional[str] = None, strict: bool = False) -> Iterator[str]:
+    """
+    Yield the href of every <a> in `html`, in document order, without
+    building a tree. Relative URLs are resolved against `base_url` if given.
+
+    The default regex scan is the fastest but also matches links inside
+    <script> text and HTML comments; filter the results (as link harvests do
+    anyway) or pass strict=True to tokenize with html.parser instead.
+    """
+    if strict:
+        parser = _HrefParser()
+        parser.feed(html)
+        parser.close()
+        hrefs: Iterator[str] = iter(parser.hrefs)
+    else:
+        hrefs = (unescape(m.group(1) or m.group(2) or m.group(3) or "") for m in _HREF_RE.finditer(html))
+    for href in hrefs:
+        href = href.strip()
+        if not href:
+            continue
+        yield urljoin(base_url, href) if base_url else href
@@ -0,0 +1,658 @@
+"""Coordinator/worker mode: spread a full refresh over several processes or machines.
+
+The coordinator owns the task list and the jobs store; workers run the
+existing scrapers and stream the jobs they find back over HTTP.
+
+- Tasks ("usv_board", "usv_company", "bvp_board", "bvp_job", ...) are
+  sharded over the live workers with a consistent-hash ring on the task's
+  shard key (company slug, ATS host), so a worker joining or leaving only
+  moves ~1/N of the shards. A worker whose shard is empty steals from others.
+- Workers lease tasks for `lease_seconds`; their background heartbeat
+  extends the lease. A lease that runs out (worker died) puts the task back,
+  up to `max_attempts`.
+- Board tasks discover companies / job URLs and submit them as new tasks.
+- Scrapers keep calling store_job(): a worker points JOBS_DB_PATH at a local
+  spool file and streams new lines to the coordinator in batches. The
+  coordinator saves each batch with store_jobs(), skipping postings already
+  accepted in this run (a retried task re-sends its rows).
+
+Protocol: JSON over HTTP POST (/lease, /submit, /results, /complete,
+/heartbeat) plus GET /status. Set CRAWL_TOKEN on both sides to require a
+shared token.
+
+    # one machine, three worker processes
+    python -m agent.skills.crawling.coordinator local --workers 3 --seed usv --seed bvp
+
+    # several machines
+    python -m agent.skills.crawling.coordinator serve --host 0.0.0.0 --port 8770 --seed usv
+    python -m agent.skills.crawling.coordinator worker http://coordinator-host:8770
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import hashlib
+import json
+import multiprocessing
+import os
+import socket
+import tempfile
+import threading
+import time
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from agent.skills.crawling.url_canon import posting_key
+from agent.skills.jobs_database.jobs_database_functions import jobs_file_path, store_jobs
+
+DEFAULT_PORT = 8770
+TOKEN_HEADER = "X-Crawl-Token"
+
+
+# ---------------------------------------------------------------------------
+# Sharding
+# ---------------------------------------------------------------------------
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent-hash ring with `vnodes` virtual points per node."""
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 64):
+        self.vnodes = vnodes
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self.nodes: set[str] = set()
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str) -> None:
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for i in range(self.vnodes):
+            point = _hash(f"{node}#{i}")
+            idx = bisect.bisect(self._points, point)
+            self._points.insert(idx, point)
+            self._owners.insert(idx, node)
+
+    def remove(self, node: str) -> None:
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        keep = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in keep]
+        self._owners = [o for _, o in keep]
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        idx = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[idx]
+
+
+# ---------------------------------------------------------------------------
+# Coordinator
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Task:
+    kind: str
+    key: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    shard: str = ""
+    state: str = "pending"          # pending | leased | done | failed
+    attempts: int = 0
+    worker: Optional[str] = None
+    lease_expires: float = 0.0
+    error: str = ""
+
+    @property
+    def task_id(self) -> str:
+        return f"{self.kind}:{self.key}"
+
+    def wire(self) -> Dict[str, Any]:
+        return {"task_id": self.task_id, "kind": self.kind, "key": self.key, "payload": self.payload}
+
+
+class Coordinator:
+    """
+    Task table, worker ring and merged store. Thread-safe; served by serve().
+
+    Args:
+        jobs_file: Store that merged results are saved to (default jobs_file_path())
+        lease_seconds: How long a task stays leased without a heartbeat
+        worker_ttl: A worker silent for this long leaves the ring
+        max_attempts: Leases per task before it is marked failed
+        steal: Let a worker with an empty shard take other shards' tasks
+    """
+
+    def __init__(
+        self,
+        jobs_file: Path | None = None,
+        lease_seconds: float = 120.0,
+        worker_ttl: float = 60.0,
+        max_attempts: int = 3,
+        steal: bool = True,
+    ):
+        self.jobs_file = Path(jobs_file) if jobs_file else jobs_file_path()
+        self.lease_seconds = lease_seconds
+        self.worker_ttl = worker_ttl
+        self.max_attempts = max_attempts
+        self.steal = steal
+        self.tasks: Dict[str, Task] = {}
+        self.ring = HashRing()
+        self.workers: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"accepted": 0, "duplicates": 0, "batches": 0}
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+        self._seen: set[str] = set()  # posting keys accepted in this run
+
+    # -- tasks -------------------------------------------------------------
+
+    def submit(self, tasks: Iterable[Dict[str, Any]]) -> int:
+        """Add tasks ({"kind", "key", "payload", "shard"}); known task ids are ignored."""
+        added = 0
+        with self._lock:
+            for t in tasks:
+                task = Task(t["kind"], t["key"], t.get("payload") or {}, t.get("shard") or t["key"])
+                if task.task_id not in self.tasks:
+                    self.tasks[task.task_id] = task
+                    added += 1
+            if added:
+                self.done.clear()
+        return added
+
+    def _touch(self, worker_id: str, now: float) -> None:
+        info = self.workers.setdefault(worker_id, {"tasks_done": 0, "tasks_failed": 0, "records": 0})
+        info["last_seen"] = now
+        self.ring.add(worker_id)
+        for task in self.tasks.values():
+            if task.state == "leased" and task.worker == worker_id:
+                task.lease_expires = now + self.lease_seconds
+
+    def _reap(self, now: float) -> None:
+        for worker_id, info in self.workers.items():
+            if worker_id in self.ring.nodes and now - info["last_seen"] > self.worker_ttl:
+                print(f"[coordinator] worker {worker_id} timed out, leaving the ring")
+                self.ring.remove(worker_id)
+        for task in self.tasks.values():
+            if task.state == "leased" and task.lease_expires <= now:
+                self._release(task, f"lease expired on {task.worker}")
+
+    def _release(self, task: Task, error: str) -> None:
+        task.error, task.worker = error, None
+        task.state = "failed" if task.attempts >= self.max_attempts else "pending"
+
+    def _check_done(self) -> None:
+        if self.tasks and all(t.state in ("done", "failed") for t in self.tasks.values()):
+            self.done.set()
+
+    def lease(self, worker_id: str, n: int = 1) -> Dict[str, Any]:
+        """Lease up to `n` tasks from the worker's shard (or stolen ones)."""
+        now = time.time()
+        with self._lock:
+            self._touch(worker_id, now)
+            self._reap(now)
+            self._check_done()
+            if self.done.is_set():
+                return {"tasks": [], "done": True}
+            pending = [t for t in self.tasks.values() if t.state == "pending"]
+            mine = [t for t in pending if self.ring.owner(t.shard) == worker_id]
+            if len(mine) < n and self.steal:
+                taken = {t.task_id for t in mine}
+                mine += [t for t in pending if t.task_id not in taken][: n - len(mine)]
+            leased = mine[:n]
+            for task in leased:
+                task.state, task.worker = "leased", worker_id
+                task.attempts += 1
+                task.lease_expires = now + self.lease_seconds
+            return {"tasks": [t.wire() for t in leased], "wait": 0 if leased else 1.0}
+
+    def complete(self, worker_id: str, task_id: str, ok: bool, error: str = "") -> None:
+        with self._lock:
+            self._touch(worker_id, time.time())
+            task = self.tasks.get(task_id)
+            if task is None or task.worker != worker_id:
+                return  # lease was lost and the task re-leased; ignore the stale report
+            if ok:
+                task.state, task.worker, task.error = "done", None, ""
+                self.workers[worker_id]["tasks_done"] += 1
+            else:
+                self._release(task, error)
+                self.workers[worker_id]["tasks_failed"] += 1
+                print(f"[coordinator] {task_id} failed on {worker_id} ({task.state}): {error}")
+            self._check_done()
+
+    # -- results -----------------------------------------------------------
+
+    def add_results(self, worker_id: str, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Save records whose posting (by posting_key) this run hasn't accepted yet, one store_jobs() per batch."""
+        with self._lock:
+            self._touch(worker_id, time.time())
+            jobs = []
+            for record in records:
+                url = record.get("job_url")
+                if not url:
+                    continue
+                key = posting_key(url)
+                if key in self._seen:
+                    continue
+                self._seen.add(key)
+                jobs.append(record)
+            result = store_jobs(jobs, jobs_file=self.jobs_file)
+            if not result.startswith("✓"):
+                # Not saved: let a retried task send these postings again
+                self._seen.difference_update(posting_key(j["job_url"]) for j in jobs)
+                print(f"[coordinator] batch from {worker_id} not saved: {result}")
+                jobs = []
+            accepted = len(jobs)
+            self.stats["accepted"] += accepted
+            self.stats["duplicates"] += len(records) - accepted
+            self.stats["batches"] += 1
+            self.workers[worker_id]["records"] += accepted
+        return {"accepted": accepted, "duplicates": len(records) - accepted}
+
+    def heartbeat(self, worker_id: str) -> None:
+        with self._lock:
+            self._touch(worker_id, time.time())
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+            for task in self.tasks.values():
+                counts[task.state] += 1
+            return {
+                "tasks": counts,
+                "results": dict(self.stats),
+                "workers": {w: dict(info) for w, info in self.workers.items()},
+                "ring": sorted(self.ring.nodes),
+                "failed": [asdict(t) for t in self.tasks.values() if t.state == "failed"][:20],
+            }
+
+
+def serve(coordinator: Coordinator, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """Start the coordinator's HTTP endpoint on a background thread."""
+    token = os.environ.get("CRAWL_TOKEN")
+    routes: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+        "/lease": lambda b: coordinator.lease(b["worker_id"], b.get("n", 1)),
+        "/submit": lambda b: {"added": coordinator.submit(b["tasks"])},
+        "/results": lambda b: coordinator.add_results(b["worker_id"], b["records"]),
+        "/complete": lambda b: coordinator.complete(b["worker_id"], b["task_id"], b["ok"], b.get("error", "")),
+        "/heartbeat": lambda b: coordinator.heartbeat(b["worker_id"]),
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, code: int, body: Any) -> None:
+            data = json.dumps(body if body is not None else {}).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _authorized(self) -> bool:
+            if token and self.headers.get(TOKEN_HEADER) != token:
+                self._reply(403, {"error": "bad token"})
+                return False
+            return True
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            if self.path == "/status":
+                self._reply(200, coordinator.status())
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            route = routes.get(self.path)
+            if route is None:
+                self._reply(404, {"error": "not found"})
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                self._reply(200, route(body))
+            except (KeyError, ValueError) as e:
+                self._reply(400, {"error": repr(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+class CoordinatorClient:
+    def __init__(self, url: str, worker_id: str, timeout: float = 30.0):
+        self.url = url.rstrip("/")
+        self.worker_id = worker_id
+        self.timeout = timeout
+        self.token = os.environ.get("CRAWL_TOKEN")
+
+    def call(self, path: str, body: Optional[Dict[str, Any]] = None, retries: int = 5) -> Dict[str, Any]:
+        data = None if body is None else json.dumps({"worker_id": self.worker_id, **body}).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers[TOKEN_HEADER] = self.token
+        for attempt in range(retries):
+            try:
+                req = urllib.request.Request(self.url + path, data=data, headers=headers)
+                with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                    return json.loads(resp.read() or b"{}")
+            except OSError:
+                if attempt == retries - 1:
+                    raise
+                time.sleep(min(10.0, 0.5 * 2 ** attempt))
+        return {}
+
+
+class ResultStreamer:
+    """
+    Tails the worker's spool file (where store_job() writes) and posts new
+    rows to the coordinator in batches; sends a heartbeat when idle.
+    """
+
+    def __init__(self, client: CoordinatorClient, spool: Path, batch_size: int = 200, interval: float = 2.0):
+        self.client = client
+        self.spool = spool
+        self.batch_size = batch_size
+        self.interval = interval
+        self.offset = 0
+        self.sent = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "ResultStreamer":
+        self.spool.write_bytes(b"")
+        self._thread.start()
+        return self
+
+    def flush(self) -> int:
+        with self._lock:
+            with open(self.spool, "rb") as f:
+                f.seek(self.offset)
+                data = f.read()
+            end = data.rfind(b"\n") + 1  # only whole lines; a row may be mid-write
+            if not end:
+                return 0
+            records = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+            for i in range(0, len(records), self.batch_size):
+                self.client.call("/results", {"records": records[i : i + self.batch_size]})
+            self.offset += end
+            self.sent += len(records)
+            return len(records)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.flush():
+                    self.client.call("/heartbeat", {})
+            except Exception as e:
+                print(f"[worker {self.client.worker_id}] stream error: {e}")
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+
+
+class WorkerContext:
+    """What task handlers get: a lazily started browser, a visit guard, and submit()."""
+
+    def __init__(self, client: CoordinatorClient):
+        self.client = client
+        self._playwright = None
+        self._browser = None
+        self._guard = None
+
+    @property
+    def browser(self):
+        if self._browser is None:
+            from playwright.sync_api import sync_playwright
+
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=True)
+        return self._browser
+
+    @property
+    def guard(self):
+        if self._guard is None:
+            from agent.skills.crawling.visit_guard import VisitGuard
+
+            self._guard = VisitGuard()
+        return self._guard
+
+    def submit(self, tasks: List[Dict[str, Any]]) -> int:
+        return self.client.call("/submit", {"tasks": tasks}).get("added", 0)
+
+    def close(self) -> None:
+        if self._browser is not None:
+            self._browser.close()
+            self._playwright.stop()
+        if self._guard is not None:
+            self._guard.report()
+
+
+HANDLERS: Dict[str, Callable[[Dict[str, Any], WorkerContext], None]] = {}
+
+
+def handler(kind: str):
+    """Register a task handler: fn(task, ctx). Jobs are stored with store_job()."""
+
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+
+    return register
+
+
+@handler("usv_board")
+def _usv_board(task: Dict[str, Any], ctx: WorkerContext) -> None:
+    from agent.skills.examples.infinite_scroll_consider import retrieve_jobs as usv
+
+    root = task["payload"].get("root", usv.ROOT)
+    page = ctx.browser.new_page()
+    try:
+        slugs = usv.discover_all_companies(page, root=root)
+    finally:
+        page.close()
+    ctx.submit([{"kind": "usv_company", "key": slug, "payload": {"root": root}} for slug in slugs])
+
+
+@handler("usv_company")
+def _usv_company(task: Dict[str, Any], ctx: WorkerContext) -> None:
+    from agent.skills.examples.infinite_scroll_consider import retrieve_jobs as usv
+
+    root = task["payload"].get("root", usv.ROOT)
+    context = ctx.browser.new_context()
+    try:
+        usv.scrape_company_jobs(context.new_page(), task["key"], set(), ctx.guard, root=root)
+    finally:
+        context.close()
+
+
+@handler("bvp_board")
+def _bvp_board(task: Dict[str, Any], ctx: WorkerContext) -> None:
+    from agent.skills.examples.bvp_external_ats import retrieve_jobs as bvp
+
+    start_url = task["payload"].get("start_url", bvp.START_URL)
+    page = ctx.browser.new_page()
+    try:
+        page.goto(start_url, wait_until="domcontentloaded", timeout=60000)
+        page.wait_for_timeout(2500)
+        job_urls = bvp._collect_job_urls(page, start_url=start_url)
+    finally:
+        page.close()
+    # Shard by ATS host so one worker keeps each host's politeness state
+    ctx.submit([{"kind": "bvp_job", "key": url, "shard": urlparse(url).netloc} for url in job_urls])
+
+
+@handler("bvp_job")
+def _bvp_job(task: Dict[str, Any], ctx: WorkerContext) -> None:
+    from agent.skills.examples.bvp_external_ats import retrieve_jobs as bvp
+
+    page = ctx.browser.new_page()
+    try:
+        ctx.guard.visit(page, task["key"], wait_until="domcontentloaded")
+        page.wait_for_timeout(1500)
+        bvp._save_external_job(task["key"], page.content())
+    finally:
+        page.close()
+
+
+def run_worker(
+    coordinator_url: str,
+    worker_id: str | None = None,
+    spool_dir: Path | str | None = None,
+    batch_size: int = 200,
+    interval: float = 2.0,
+) -> Dict[str, int]:
+    """Lease and run tasks until the coordinator reports the crawl is done."""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    client = CoordinatorClient(coordinator_url, worker_id)
+    spool_dir = Path(spool_dir) if spool_dir else Path(tempfile.gettempdir())
+    spool = spool_dir / f"crawl_spool_{worker_id.replace(':', '_')}.jsonl"
+    os.environ["JOBS_DB_PATH"] = str(spool)  # store_job() now writes to the spool
+
+    streamer = ResultStreamer(client, spool, batch_size, interval).start()
+    ctx = WorkerContext(client)
+    counts = {"done": 0, "failed": 0}
+    print(f"[worker {worker_id}] connected to {coordinator_url}")
+    try:
+        while True:
+            resp = client.call("/lease", {"n": 1})
+            if resp.get("done"):
+                break
+            if not resp["tasks"]:
+                time.sleep(resp.get("wait", 1.0))
+                continue
+            for task in resp["tasks"]:
+                print(f"[worker {worker_id}] {task['task_id']}")
+                try:
+                    HANDLERS[task["kind"]](task, ctx)
+                    ok, error = True, ""
+                except Exception as e:
+                    ok, error = False, repr(e)
+                streamer.flush()  # results land before the task counts as done
+                client.call("/complete", {"task_id": task["task_id"], "ok": ok, "error": error})
+                counts["done" if ok else "failed"] += 1
+    finally:
+        streamer.stop()
+        ctx.close()
+        spool.unlink(missing_ok=True)
+    print(f"[worker {worker_id}] finished: {counts}, {streamer.sent} rows streamed")
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Seeds and CLI
+# ---------------------------------------------------------------------------
+
+def seed_tasks(seeds: Iterable[str]) -> List[Dict[str, Any]]:
+    """'usv' / 'bvp', optionally with a root URL: 'usv=http://127.0.0.1:8765'."""
+    tasks = []
+    for seed in seeds:
+        board, _, root = seed.partition("=")
+        if board == "usv":
+            root = root or "https://jobs.usv.com"
+            tasks.append({"kind": "usv_board", "key": root, "payload": {"root": root}})
+        elif board == "bvp":
+            start_url = (root + "/jobs") if root else "https://jobs.bvp.com/jobs"
+            tasks.append({"kind": "bvp_board", "key": start_url, "payload": {"start_url": start_url}})
+        else:
+            raise ValueError(f"unknown seed {seed!r} (expected usv or bvp)")
+    return tasks
+
+
+def _print_status(status: Dict[str, Any]) -> None:
+    print(f"[coordinator] tasks={status['tasks']} results={status['results']}")
+    for worker_id, info in sorted(status["workers"].items()):
+        print(
+            f"  {worker_id}: {info['tasks_done']} tasks, {info['tasks_failed']} failed, {info['records']} rows"
+        )
+    for task in status["failed"]:
+        print(f"  failed {task['kind']}:{task['key']} after {task['attempts']} attempts: {task['error']}")
+
+
+def run_local(seeds: Iterable[str], workers: int = 3, port: int = 0, jobs_file: Path | None = None) -> Dict[str, Any]:
+    """Coordinator plus `workers` local worker processes; returns the final status."""
+    coordinator = Coordinator(jobs_file=jobs_file)
+    coordinator.submit(seed_tasks(seeds))
+    server = serve(coordinator, port=port)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    procs = [
+        multiprocessing.Process(target=run_worker, args=(url, f"local-{i}"), daemon=True)
+        for i in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    try:
+        while not coordinator.done.wait(5.0):
+            if not any(proc.is_alive() for proc in procs):
+                print("[coordinator] all workers exited before the crawl finished")
+                break
+        for proc in procs:
+            proc.join(timeout=30)
+    finally:
+        server.shutdown()
+    status = coordinator.status()
+    _print_status(status)
+    return status
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sharded crawling: coordinator and workers.")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    p_serve = sub.add_parser("serve", help="run the coordinator")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_serve.add_argument("--seed", action="append", default=[], help="usv, bvp, or usv=<root url>")
+
+    p_worker = sub.add_parser("worker", help="run a worker against a coordinator")
+    p_worker.add_argument("url")
+    p_worker.add_argument("--id", default=None)
+    p_worker.add_argument("--batch-size", type=int, default=200)
+
+    p_local = sub.add_parser("local", help="coordinator plus local worker processes")
+    p_local.add_argument("--workers", type=int, default=3)
+    p_local.add_argument("--seed", action="append", default=[])
+
+    args = parser.parse_args()
+    if args.mode == "serve":
+        coordinator = Coordinator()
+        coordinator.submit(seed_tasks(args.seed))
+        serve(coordinator, args.host, args.port)
+        print(f"[coordinator] listening on {args.host}:{args.port} (Ctrl+C to stop)")
+        try:
+            while not coordinator.done.wait(30.0):
+                _print_status(coordinator.status())
+            time.sleep(10.0)  # let workers see "done" before the endpoint goes away
+        except KeyboardInterrupt:
+            pass
+        _print_status(coordinator.status())
+    elif args.mode == "worker":
+        run_worker(args.url, args.id, batch_size=args.batch_size)
+    else:
+        run_local(args.seed, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
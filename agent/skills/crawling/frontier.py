@@ -0,0 +1,332 @@
+"""Durable crawl frontier backed by SQLite.
+
+Replaces in-memory work lists (company slugs, job URLs) with a queue that
+survives crashes and can be shared by several worker processes:
+
+- every item has a state: pending -> leased -> done | failed
+- claim() leases items to one worker for `lease_seconds`; a lease that
+  expires (worker crashed) makes the item claimable again, unless it has
+  used up `max_attempts` (an item that crashes every worker ends up failed)
+- complete()/fail() only count for the worker holding the lease; a worker
+  whose lease expired and was reclaimed can't overwrite the new owner's item
+- fail() retries with exponential backoff and jitter until `max_attempts`
+- release() gives a lease back without using an attempt (the item was
+  skipped, e.g. its domain's circuit is open, not tried)
+- higher priority is claimed first
+
+    frontier = Frontier(queue="bvp:external")
+    frontier.add_many(job_urls, revisit_after=20 * 3600)
+    for item in frontier.iter_claims():
+        try:
+            visit(item.key)
+            frontier.complete(item.key)
+        except Exception as e:
+            frontier.fail(item.key, str(e))
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import socket
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+DEFAULT_DB = Path(__file__).resolve().parents[2] / "workspace" / "frontier.sqlite3"
+
+
+def frontier_db_path() -> Path:
+    """Path of the frontier database; FRONTIER_DB_PATH overrides it."""
+    override = os.environ.get("FRONTIER_DB_PATH")
+    return Path(override) if override else DEFAULT_DB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    queue         TEXT    NOT NULL,
+    key           TEXT    NOT NULL,
+    payload       TEXT,
+    priority      INTEGER NOT NULL DEFAULT 0,
+    state         TEXT    NOT NULL DEFAULT 'pending',
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    available_at  REAL    NOT NULL DEFAULT 0,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    last_error    TEXT,
+    created_at    REAL    NOT NULL,
+    updated_at    REAL    NOT NULL,
+    PRIMARY KEY (queue, key)
+);
+CREATE INDEX IF NOT EXISTS frontier_claim
+    ON frontier (queue, state, priority DESC, available_at);
+"""
+
+
+@dataclass
+class FrontierItem:
+    key: str
+    payload: Any
+    priority: int
+    attempts: int
+
+
+class Frontier:
+    """
+    A named work queue in a SQLite file; safe across threads and processes.
+
+    Args:
+        queue: Queue name, e.g. "usv:companies" or "bvp:external"
+        path: SQLite file (default frontier_db_path())
+        lease_seconds: How long a claim is held before it can be reclaimed
+        max_attempts: Claims per item before it is marked failed
+        base_backoff, max_backoff: Retry delay = base * 2^(attempts-1), capped, +-25% jitter
+        worker_id: Lease owner name (default host:pid)
+        key_fn: Normalizes keys before they are stored or looked up, e.g.
+            url_canon.canonical_url so URL variants of one posting share an item
+    """
+
+    def __init__(
+        self,
+        queue: str = "default",
+        path: Path | str | None = None,
+        lease_seconds: float = 300.0,
+        max_attempts: int = 5,
+        base_backoff: float = 30.0,
+        max_backoff: float = 3600.0,
+        worker_id: str | None = None,
+        key_fn: Callable[[str], str] | None = None,
+    ):
+        self.queue = queue
+        self.path = Path(path) if path else frontier_db_path()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.key_fn = key_fn
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = None
+
+    # -- connection --------------------------------------------------------
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # One connection per process; reopen after fork
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def _tx(self):
+        """BEGIN IMMEDIATE transaction: takes the write lock up front so claims never race."""
+        conn = self.conn
+
+        class _Tx:
+            def __enter__(self_inner):
+                conn.execute("BEGIN IMMEDIATE")
+                return conn
+
+            def __exit__(self_inner, exc_type, exc, tb):
+                conn.execute("ROLLBACK" if exc_type else "COMMIT")
+                return False
+
+        return _Tx()
+
+    def _key(self, key: str) -> str:
+        return self.key_fn(key) if self.key_fn else key
+
+    # -- producing ---------------------------------------------------------
+
+    def add(self, key: str, payload: Any = None, priority: int = 0, revisit_after: float | None = None) -> bool:
+        """Enqueue one item. See add_many()."""
+        return self.add_many([key], payload=payload, priority=priority, revisit_after=revisit_after) == 1
+
+    def add_many(
+        self,
+        keys: Iterable[str],
+        payload: Any = None,
+        priority: int = 0,
+        revisit_after: float | None = None,
+    ) -> int:
+        """
+        Enqueue items that aren't already queued.
+
+        Items already pending or leased are left alone. Done/failed items are
+        only re-queued when `revisit_after` is set and they finished longer
+        than that many seconds ago (e.g. for the next daily crawl).
+
+        Returns the number of items newly queued or re-queued.
+        """
+        now = time.time()
+        data = json.dumps(payload) if payload is not None else None
+        added = 0
+        with self._tx() as conn:
+            for key in keys:
+                key = self._key(key)
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO frontier (queue, key, payload, priority, created_at, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.queue, key, data, priority, now, now),
+                )
+                if cur.rowcount:
+                    added += 1
+                elif revisit_after is not None:
+                    cur = conn.execute(
+                        "UPDATE frontier SET state='pending', attempts=0, available_at=0, last_error=NULL,"
+                        " priority=?, updated_at=? WHERE queue=? AND key=? AND state IN ('done', 'failed')"
+                        " AND updated_at < ?",
+                        (priority, now, self.queue, key, now - revisit_after),
+                    )
+                    added += cur.rowcount
+        return added
+
+    # -- consuming ---------------------------------------------------------
+
+    def claim(self, n: int = 1) -> List[FrontierItem]:
+        """Lease up to `n` available items (highest priority first)."""
+        now = time.time()
+        with self._tx() as conn:
+            # Expired leases out of attempts: the item keeps killing its worker
+            conn.execute(
+                "UPDATE frontier SET state='failed', last_error='lease expired on ' || lease_owner,"
+                " lease_owner=NULL, lease_expires=NULL, updated_at=?"
+                " WHERE queue=? AND state='leased' AND lease_expires<=? AND attempts>=?",
+                (now, self.queue, now, self.max_attempts),
+            )
+            rows = conn.execute(
+                "SELECT key, payload, priority, attempts FROM frontier"
+                " WHERE queue=? AND ((state='pending' AND available_at<=?) OR (state='leased' AND lease_expires<=?))"
+                " ORDER BY priority DESC, available_at LIMIT ?",
+                (self.queue, now, now, n),
+            ).fetchall()
+            for key, _, _, _ in rows:
+                conn.execute(
+                    "UPDATE frontier SET state='leased', attempts=attempts+1, lease_owner=?, lease_expires=?,"
+                    " updated_at=? WHERE queue=? AND key=?",
+                    (self.worker_id, now + self.lease_seconds, now, self.queue, key),
+                )
+        return [
+            FrontierItem(key, json.loads(payload) if payload else None, priority, attempts + 1)
+            for key, payload, priority, attempts in rows
+        ]
+
+    def iter_claims(self, batch: int = 10) -> Iterator[FrontierItem]:
+        """
+        Claim and yield items until none are available right now.
+
+        Items backing off into the future are left for a later run. Every
+        yielded item must be completed, failed or released by the caller.
+        """
+        while True:
+            items = self.claim(batch)
+            if not items:
+                return
+            yield from items
+
+    def complete(self, key: str) -> bool:
+        """Mark a claimed item done. False if this worker no longer holds its lease."""
+        key = self._key(key)
+        now = time.time()
+        cur = self.conn.execute(
+            "UPDATE frontier SET state='done', lease_owner=NULL, lease_expires=NULL, updated_at=?"
+            " WHERE queue=? AND key=? AND state='leased' AND lease_owner=?",
+            (now, self.queue, key, self.worker_id),
+        )
+        return cur.rowcount == 1
+
+    def fail(self, key: str, error: str = "", retry: bool = True) -> str:
+        """
+        Record a failed attempt. Retries with backoff unless out of attempts
+        (or retry=False). Returns the new state, or "lost" if this worker no
+        longer holds the item's lease.
+        """
+        key = self._key(key)
+        now = time.time()
+        with self._tx() as conn:
+            row = conn.execute(
+                "SELECT attempts, state, lease_owner FROM frontier WHERE queue=? AND key=?", (self.queue, key)
+            ).fetchone()
+            if row is None:
+                return "missing"
+            if row[1] != "leased" or row[2] != self.worker_id:
+                return "lost"
+            attempts = row[0]
+            if not retry or attempts >= self.max_attempts:
+                state, available_at = "failed", 0.0
+            else:
+                delay = min(self.max_backoff, self.base_backoff * 2 ** max(0, attempts - 1))
+                state, available_at = "pending", now + delay * random.uniform(0.75, 1.25)
+            conn.execute(
+                "UPDATE frontier SET state=?, available_at=?, last_error=?, lease_owner=NULL, lease_expires=NULL,"
+                " updated_at=? WHERE queue=? AND key=?",
+                (state, available_at, error[:1000], now, self.queue, key),
+            )
+        return state
+
+    def release(self, key: str, delay: float = 0.0) -> bool:
+        """
+        Give this worker's lease back without counting the attempt, e.g. for
+        an item skipped by an open circuit. It is claimable again after
+        `delay` seconds. False if this worker no longer holds the lease.
+        """
+        now = time.time()
+        cur = self.conn.execute(
+            "UPDATE frontier SET state='pending', attempts=MAX(0, attempts-1), available_at=?,"
+            " lease_owner=NULL, lease_expires=NULL, updated_at=?"
+            " WHERE queue=? AND key=? AND state='leased' AND lease_owner=?",
+            (now + delay, now, self.queue, self._key(key), self.worker_id),
+        )
+        return cur.rowcount == 1
+
+    def extend(self, key: str) -> None:
+        """Renew this worker's lease on a long-running item."""
+        self.conn.execute(
+            "UPDATE frontier SET lease_expires=? WHERE queue=? AND key=? AND lease_owner=?",
+            (time.time() + self.lease_seconds, self.queue, self._key(key), self.worker_id),
+        )
+
+    def process(self, handler: Callable[[FrontierItem], None], batch: int = 1) -> Dict[str, int]:
+        """Run handler(item) for every available item; exceptions become fail()."""
+        stats = {"done": 0, "retry": 0, "failed": 0}
+        for item in self.iter_claims(batch):
+            try:
+                handler(item)
+            except Exception as e:
+                state = self.fail(item.key, repr(e))
+                if state == "pending":
+                    stats["retry"] += 1
+                elif state == "failed":
+                    stats["failed"] += 1
+            else:
+                if self.complete(item.key):
+                    stats["done"] += 1
+        return stats
+
+    # -- inspection --------------------------------------------------------
+
+    def stats(self) -> Dict[str, int]:
+        rows = self.conn.execute(
+            "SELECT state, COUNT(*) FROM frontier WHERE queue=? GROUP BY state", (self.queue,)
+        ).fetchall()
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows))
+        return counts
+
+    def failures(self, limit: int = 20) -> List[tuple]:
+        """(key, attempts, last_error) of failed items."""
+        return self.conn.execute(
+            "SELECT key, attempts, last_error FROM frontier WHERE queue=? AND state='failed' LIMIT ?",
+            (self.queue, limit),
+        ).fetchall()
@@ -0,0 +1,235 @@
+"""Adaptive per-host politeness: AIMD concurrency and rate limits.
+
+Every host gets its own allowed concurrency and request rate. Both grow
+additively while the host answers quickly, and are cut in half when it
+pushes back (429/503, errors, or latency well above its observed baseline).
+A Retry-After header pauses the host for the requested time.
+
+One HostScheduler is shared by every fetch path: the HTTP fetchers use the
+blocking `slot()`, the async Playwright page pool uses `aslot()`.
+
+    scheduler = HostScheduler()
+    with scheduler.slot(url) as slot:
+        resp = session.get(url)
+        slot.report(resp.status_code, resp.headers.get("Retry-After"))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+BACKOFF_STATUSES = {429, 503}
+
+
+@dataclass
+class HostPolicy:
+    """Bounds and tuning for every host's AIMD controller."""
+
+    initial_concurrency: float = 2.0
+    min_concurrency: float = 1.0
+    max_concurrency: float = 16.0
+    initial_rate: float = 2.0          # requests per second
+    min_rate: float = 0.2
+    max_rate: float = 20.0
+    rate_increase: float = 0.2         # added per successful request
+    decrease_factor: float = 0.5
+    latency_factor: float = 3.0        # slow = latency > factor * baseline
+    cooldown: float = 2.0              # seconds between two decreases
+    max_retry_after: float = 300.0
+
+
+@dataclass
+class HostState:
+    host: str
+    concurrency: float
+    rate: float
+    tokens: float = 1.0
+    updated: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+    blocked_until: float = 0.0
+    last_decrease: float = 0.0
+    latency_ewma: Optional[float] = None
+    baseline: Optional[float] = None
+    requests: int = 0
+    backoffs: int = 0
+    errors: int = 0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, now: float) -> float:
+        """Take a slot and a token if possible; else return seconds to wait (0 = acquired)."""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.in_flight >= int(self.concurrency):
+            return -1.0  # wait for a release
+        if self.tokens < 1.0:
+            return (1.0 - self.tokens) / self.rate
+        self.tokens -= 1.0
+        self.in_flight += 1
+        self.requests += 1
+        return 0.0
+
+
+class Slot:
+    """One in-flight request. Call report() with the outcome; exceptions count as errors."""
+
+    def __init__(self, scheduler: "HostScheduler", state: HostState):
+        self.scheduler = scheduler
+        self.state = state
+        self.start = time.monotonic()
+        self.reported = False
+
+    def report(self, status: Optional[int] = None, retry_after: Optional[str] = None, error: bool = False) -> None:
+        if self.reported:
+            return
+        self.reported = True
+        latency = time.monotonic() - self.start
+        self.scheduler._on_result(self.state, latency, status, retry_after, error)
+
+
+class HostScheduler:
+    """Shared per-host AIMD limiter for sync and async fetchers."""
+
+    def __init__(self, policy: HostPolicy | None = None):
+        self.policy = policy or HostPolicy()
+        self._hosts: Dict[str, HostState] = {}
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return (urlparse(url).hostname or url).lower()
+
+    def _state(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            p = self.policy
+            state = self._hosts[host] = HostState(host, p.initial_concurrency, p.initial_rate)
+        return state
+
+    # -- acquiring ---------------------------------------------------------
+
+    def acquire(self, url: str) -> Slot:
+        """Block until the host of `url` allows another request."""
+        host = self.host_of(url)
+        with self._released:
+            while True:
+                state = self._state(host)
+                wait = state.try_acquire(time.monotonic())
+                if wait == 0.0:
+                    return Slot(self, state)
+                self._released.wait(None if wait < 0 else wait)
+
+    async def aacquire(self, url: str) -> Slot:
+        """Async version of acquire(); polls without blocking the event loop."""
+        host = self.host_of(url)
+        while True:
+            with self._lock:
+                state = self._state(host)
+                wait = state.try_acquire(time.monotonic())
+                if wait == 0.0:
+                    return Slot(self, state)
+            await asyncio.sleep(0.05 if wait < 0 else min(wait, 1.0))
+
+    @contextmanager
+    def slot(self, url: str):
+        slot = self.acquire(url)
+        try:
+            yield slot
+        except BaseException:
+            slot.report(error=True)
+            raise
+        finally:
+            slot.report()
+
+    @asynccontextmanager
+    async def aslot(self, url: str):
+        slot = await self.aacquire(url)
+        try:
+            yield slot
+        except BaseException:
+            slot.report(error=True)
+            raise
+        finally:
+            slot.report()
+
+    # -- feedback ----------------------------------------------------------
+
+    def _on_result(
+        self,
+        state: HostState,
+        latency: float,
+        status: Optional[int],
+        retry_after: Optional[str],
+        error: bool,
+    ) -> None:
+        p = self.policy
+        now = time.monotonic()
+        with self._released:
+            state.in_flight -= 1
+            state.latency_ewma = latency if state.latency_ewma is None else 0.8 * state.latency_ewma + 0.2 * latency
+            if state.baseline is None or latency < state.baseline:
+                state.baseline = latency
+            else:
+                # Let the baseline drift up slowly so one lucky request doesn't pin it
+                state.baseline = 0.99 * state.baseline + 0.01 * latency
+
+            pushed_back = error or status in BACKOFF_STATUSES or (status is not None and status >= 500)
+            slow = state.baseline is not None and latency > p.latency_factor * max(state.baseline, 0.05)
+
+            if retry_after and status in BACKOFF_STATUSES:
+                delay = parse_retry_after(retry_after)
+                if delay is not None:
+                    state.blocked_until = max(state.blocked_until, now + min(delay, p.max_retry_after))
+
+            if pushed_back or slow:
+                if error:
+                    state.errors += 1
+                if now - state.last_decrease >= p.cooldown:
+                    state.last_decrease = now
+                    state.backoffs += 1
+                    state.concurrency = max(p.min_concurrency, state.concurrency * p.decrease_factor)
+                    state.rate = max(p.min_rate, state.rate * p.decrease_factor)
+            else:
+                # Additive increase: about +1 concurrency per window of successful requests
+                state.concurrency = min(p.max_concurrency, state.concurrency + 1.0 / state.concurrency)
+                state.rate = min(p.max_rate, state.rate + p.rate_increase)
+
+            self._released.notify_all()
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Current limits and counters per host."""
+        with self._lock:
+            return {
+                host: {
+                    "concurrency": round(s.concurrency, 2),
+                    "rate": round(s.rate, 2),
+                    "in_flight": s.in_flight,
+                    "latency_ms": round((s.latency_ewma or 0) * 1000, 1),
+                    "requests": s.requests,
+                    "backoffs": s.backoffs,
+                    "errors": s.errors,
+                }
+                for host, s in self._hosts.items()
+            }
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)."""
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
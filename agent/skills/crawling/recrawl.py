@@ -0,0 +1,392 @@
+"""Adaptive recrawl schedule: crawl each board as often as its postings change.
+
+Every finished CrawlSession (jobs_changes_functions) records how many
+postings were added, removed and retitled. From the last few crawls of a
+board this module estimates its change rate (changes per hour, recent crawls
+weighted more) and sets the board's next crawl so that about
+`target_change` of its live postings will have changed by then:
+
+    interval = target_change * live_postings / change_rate
+               clamped to [min_interval, max_interval], +-jitter
+
+A board with no usable history (fewer than two finished crawls) uses
+`default_interval`. Per-company rates are recorded as well, for deciding
+which companies of a board to refresh first.
+
+Due boards are run through the board registry: a board's registered script
+(run like run_python_script does), or else the v2 agent pointed at its URL.
+A run that exits 0 counts as a crawl even if it recorded none (agent-written
+scripts usually don't open a CrawlSession), so such boards are scheduled
+`default_interval` (or their rate's interval) after the run, not re-run every
+`min_interval`. Runs get RECRAWL_REVISIT_AFTER (half of `min_interval`) in
+their environment; scrapers pass it to Frontier.add_many(revisit_after=...)
+so a scheduled run revisits what the previous crawl finished.
+
+    python -m agent.skills.crawling.recrawl status
+    python -m agent.skills.crawling.recrawl run               # run what's due, once
+    python -m agent.skills.crawling.recrawl run --loop 600    # keep checking every 10 min
+
+    scheduler = RecrawlScheduler()
+    for board in scheduler.due():
+        ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from agent.skills.jobs_database.jobs_changes_functions import changes_db_path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_DB = Path(__file__).resolve().parents[2] / "workspace" / "recrawl.sqlite3"
+
+HOUR = 3600.0
+
+# Environment variable telling a board's scraper how old a finished frontier
+# item must be before this run visits it again
+REVISIT_ENV = "RECRAWL_REVISIT_AFTER"
+
+
+def recrawl_db_path() -> Path:
+    """Path of the schedule database; RECRAWL_DB_PATH overrides it."""
+    override = os.environ.get("RECRAWL_DB_PATH")
+    return Path(override) if override else DEFAULT_DB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedule (
+    board        TEXT PRIMARY KEY,
+    rate         REAL,
+    live         INTEGER NOT NULL DEFAULT 0,
+    interval_s   REAL NOT NULL,
+    last_crawl   INTEGER,
+    last_crawl_at REAL,
+    next_due     REAL NOT NULL,
+    last_run     REAL,
+    last_ok      REAL,
+    updated_at   REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS company_rates (
+    board        TEXT NOT NULL,
+    company_name TEXT NOT NULL,
+    changes      INTEGER NOT NULL,
+    rate         REAL NOT NULL,
+    updated_at   REAL NOT NULL,
+    PRIMARY KEY (board, company_name)
+);
+"""
+
+
+# ---------------------------------------------------------------------------
+# Board registry
+# ---------------------------------------------------------------------------
+
+@dataclass
+class BoardSpec:
+    """How to recrawl a board: its script (run from the repo root), or its URL for the agent."""
+    name: str
+    url: str
+    script: Optional[str] = None
+
+
+BOARDS: Dict[str, BoardSpec] = {}
+
+
+def register_board(name: str, url: str, script: str | None = None) -> BoardSpec:
+    """Register a board under the name its scraper passes to CrawlSession."""
+    BOARDS[name] = BoardSpec(name, url, script)
+    return BOARDS[name]
+
+
+register_board("usv", "https://jobs.usv.com/jobs", "agent/skills/examples/infinite_scroll_consider/retrieve_jobs.py")
+register_board("bvp", "https://jobs.bvp.com/jobs", "agent/skills/examples/bvp_external_ats/retrieve_jobs.py")
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RecrawlPolicy:
+    min_interval: float = 6 * HOUR
+    max_interval: float = 14 * 24 * HOUR
+    default_interval: float = 24 * HOUR
+    target_change: float = 0.05   # fraction of live postings expected to change per crawl
+    jitter: float = 0.1           # +-10% so boards don't all come due together
+    window: int = 8               # finished crawls used for the rate
+    alpha: float = 0.5            # EWMA weight of the most recent crawl interval
+
+
+@dataclass
+class BoardSchedule:
+    board: str
+    rate: Optional[float]         # changes per hour, None without history
+    live: int
+    interval_s: float
+    last_crawl_at: Optional[float]
+    next_due: float
+
+    @property
+    def due(self) -> bool:
+        return self.next_due <= time.time()
+
+
+class RecrawlScheduler:
+    """
+    Per-board next-crawl times derived from the change feed.
+
+    Args:
+        path: SQLite file for the schedule (default recrawl_db_path())
+        policy: Interval bounds and rate settings
+        jobs_file: jobs.jsonl whose change feed to read (default jobs_file_path())
+    """
+
+    def __init__(self, path: Path | str | None = None, policy: RecrawlPolicy | None = None,
+                 jobs_file: Path | None = None):
+        self.path = Path(path) if path else recrawl_db_path()
+        self.policy = policy or RecrawlPolicy()
+        self.jobs_file = jobs_file
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _feed(self) -> Optional[sqlite3.Connection]:
+        path = changes_db_path(self.jobs_file)
+        if not path.exists():
+            return None
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30.0)
+
+    # -- rates -------------------------------------------------------------
+
+    def _board_history(self, feed: sqlite3.Connection, board: str) -> List[tuple]:
+        """(crawl_id, started_at, observed, changes) of the last window+1 finished crawls, oldest first."""
+        rows = feed.execute(
+            "SELECT crawl_id, started_at, observed, added + removed + changed FROM crawls"
+            " WHERE board = ? AND status != 'running' ORDER BY crawl_id DESC LIMIT ?",
+            (board, self.policy.window + 1),
+        ).fetchall()
+        return rows[::-1]
+
+    def _live(self, feed: sqlite3.Connection, board: str) -> int:
+        """Postings of `board` not yet reported removed (a partial crawl's observed count is lower)."""
+        return feed.execute(
+            "SELECT COUNT(*) FROM postings WHERE board = ? AND removed_crawl IS NULL", (board,)
+        ).fetchone()[0]
+
+    def _rate(self, history: List[tuple]) -> Optional[float]:
+        """EWMA of changes/hour over consecutive crawls (the first crawl's "everything added" is skipped)."""
+        rate = None
+        for (_, prev_at, _, _), (_, at, _, changes) in zip(history, history[1:]):
+            hours = max((at - prev_at) / HOUR, 1e-3)
+            sample = changes / hours
+            rate = sample if rate is None else self.policy.alpha * sample + (1 - self.policy.alpha) * rate
+        return rate
+
+    def _interval(self, rate: Optional[float], live: int) -> float:
+        p = self.policy
+        if rate is None:
+            return p.default_interval
+        if rate <= 0:
+            return p.max_interval
+        target = max(1.0, p.target_change * live)
+        return min(p.max_interval, max(p.min_interval, target / rate * HOUR))
+
+    def _jitter(self, board: str, crawl_id: Optional[int]) -> float:
+        # Stable per crawl, so recomputing the schedule doesn't move the due time
+        return 1 + random.Random(f"{board}:{crawl_id}").uniform(-self.policy.jitter, self.policy.jitter)
+
+    def _company_rates(self, feed: sqlite3.Connection, board: str, history: List[tuple]) -> List[tuple]:
+        if len(history) < 2:
+            return []
+        first_id, first_at = history[0][0], history[0][1]
+        hours = max((history[-1][1] - first_at) / HOUR, 1e-3)
+        return [
+            (company, changes, changes / hours)
+            for company, changes in feed.execute(
+                "SELECT c.company_name, COUNT(*) FROM changes c JOIN crawls k ON k.crawl_id = c.crawl_id"
+                " WHERE k.board = ? AND c.crawl_id > ? AND c.company_name IS NOT NULL"
+                " GROUP BY c.company_name",
+                (board, first_id),
+            )
+        ]
+
+    # -- schedule ----------------------------------------------------------
+
+    def refresh(self, boards: List[str] | None = None) -> List[BoardSchedule]:
+        """Recompute rates and next-crawl times of `boards` (default: registered + crawled boards)."""
+        feed = self._feed()
+        conn = self._connect()
+        now = time.time()
+        try:
+            crawled = [r[0] for r in feed.execute("SELECT DISTINCT board FROM crawls")] if feed else []
+            names = boards if boards is not None else sorted(set(BOARDS) | set(crawled))
+            out = []
+            for board in names:
+                history = self._board_history(feed, board) if feed else []
+                rate = self._rate(history)
+                live = self._live(feed, board) if history else 0
+                interval = self._interval(rate, live)
+                last_id, last_at = (history[-1][0], history[-1][1]) if history else (None, None)
+                row = conn.execute("SELECT last_run, last_ok FROM schedule WHERE board = ?", (board,)).fetchone()
+                last_run, last_ok = row if row else (None, None)
+                if last_ok and (last_at is None or last_ok > last_at):
+                    # A clean exit that recorded no crawl of this board (e.g. an agent run)
+                    last_at = last_ok
+
+                if last_at is None:
+                    next_due = last_run + self.policy.min_interval if last_run else now  # never crawled
+                else:
+                    next_due = last_at + interval * self._jitter(board, last_id)
+                    if last_run and last_run > last_at:
+                        # Started since the last finished crawl (still running, or crashed before
+                        # finishing): wait at least min_interval before trying again
+                        next_due = max(next_due, last_run + self.policy.min_interval)
+
+                conn.execute(
+                    "INSERT INTO schedule (board, rate, live, interval_s, last_crawl, last_crawl_at, next_due, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (board) DO UPDATE SET rate = excluded.rate,"
+                    " live = excluded.live, interval_s = excluded.interval_s, last_crawl = excluded.last_crawl,"
+                    " last_crawl_at = excluded.last_crawl_at, next_due = excluded.next_due,"
+                    " updated_at = excluded.updated_at",
+                    (board, rate, live, interval, last_id, last_at, next_due, now),
+                )
+                if feed:
+                    conn.execute("DELETE FROM company_rates WHERE board = ?", (board,))
+                    conn.executemany(
+                        "INSERT INTO company_rates VALUES (?, ?, ?, ?, ?)",
+                        [(board, c, n, r, now) for c, n, r in self._company_rates(feed, board, history)],
+                    )
+                out.append(BoardSchedule(board, rate, live, interval, last_at, next_due))
+            return out
+        finally:
+            conn.close()
+            if feed:
+                feed.close()
+
+    def due(self, boards: List[str] | None = None) -> List[BoardSchedule]:
+        """Boards whose next crawl time has passed, most overdue first."""
+        return sorted((s for s in self.refresh(boards) if s.due), key=lambda s: s.next_due)
+
+    def mark_started(self, board: str) -> None:
+        """Record a run attempt, so a crawl that never finishes isn't retried at once."""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO schedule (board, interval_s, next_due, last_run, updated_at) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (board) DO UPDATE SET last_run = excluded.last_run",
+                (board, self.policy.default_interval, time.time(), time.time(), time.time()),
+            )
+        finally:
+            conn.close()
+
+    def mark_finished(self, board: str, code: int) -> None:
+        """Record a run's exit; exit code 0 counts as a crawl even without a CrawlSession."""
+        if code != 0:
+            return
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE schedule SET last_ok = ? WHERE board = ?", (time.time(), board))
+        finally:
+            conn.close()
+
+    def company_rates(self, board: str, limit: int | None = None) -> List[Dict[str, float]]:
+        """Companies of `board` by observed change rate (changes/hour), fastest first."""
+        conn = self._connect()
+        try:
+            sql = "SELECT company_name, changes, rate FROM company_rates WHERE board = ? ORDER BY rate DESC"
+            rows = conn.execute(sql + (" LIMIT ?" if limit else ""), (board, limit) if limit else (board,))
+            return [{"company_name": c, "changes": n, "rate": r} for c, n, r in rows]
+        finally:
+            conn.close()
+
+    def report(self, boards: List[str] | None = None) -> None:
+        now = time.time()
+        print(f"{'board':<12}{'changes/day':>12}{'live':>7}{'interval':>10}  {'last crawl':<17}{'next due':<17}")
+        for s in sorted(self.refresh(boards), key=lambda s: s.next_due):
+            rate = f"{s.rate * 24:.1f}" if s.rate is not None else "-"
+            last = datetime.fromtimestamp(s.last_crawl_at).strftime("%Y-%m-%d %H:%M") if s.last_crawl_at else "never"
+            due = "now" if s.next_due <= now else datetime.fromtimestamp(s.next_due).strftime("%Y-%m-%d %H:%M")
+            print(f"{s.board:<12}{rate:>12}{s.live:>7}{s.interval_s / HOUR:>9.1f}h  {last:<17}{due:<17}")
+
+
+# ---------------------------------------------------------------------------
+# Running due boards
+# ---------------------------------------------------------------------------
+
+def board_command(spec: BoardSpec) -> List[str]:
+    """The board's script, or the v2 agent pointed at its URL when it has none."""
+    if spec.script:
+        return [sys.executable, spec.script]
+    return [sys.executable, "agent/v2_agent.py", spec.url]
+
+
+def run_due(scheduler: RecrawlScheduler | None = None, dry_run: bool = False,
+            timeout: float | None = None) -> Dict[str, int]:
+    """Run every due, registered board once, most overdue first. Returns board -> exit code."""
+    scheduler = scheduler or RecrawlScheduler()
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(PROJECT_ROOT)
+    env[REVISIT_ENV] = str(int(scheduler.policy.min_interval / 2))
+    codes: Dict[str, int] = {}
+    for s in scheduler.due():
+        spec = BOARDS.get(s.board)
+        if spec is None:
+            print(f"[recrawl] {s.board} is due but not registered; skipping")
+            continue
+        command = board_command(spec)
+        print(f"[recrawl] {s.board}: {' '.join(command[1:])}")
+        if dry_run:
+            continue
+        scheduler.mark_started(s.board)
+        try:
+            codes[s.board] = subprocess.run(command, cwd=str(PROJECT_ROOT), env=env, timeout=timeout).returncode
+        except subprocess.TimeoutExpired:
+            codes[s.board] = -1
+        scheduler.mark_finished(s.board, codes[s.board])
+        print(f"[recrawl] {s.board} finished with exit code {codes[s.board]}")
+    return codes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Adaptive per-board recrawl schedule.")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    sub.add_parser("status", help="show rates and next crawl times")
+    p_run = sub.add_parser("run", help="run the boards that are due")
+    p_run.add_argument("--dry-run", action="store_true")
+    p_run.add_argument("--loop", type=float, default=0, help="check again every N seconds")
+    p_run.add_argument("--timeout", type=float, default=None, help="per-board time limit in seconds")
+    p_companies = sub.add_parser("companies", help="fastest-changing companies of a board")
+    p_companies.add_argument("board")
+    p_companies.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    scheduler = RecrawlScheduler()
+    if args.mode == "status":
+        scheduler.report()
+    elif args.mode == "companies":
+        scheduler.refresh([args.board])
+        for row in scheduler.company_rates(args.board, args.limit):
+            print(f"{row['rate'] * 24:8.2f}/day  {row['changes']:5d}  {row['company_name']}")
+    else:
+        while True:
+            run_due(scheduler, dry_run=args.dry_run, timeout=args.timeout)
+            if not args.loop:
+                break
+            time.sleep(args.loop)
+
+
+if __name__ == "__main__":
+    main()
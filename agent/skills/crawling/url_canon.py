@@ -0,0 +1,233 @@
+"""Canonical job URLs: one string per posting, however it was linked.
+
+The same posting shows up as many URL strings: tracking parameters
+(`?gh_src=`, `utm_*`, `lever-source`), a trailing slash, host casing, an
+`/apply` suffix, or a company careers page with `?gh_jid=` instead of the
+ATS URL. Deduplicating on raw strings visits each variant again.
+
+- canonical_url(url): a normalized URL that still loads the posting.
+  Scheme/host lowercased, default port, fragment, trailing slash and
+  tracking parameters dropped, remaining parameters sorted. Known ATS URLs
+  are also reduced to the posting's path (query dropped, https, no
+  /apply or /application suffix, no Workday locale segment).
+- posting_key(url): a stable identity for dedup. Known ATS postings map to
+  "<ats>:<id>" (e.g. "greenhouse:4012345", "lever:<uuid>") so different
+  URL forms of one posting share a key. Other URLs use their canonical URL
+  without the scheme.
+
+    canonical_url("https://Boards.Greenhouse.io/acme/jobs/123/?gh_src=x")
+        -> "https://boards.greenhouse.io/acme/jobs/123"
+    posting_key("https://acme.com/careers?gh_jid=123&utm_source=li")
+        -> "greenhouse:123"
+
+Both are idempotent and cached, so calling them on every scroll round is cheap.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Query parameters that never identify a posting
+TRACKING_PARAMS = frozenset({
+    "gh_src", "gclid", "fbclid", "msclkid", "dclid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "ref", "referrer", "referer", "source", "src", "trk", "trackingid", "_hsenc", "_hsmi",
+    "lever-source", "lever-source[]", "lever-origin", "lever-via", "sourcetype",
+})
+TRACKING_PREFIXES = ("utm_", "ashby_", "_ga", "hsa_")
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+@dataclass(frozen=True)
+class Canonical:
+    url: str
+    key: str
+    ats: Optional[str] = None
+
+
+# ---------------------------------------------------------------------------
+# Per-ATS rules
+# ---------------------------------------------------------------------------
+
+# A rule gets (host, path segments, query) and returns (path segments, key)
+# for a posting URL it recognizes, or None to fall back to generic handling.
+Rule = Callable[[str, List[str], Dict[str, str]], Optional[Tuple[List[str], str]]]
+_RULES: List[Tuple[str, "re.Pattern[str]", Rule]] = []
+
+
+def ats_rule(name: str, host_pattern: str):
+    """Register a rule for hosts fully matching `host_pattern` (lowercase)."""
+    def register(fn: Rule) -> Rule:
+        _RULES.append((name, re.compile(host_pattern), fn))
+        return fn
+    return register
+
+
+@ats_rule("greenhouse", r"(?:job-)?boards(?:\.eu)?\.greenhouse\.io")
+def _greenhouse(host, segs, query):
+    # /<board>/jobs/<id>
+    if len(segs) >= 3 and segs[1] == "jobs" and segs[2].isdigit():
+        return [segs[0].lower(), "jobs", segs[2]], segs[2]
+    # /embed/job_app?for=<board>&token=<id>
+    if segs == ["embed", "job_app"] and query.get("token", "").isdigit() and query.get("for"):
+        token = query["token"]
+        return [query["for"].lower(), "jobs", token], token
+    return None
+
+
+@ats_rule("lever", r"jobs(?:\.eu)?\.lever\.co")
+def _lever(host, segs, query):
+    # /<company>/<uuid>[/apply]
+    if len(segs) >= 2 and re.fullmatch(r"[0-9a-fA-F-]{36}", segs[1]):
+        return [segs[0].lower(), segs[1].lower()], segs[1].lower()
+    return None
+
+
+@ats_rule("ashby", r"jobs\.ashbyhq\.com")
+def _ashby(host, segs, query):
+    # /<org>/<uuid>[/application]
+    if len(segs) >= 2 and re.fullmatch(r"[0-9a-fA-F-]{36}", segs[1]):
+        return [segs[0], segs[1].lower()], segs[1].lower()
+    return None
+
+
+@ats_rule("workable", r"apply\.workable\.com")
+def _workable(host, segs, query):
+    # /<account>/j/<shortcode>[/apply]
+    if len(segs) >= 3 and segs[1] == "j":
+        return [segs[0].lower(), "j", segs[2].upper()], segs[2].upper()
+    return None
+
+
+@ats_rule("smartrecruiters", r"(?:jobs|careers)\.smartrecruiters\.com")
+def _smartrecruiters(host, segs, query):
+    # /<Company>/<id>-<title-slug>
+    if len(segs) >= 2:
+        m = re.match(r"(\d{6,})", segs[1])
+        if m:
+            return segs[:2], m.group(1)
+    return None
+
+
+@ats_rule("workday", r"([a-z0-9-]+)\.wd\d+\.myworkdayjobs(?:-impl)?\.com")
+def _workday(host, segs, query):
+    # [/<locale>]/<site>/job/<location>/<Title_REQ-123>
+    if segs and re.fullmatch(r"[a-z]{2}-[A-Z]{2}", segs[0]):
+        segs = segs[1:]
+    if "job" in segs[:2] and "_" in segs[-1]:
+        tenant = host.split(".", 1)[0]
+        return segs, f"{tenant}:{segs[-1].rsplit('_', 1)[1].upper()}"
+    return None
+
+
+@ats_rule("icims", r"[a-z0-9-]+\.icims\.com")
+def _icims(host, segs, query):
+    # /jobs/<id>/<title-slug>/job
+    if len(segs) >= 2 and segs[0] == "jobs" and segs[1].isdigit():
+        return segs, f"{host.split('.', 1)[0]}:{segs[1]}"
+    return None
+
+
+@ats_rule("comeet", r"(?:www\.)?comeet\.com|(?:www\.)?comeet\.co")
+def _comeet(host, segs, query):
+    # /jobs/<company>/<company-uid>/<title-slug>/<position-uid>
+    if len(segs) >= 5 and segs[0] == "jobs":
+        return segs[:5], f"{segs[2].upper()}:{segs[4].upper()}"
+    return None
+
+
+@ats_rule("jazzhr", r"[a-z0-9-]+\.applytojob\.com")
+def _jazzhr(host, segs, query):
+    # /apply/<code>/<title-slug>
+    if len(segs) >= 2 and segs[0] == "apply":
+        return segs, f"{host.split('.', 1)[0]}:{segs[1]}"
+    return None
+
+
+@ats_rule("trakstar", r"[a-z0-9-]+\.hire\.trakstar\.com")
+def _trakstar(host, segs, query):
+    # /jobs/<id>
+    if len(segs) >= 2 and segs[0] == "jobs":
+        return segs[:2], f"{host.split('.', 1)[0]}:{segs[1]}"
+    return None
+
+
+# Suffixes that show the same posting (application form, apply button)
+_ACTION_SUFFIXES = {"apply", "application"}
+
+# Parameters that identify a posting on any host (embedded ATS widgets)
+_KEY_PARAMS = {"gh_jid": "greenhouse"}
+
+
+# ---------------------------------------------------------------------------
+# Canonicalization
+# ---------------------------------------------------------------------------
+
+def _is_tracking(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _netloc(scheme: str, host: str, port: Optional[int]) -> str:
+    if port and DEFAULT_PORTS.get(scheme) != port:
+        return f"{host}:{port}"
+    return host
+
+
+@lru_cache(maxsize=65536)
+def canonicalize(url: str) -> Canonical:
+    """Canonical URL and posting key of `url` (see the module docstring)."""
+    url = url.strip()
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return Canonical(url, url)
+
+    host = parts.hostname.rstrip(".")
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    segs = [s for s in parts.path.split("/") if s]
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k)]
+    # Hash routes (#/jobs/123, #!/...) are part of the address; other fragments are not
+    fragment = parts.fragment if parts.fragment.startswith(("/", "!")) else ""
+
+    for name, host_re, rule in _RULES:
+        if not host_re.fullmatch(host):
+            continue
+        while segs and segs[-1].lower() in _ACTION_SUFFIXES:
+            segs = segs[:-1]
+        matched = rule(host, segs, dict(query))
+        if matched is not None:
+            path_segs, ident = matched
+            path = "/" + "/".join(path_segs)
+            return Canonical(urlunsplit(("https", _netloc("https", host, port), path, "", "")), f"{name}:{ident}", name)
+        break
+
+    path = "/" + "/".join(segs)
+    query.sort()
+    canonical = urlunsplit((scheme, _netloc(scheme, host, port), path, urlencode(query), fragment))
+    for param, ats in _KEY_PARAMS.items():
+        value = next((v for k, v in query if k == param and v), None)
+        if value:
+            return Canonical(canonical, f"{ats}:{value}", ats)
+    return Canonical(canonical, canonical.split("://", 1)[1])
+
+
+def canonical_url(url: str, base_url: str | None = None) -> str:
+    """Normalized URL for visiting and storing (relative URLs resolve against `base_url`)."""
+    if not url:
+        return url
+    return canonicalize(urljoin(base_url, url) if base_url else url).url
+
+
+def posting_key(url: str, base_url: str | None = None) -> str:
+    """Stable dedup key: "<ats>:<id>" for known ATS postings, else the canonical URL without scheme."""
+    if not url:
+        return url
+    return canonicalize(urljoin(base_url, url) if base_url else url).key
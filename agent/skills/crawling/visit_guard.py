@@ -0,0 +1,273 @@
+"""Fail-fast page visits: adaptive timeouts and per-domain circuit breakers.
+
+A fixed `timeout=60000` on every goto means one dead ATS domain can burn
+minutes of a script's budget. VisitGuard learns each domain's latency and
+sets the navigation timeout from it, and stops visiting a domain after
+consecutive failures:
+
+- timeout = latency_factor x p95 of the domain's successful visits, clamped
+  to [floor_ms, ceiling_ms]. Domains with too few samples use the p95 of all
+  domains, and `cold_ms` before anything has been observed.
+- circuit breaker: `failure_threshold` consecutive failures (timeouts,
+  errors, 5xx) open the circuit for `cooldown` seconds; visits to the domain
+  raise CircuitOpenError without touching the network. After the cooldown
+  one probe visit is let through: success closes the circuit, failure
+  reopens it with the cooldown doubled (up to `max_cooldown`).
+
+    guard = VisitGuard(ceiling_ms=60000)
+    response = guard.visit(page, url, wait_until="domcontentloaded")
+    ...
+    guard.report()   # timeouts, skipped visits, tripped domains, time saved
+
+"Time saved" is an estimate: for a visit that timed out, the difference
+between `ceiling_ms` (the fixed timeout it replaces) and the adaptive one;
+for a skipped visit, the domain's average time lost per failed visit.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of visiting a domain whose circuit is open."""
+
+    def __init__(self, domain: str, retry_in: float):
+        super().__init__(f"circuit open for {domain} (retry in {retry_in:.0f}s)")
+        self.domain = domain
+        self.retry_in = retry_in
+
+
+def _domain(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def _p95(samples) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+def _is_timeout(error: BaseException) -> bool:
+    # Playwright's sync and async TimeoutError, and asyncio's, share the name
+    return type(error).__name__ == "TimeoutError"
+
+
+@dataclass
+class DomainState:
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=50))
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    open_until: float = 0.0
+    cooldown: float = 0.0
+    probing: bool = False
+    visits: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    skipped: int = 0
+    trips: int = 0
+    failed_seconds: float = 0.0
+    saved_seconds: float = 0.0
+
+
+class VisitGuard:
+    """
+    Adaptive navigation timeouts plus a circuit breaker, per domain.
+
+    Args:
+        ceiling_ms: Largest timeout (the fixed timeout this replaces)
+        floor_ms: Smallest timeout
+        cold_ms: Timeout before any latency has been observed
+        latency_factor: Timeout = factor x p95 latency
+        min_samples: Successful visits needed before a domain's own p95 is used
+        failure_threshold: Consecutive failures that open a domain's circuit
+        cooldown, max_cooldown: Seconds an open circuit waits before a probe
+    """
+
+    def __init__(
+        self,
+        ceiling_ms: int = 60000,
+        floor_ms: int = 5000,
+        cold_ms: int = 30000,
+        latency_factor: float = 3.0,
+        min_samples: int = 5,
+        failure_threshold: int = 3,
+        cooldown: float = 60.0,
+        max_cooldown: float = 600.0,
+    ):
+        self.ceiling_ms = ceiling_ms
+        self.floor_ms = floor_ms
+        self.cold_ms = min(cold_ms, ceiling_ms)
+        self.latency_factor = latency_factor
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._domains: Dict[str, DomainState] = {}
+        self._all: Deque[float] = deque(maxlen=500)
+        self._lock = threading.Lock()
+
+    def _state(self, domain: str) -> DomainState:
+        st = self._domains.get(domain)
+        if st is None:
+            st = self._domains[domain] = DomainState(cooldown=self.cooldown)
+        return st
+
+    # -- decisions ---------------------------------------------------------
+
+    def timeout_for(self, url: str) -> int:
+        """Navigation timeout (ms) for `url` from observed latencies."""
+        with self._lock:
+            st = self._state(_domain(url))
+            if len(st.latencies) >= self.min_samples:
+                samples = st.latencies
+            elif len(self._all) >= self.min_samples:
+                samples = self._all
+            else:
+                return self.cold_ms
+            ms = _p95(samples) * 1000 * self.latency_factor
+        return int(min(self.ceiling_ms, max(self.floor_ms, ms)))
+
+    def check(self, url: str) -> None:
+        """Raise CircuitOpenError if `url`'s domain should not be visited now."""
+        domain = _domain(url)
+        now = time.monotonic()
+        with self._lock:
+            st = self._state(domain)
+            if st.state == CLOSED:
+                return
+            if st.state == OPEN and now >= st.open_until:
+                st.state, st.probing = HALF_OPEN, False
+            if st.state == HALF_OPEN and not st.probing:
+                st.probing = True  # let exactly one probe through
+                return
+            st.skipped += 1
+            st.saved_seconds += st.failed_seconds / st.failures if st.failures else self.ceiling_ms / 1000
+            retry_in = max(0.0, st.open_until - now)
+        raise CircuitOpenError(domain, retry_in)
+
+    def release(self, url: str) -> None:
+        """Give back a probe granted by check() when the visit failed before goto and never recorded."""
+        with self._lock:
+            st = self._state(_domain(url))
+            if st.state == HALF_OPEN:
+                st.probing = False
+
+    def record(self, url: str, seconds: float, ok: bool, timeout_ms: Optional[int] = None, timed_out: bool = False) -> None:
+        """Feed one visit's outcome back (done for you by visit()/avisit())."""
+        domain = _domain(url)
+        with self._lock:
+            st = self._state(domain)
+            st.visits += 1
+            if ok:
+                st.latencies.append(seconds)
+                self._all.append(seconds)
+                st.consecutive_failures = 0
+                if st.state != CLOSED:
+                    print(f"[guard] {domain}: probe ok, circuit closed")
+                st.state, st.probing, st.cooldown = CLOSED, False, self.cooldown
+                return
+            st.failures += 1
+            st.failed_seconds += seconds
+            st.consecutive_failures += 1
+            if timed_out:
+                st.timeouts += 1
+                if timeout_ms is not None:
+                    st.saved_seconds += max(0, self.ceiling_ms - timeout_ms) / 1000
+            if st.state == HALF_OPEN:
+                st.cooldown = min(self.max_cooldown, st.cooldown * 2)
+                self._open(domain, st)
+            elif st.state == CLOSED and st.consecutive_failures >= self.failure_threshold:
+                self._open(domain, st)
+
+    def _open(self, domain: str, st: DomainState) -> None:
+        st.state, st.probing = OPEN, False
+        st.open_until = time.monotonic() + st.cooldown
+        st.trips += 1
+        print(f"[guard] {domain}: {st.consecutive_failures} consecutive failures, circuit open for {st.cooldown:.0f}s")
+
+    # -- visiting ----------------------------------------------------------
+
+    def visit(self, page, url: str, check: bool = True, **goto_kwargs: Any):
+        """
+        page.goto() with an adaptive timeout, guarded by the domain's circuit.
+        Pass check=False if check(url) was already called for this visit.
+        """
+        if check:
+            self.check(url)
+        timeout_ms = self.timeout_for(url)
+        goto_kwargs["timeout"] = timeout_ms
+        start = time.perf_counter()
+        try:
+            response = page.goto(url, **goto_kwargs)
+        except Exception as e:
+            self.record(url, time.perf_counter() - start, False, timeout_ms, _is_timeout(e))
+            raise
+        self.record(url, time.perf_counter() - start, response is None or response.status < 500)
+        return response
+
+    async def avisit(self, page, url: str, check: bool = True, **goto_kwargs: Any):
+        """Async version of visit() for playwright.async_api pages."""
+        if check:
+            self.check(url)
+        timeout_ms = self.timeout_for(url)
+        goto_kwargs["timeout"] = timeout_ms
+        start = time.perf_counter()
+        try:
+            response = await page.goto(url, **goto_kwargs)
+        except Exception as e:
+            self.record(url, time.perf_counter() - start, False, timeout_ms, _is_timeout(e))
+            raise
+        self.record(url, time.perf_counter() - start, response is None or response.status < 500)
+        return response
+
+    # -- reporting ---------------------------------------------------------
+
+    def tripped(self) -> List[str]:
+        """Domains whose circuit opened at least once."""
+        with self._lock:
+            return sorted(d for d, st in self._domains.items() if st.trips)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            domains = {
+                d: {
+                    "state": st.state,
+                    "visits": st.visits,
+                    "failures": st.failures,
+                    "timeouts": st.timeouts,
+                    "skipped": st.skipped,
+                    "trips": st.trips,
+                    "p95_ms": round(_p95(st.latencies) * 1000) if st.latencies else None,
+                    "saved_s": round(st.saved_seconds, 1),
+                }
+                for d, st in self._domains.items()
+            }
+        return {
+            "visits": sum(d["visits"] for d in domains.values()),
+            "timeouts": sum(d["timeouts"] for d in domains.values()),
+            "skipped": sum(d["skipped"] for d in domains.values()),
+            "saved_seconds": round(sum(d["saved_s"] for d in domains.values()), 1),
+            "tripped": sorted(d for d, s in domains.items() if s["trips"]),
+            "domains": domains,
+        }
+
+    def report(self) -> None:
+        s = self.summary()
+        print(
+            f"[guard] {s['visits']} visits, {s['timeouts']} timeouts, {s['skipped']} skipped by open circuits,"
+            f" ~{s['saved_seconds']}s saved vs a fixed {self.ceiling_ms} ms timeout"
+        )
+        for domain in s["tripped"]:
+            d = s["domains"][domain]
+            print(
+                f"  tripped {domain}: state={d['state']} failures={d['failures']}"
+                f" timeouts={d['timeouts']} skipped={d['skipped']}"
+            )
@@ -0,0 +1,301 @@
+"""Extract all jobs from BVP's job board.
+
+Board: https://jobs.bvp.com/jobs
+
+This board is an infinite-scroll aggregator. Each job card contains:
+- Job title (often an <a> to the external ATS, sometimes an "Apply" link)
+- Metadata (location, posted date, etc.)
+- An external ATS job URL (Greenhouse/Lever/Comeet/etc.)
+
+The rendered DOM we see does *not* reliably include the company name on the main
+aggregator page (at least as of this run). To ensure high-quality company_name,
+we use a two-step approach:
+
+1) Infinite-scroll the main page to collect all unique external job URLs.
+2) For each external job URL, open it in Playwright and extract company name and
+   job title from the destination page's metadata (OpenGraph / title tags).
+
+We then persist each job incrementally via store_job().
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+from playwright.sync_api import sync_playwright
+
+from agent.skills.beautifulsoup.beautifulsoup_functions import scan_hrefs
+from agent.skills.crawling.frontier import Frontier
+from agent.skills.crawling.url_canon import canonical_url, posting_key
+from agent.skills.crawling.visit_guard import CircuitOpenError, VisitGuard
+from agent.skills.jobs_database.jobs_changes_functions import CrawlSession
+from agent.skills.jobs_database.jobs_database_functions import store_job
+from agent.skills.playwright.playwright_functions import crawl_pages
+from agent.skills.telemetry.telemetry_functions import report, span, timed
+
+START_URL = "https://jobs.bvp.com/jobs"
+
+# Pages open at once for external ATS visits (per-host limits adapt below this)
+EXTERNAL_CONCURRENCY = 6
+
+# Durable queue of external job URLs: an interrupted run resumes where it
+# stopped, failed visits are retried with backoff, and URLs finished in the
+# last REVISIT_AFTER seconds are not visited again. The recrawl scheduler
+# passes a window shorter than its interval, so a scheduled run revisits them
+FRONTIER_QUEUE = "bvp:external"
+REVISIT_AFTER = float(os.environ.get("RECRAWL_REVISIT_AFTER", 20 * 3600))
+
+# Upper bound for an external goto; the VisitGuard adapts below it per ATS
+# domain and stops visiting domains that keep failing
+EXTERNAL_TIMEOUT_MS = 60000
+
+ATS_HOST_HINTS = [
+    "greenhouse.io",
+    "lever.co",
+    "ashbyhq.com",
+    "comeet.com",
+    "workday",
+    "myworkdayjobs",
+    "trakstar",
+    "applytojob",
+    "icims.com",
+]
+
+
+def _is_external_job_url(url: str) -> bool:
+    if not url:
+        return False
+    if not (url.startswith("http://") or url.startswith("https://")):
+        return False
+    if re.search(r"https?://jobs\.bvp\.com/", url):
+        return False
+    host = urlparse(url).netloc.lower()
+    return any(h in host for h in ATS_HOST_HINTS)
+
+
+def _job_urls_in_html(html: str, base_url: str = START_URL) -> set[str]:
+    """Canonical external ATS job URLs linked from an HTML snapshot (no parse tree is built)."""
+    return {canonical_url(url) for url in scan_hrefs(html, base_url) if _is_external_job_url(url)}
+
+
+@timed()
+def _collect_job_urls(page, max_rounds: int = 60, start_url: str = START_URL) -> list[str]:
+    stable_rounds = 0
+    last_count = 0
+    seen: dict[str, str] = {}  # posting key -> canonical URL
+
+    for i in range(max_rounds):
+        with span("content") as sp:
+            html = page.content()
+            sp.set(bytes=len(html))
+        with span("parse"):
+            for url in _job_urls_in_html(html, start_url):
+                seen.setdefault(posting_key(url), url)
+
+        count = len(seen)
+        print(f"[scroll] round={i+1} unique_job_urls={count}")
+        if count == last_count:
+            stable_rounds += 1
+        else:
+            stable_rounds = 0
+            last_count = count
+
+        if stable_rounds >= 5:
+            break
+
+        with span("scroll"):
+            page.mouse.wheel(0, 5000)
+        with span("wait"):
+            page.wait_for_timeout(1500)
+
+    return sorted(seen.values())
+
+
+def _meta_content(soup: BeautifulSoup, selector: str) -> str:
+    tag = soup.select_one(selector)
+    if not tag:
+        return ""
+    return (tag.get("content") or "").strip()
+
+
+def _extract_company_and_title_from_external(html: str, url: str) -> tuple[str, str]:
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Try OpenGraph first
+    og_site = _meta_content(soup, 'meta[property="og:site_name"]')
+    og_title = _meta_content(soup, 'meta[property="og:title"]')
+
+    company = og_site
+    title = og_title
+
+    if not title:
+        t = soup.title.get_text(" ", strip=True) if soup.title else ""
+        title = t
+
+    # Clean common patterns in og:title/title
+    # e.g. "Company - Job Title" or "Job Title - Company" or "Job Title | Company"
+    if title and not company:
+        parts = re.split(r"\s[-|•|–|—]\s", title)
+        if len(parts) >= 2:
+            # Heuristic: company tends to be shortest / last
+            company = parts[-1].strip()
+            title = parts[0].strip()
+
+    # Normalize
+    company = (company or "").strip()
+    title = (title or "").strip()
+
+    # If og:site_name is something generic like "Greenhouse" keep parsing
+    if company.lower() in {"greenhouse", "lever", "comeet", "workday"}:
+        company = ""
+
+    # Greenhouse pages often contain company name in header/logo alt
+    if not company and "greenhouse" in url:
+        img = soup.select_one("img[alt]")
+        if img:
+            alt = (img.get("alt") or "").strip()
+            if alt and alt.lower() not in {"greenhouse"}:
+                company = alt
+
+    return company, title
+
+
+def _save_external_job(job_url: str, html: str) -> bool:
+    """Extract company/title from an ATS page and store it. Returns True if saved."""
+    with span("external_parse"):
+        company, title = _extract_company_and_title_from_external(html, job_url)
+
+    if not title:
+        print(f"  - skip (no title)")
+        return False
+    if not company:
+        # Still store, but company unknown is low quality; we skip to match requirements.
+        print(f"  - skip (no company identified)")
+        return False
+
+    with span("store_job"):
+        res = store_job(job_url=job_url, company_name=company, job_title=title, date_posted=None)
+    print(res)
+    return res.startswith("✓")
+
+
+def visit_external_jobs(page, job_urls: list[str], guard: VisitGuard | None = None) -> int:
+    """
+    Visit each external ATS URL one at a time on `page`. With a guard, the
+    goto timeout adapts per domain and tripped domains are skipped.
+    Returns jobs saved.
+    """
+    saved = 0
+    for idx, job_url in enumerate(job_urls, start=1):
+        try:
+            print(f"[{idx}/{len(job_urls)}] visiting {job_url}")
+            with span("external_goto", url=job_url):
+                if guard is not None:
+                    guard.visit(page, job_url, wait_until="domcontentloaded")
+                else:
+                    page.goto(job_url, wait_until="domcontentloaded", timeout=EXTERNAL_TIMEOUT_MS)
+            with span("wait"):
+                page.wait_for_timeout(1500)
+            with span("content") as sp:
+                html = page.content()
+                sp.set(bytes=len(html))
+            if _save_external_job(job_url, html):
+                saved += 1
+        except Exception as e:
+            print(f"  - error: {e}")
+    if guard is not None:
+        guard.report()
+    return saved
+
+
+def visit_external_jobs_concurrently(
+    job_urls: list[str],
+    concurrency: int = EXTERNAL_CONCURRENCY,
+    frontier: Frontier | None = None,
+) -> int:
+    """
+    Visit external ATS URLs with a pool of pages, throttled per ATS host by the
+    adaptive HostScheduler, with goto timeouts and circuit breaking per
+    domain from a VisitGuard. Must run outside a sync_playwright() block.
+
+    With a frontier, `job_urls` are queued in it and visits are claimed from
+    it, so failures are retried (now or on a later run) instead of dropped.
+    Returns jobs saved.
+    """
+    saved = 0
+    guard = VisitGuard(ceiling_ms=EXTERNAL_TIMEOUT_MS)
+
+    def on_page(job_url: str, html: str) -> None:
+        nonlocal saved
+        print(f"visited {job_url}")
+        if _save_external_job(job_url, html):
+            saved += 1
+        if frontier is not None:
+            frontier.complete(job_url)
+
+    def on_error(job_url: str, error: Exception) -> None:
+        print(f"  - error: {job_url}: {error}")
+        if frontier is not None and isinstance(error, CircuitOpenError):
+            # Many postings share an ATS host: skipped, not failed, so a bad
+            # minute on the host doesn't use up attempts for all of them
+            frontier.release(job_url, error.retry_in)
+        elif frontier is not None:
+            state = frontier.fail(job_url, repr(error))
+            print(f"    -> {state}")
+
+    if frontier is not None:
+        queued = frontier.add_many(job_urls, revisit_after=REVISIT_AFTER)
+        print(f"Frontier {frontier.queue}: {queued} queued, {frontier.stats()}")
+        urls = (item.key for item in frontier.iter_claims(batch=concurrency))
+    else:
+        urls = job_urls
+
+    stats = crawl_pages(
+        urls,
+        on_page,
+        on_error=on_error,
+        concurrency=concurrency,
+        settle_ms=1500,
+        goto_kwargs={"wait_until": "domcontentloaded"},
+        guard=guard,
+    )
+    print(f"Visited {stats['visited']} pages ({stats['failed']} failed) in {stats['seconds']}s")
+    for host, host_stats in stats["hosts"].items():
+        print(f"  {host}: {host_stats}")
+    guard.report()
+    if frontier is not None:
+        print(f"Frontier {frontier.queue}: {frontier.stats()}")
+        for url, attempts, error in frontier.failures():
+            print(f"  gave up after {attempts} attempts: {url} ({error})")
+    return saved
+
+
+def main():
+    # Records added/removed/retitled postings vs the previous run (change feed)
+    with CrawlSession("bvp") as crawl:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            page = browser.new_page()
+            with span("goto", url=START_URL):
+                page.goto(START_URL, wait_until="domcontentloaded", timeout=60000)
+            with span("wait"):
+                page.wait_for_timeout(2500)
+
+            job_urls = _collect_job_urls(page)
+            print(f"Discovered external job URLs: {len(job_urls)}")
+
+            browser.close()
+
+        # Everything listed is live, even URLs the frontier won't revisit today
+        crawl.observe_many(job_urls)
+        saved = visit_external_jobs_concurrently(job_urls, frontier=Frontier(FRONTIER_QUEUE, key_fn=canonical_url))
+
+    print(f"Saved this run: {saved}")
+    report()
+
+
+if __name__ == "__main__":
+    main()
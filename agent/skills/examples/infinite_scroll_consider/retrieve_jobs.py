@@ -1,73 +1,119 @@
 from __future__ import annotations
 
-from typing import List, Set, Tuple
+import os
+from typing import Iterator, List, Set, Tuple
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
 from playwright.sync_api import sync_playwright, Page
 
+from agent.skills.beautifulsoup.beautifulsoup_functions import class_strainer, compile_selector, parse_only
+from agent.skills.crawling.frontier import Frontier
+from agent.skills.crawling.url_canon import canonical_url, posting_key
+from agent.skills.crawling.visit_guard import CircuitOpenError, VisitGuard
+from agent.skills.jobs_database.jobs_changes_functions import CrawlSession
 from agent.skills.jobs_database.jobs_database_functions import store_job
+from agent.skills.jobs_database.jobs_titles_functions import NON_JOB_LINK_TEXT, TitleEngine
+from agent.skills.playwright.playwright_functions import ScrollHarvester
+from agent.skills.telemetry.telemetry_functions import report, span, timed
 
 
 BASE_URL = "https://jobs.usv.com/jobs"
 ROOT = "https://jobs.usv.com"
 
+# Keep the DOM and JS heap flat on long lists (see ScrollHarvester).
+# Pruning is off: the board renders its lists with React, and pruning hasn't
+# been verified on the live site (a list re-rendered from JS state would
+# bring pruned rows back or lose items). Set e.g. 20 after checking that the
+# harvested counts match an unpruned run.
+PRUNE_KEEP = None          # harvested items left in the DOM; None = no pruning
+RECYCLE_HEAP_MB = 400      # open a fresh page past this JS heap size
+
+# Company pages are claimed from a durable queue: a crashed run resumes where
+# it stopped and failed companies are retried instead of dropped
+FRONTIER_QUEUE = "usv:companies"
+# Seconds before a finished company is scraped again. The recrawl scheduler
+# passes a window shorter than its interval, so a scheduled run re-scrapes
+# everything; a manual re-run within a day only resumes unfinished companies
+REVISIT_AFTER = float(os.environ.get("RECRAWL_REVISIT_AFTER", 20 * 3600))
+
+COMPANY_TIMEOUT_MS = 15000  # upper bound for a company page goto (VisitGuard adapts below it)
+
+# Scroll rounds only parse the elements they read (see the beautifulsoup skill)
+GROUP_HEADERS = class_strainer("grouped-job-result-header")
+GROUP_HEADER_LINK = compile_selector(".grouped-job-result-header a[href^='/jobs/']")
+JOB_ROWS = class_strainer("job-list-job")
+JOB_ROW = compile_selector(".job-list-job")
+
+# "View all", "Show more", ... links among the job rows, checked in one scan per snapshot
+NON_JOB_LINKS = TitleEngine(exclude=NON_JOB_LINK_TEXT)
+
 
 # ---------------------------------------------------------------------------
 # Company discovery (infinite scroll on main board)
 # ---------------------------------------------------------------------------
 
-def discover_all_companies(page: Page) -> List[str]:
+def _extract_company_slugs(html: str) -> Iterator[Tuple[str, str]]:
+    """Yield (slug, slug) for every company group header in an HTML snapshot."""
+    # Only the group headers are parsed; each holds its company's link
+    soup = parse_only(html, GROUP_HEADERS)
+
+    for header in soup.find_all(recursive=False):
+        header_a = GROUP_HEADER_LINK.select_one(header)
+        if not header_a:
+            continue
+        href = header_a.get("href")
+        if not href or not isinstance(href, str):
+            continue
+
+        slug = href.replace("/jobs/", "").strip().strip("/")
+        if slug:
+            yield slug, slug
+
+
+@timed()
+def discover_all_companies(page: Page, root: str = ROOT) -> List[str]:
     """
     Infinite scroll on main /jobs page to discover all company slugs.
 
+    Scrolls on `page` itself. If its JS heap grows past RECYCLE_HEAP_MB the
+    harvester continues on a fresh page of the same context (and leaves
+    `page` open); harvested company groups are pruned if PRUNE_KEEP is set.
+
+    Args:
+        page: Playwright page object
+        root: Board root URL (a local mock board in tests and benchmarks)
+
     Returns:
         List of company slugs (e.g., ['kickstarter', 'remora', ...])
     """
-    print(f"Discovering companies on {BASE_URL}...")
+    board_url = f"{root}/jobs"
+    print(f"Discovering companies on {board_url}...")
     print("(Using infinite scroll to load all company groups)\n")
 
-    page.goto(BASE_URL, wait_until="networkidle")
-    page.wait_for_timeout(1500)
-
-    company_slugs: Set[str] = set()
     max_scrolls = 200          # generous upper bound
-    stable_checks = 5          # how many rounds with no new companies before stopping
-    stable_rounds = 0
-    last_count = 0
-
-    for i in range(max_scrolls):
-        html = page.content()
-        soup = BeautifulSoup(html, "html.parser")
-
-        # This selector is based on your original script and should work for the main board
-        for group in soup.select("div.grouped-job-result"):
-            header_a = group.select_one(".grouped-job-result-header a[href^='/jobs/']")
-            if not header_a:
-                continue
-            href = header_a.get("href")
-            if not href or not isinstance(href, str):
-                continue
-
-            slug = href.replace("/jobs/", "").strip().strip("/")
-            if slug:
-                company_slugs.add(slug)
-
-        current_count = len(company_slugs)
-        print(f"  Scroll {i+1}/{max_scrolls}: Found {current_count} companies so far...")
-
-        if current_count == last_count:
-            stable_rounds += 1
-            if stable_rounds >= stable_checks:
-                print("  No new companies discovered after several scrolls. Discovery complete!\n")
-                break
-        else:
-            stable_rounds = 0
-            last_count = current_count
-
-        # Scroll down
-        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        page.wait_for_timeout(2000)
+
+    def progress(round_num: int, count: int) -> None:
+        print(f"  Scroll {round_num}/{max_scrolls}: Found {count} companies so far...")
+
+    harvester = ScrollHarvester(
+        page.context,
+        board_url,
+        _extract_company_slugs,
+        item_selector="div.grouped-job-result",
+        prune_keep=PRUNE_KEEP,
+        recycle_heap_mb=RECYCLE_HEAP_MB,
+        max_rounds=max_scrolls,
+        stable_checks=5,       # how many rounds with no new companies before stopping
+        wait_ms=2000,
+        settle_ms=1500,
+        goto_kwargs={"wait_until": "networkidle"},
+        on_round=progress,
+        page=page,
+    )
+    company_slugs: Set[str] = set(harvester.harvest())
+    if harvester.stats["stop"] == "stable":
+        print("  No new companies discovered after several scrolls. Discovery complete!\n")
 
     company_list = sorted(company_slugs)
     print(f"✓ Discovered {len(company_list)} companies total\n")
@@ -106,20 +152,19 @@ def extract_company_name(page: Page, company_slug: str) -> str:
 # Job extraction for a single company (second-level infinite scroll)
 # ---------------------------------------------------------------------------
 
-def _extract_jobs_from_html(html: str) -> List[Tuple[str, str]]:
+def _extract_jobs_from_html(html: str, root: str = ROOT) -> List[Tuple[str, str]]:
     """
     Extract (job_title, job_url) pairs from a single HTML snapshot.
 
     This is intentionally robust & heuristic-based, since we don't want to rely
     on one brittle selector.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    jobs: List[Tuple[str, str]] = []
+    # Only job rows (and their contents) are parsed, not the whole page
+    soup = parse_only(html, JOB_ROWS)
+    candidates: List[Tuple[str, str]] = []
 
     # First, try some likely job container patterns
-    job_containers = soup.select(
-        ".job-list-job"
-    )
+    job_containers = JOB_ROW.select(soup)
     print(f"Found {len(job_containers)} job containers")
     for jc in job_containers:
         # Sometimes the container itself is a link; otherwise, find first <a>
@@ -134,25 +179,17 @@ def _extract_jobs_from_html(html: str) -> List[Tuple[str, str]]:
         title = a.get_text(" ", strip=True)
         if not title:
             continue
+        candidates.append((title, href))
 
-        lower_title = title.lower()
-
-        # Skip obvious non-job links
-        if any(
-            bad in lower_title
-            for bad in [
-                "view all",
-                "show more",
-                "view more",
-                "learn more",
-                "share these results",
-                "back to",
-            ]
-        ):
+    jobs: List[Tuple[str, str]] = []
+    # Skip obvious non-job links (all titles of the snapshot in one batch)
+    excluded = NON_JOB_LINKS.excluded(title for title, _ in candidates)
+    for (title, href), skip in zip(candidates, excluded):
+        if skip:
             continue
 
         # Normalize relative URLs
-        job_url = urljoin(ROOT, href.strip())
+        job_url = urljoin(root, href.strip())
 
         # Skip hash-only or javascript links
         if job_url.endswith("#") or job_url.startswith("javascript:"):
@@ -163,66 +200,69 @@ def _extract_jobs_from_html(html: str) -> List[Tuple[str, str]]:
     return jobs
 
 
-def scrape_company_jobs(page: Page, company_slug: str, seen_urls: Set[str]) -> Tuple[str, int]:
+@timed()
+def scrape_company_jobs(
+    page: Page,
+    company_slug: str,
+    seen_urls: Set[str],
+    guard: VisitGuard | None = None,
+    root: str = ROOT,
+) -> Tuple[str, int]:
     """
     Scrape all jobs for a single company using infinite scroll on their page.
 
     Args:
-        page: Playwright page object
+        page: Playwright page object. It isn't navigated: the company page is opened
+            as a new page in its context and closed when the harvest ends
         company_slug: Company slug (e.g., 'kickstarter')
-        seen_urls: Global set of seen job URLs
+        seen_urls: Global set of posting keys seen (url_canon.posting_key)
+        guard: Optional VisitGuard for adaptive goto timeouts / circuit breaking
+        root: Board root URL the company page and relative job links resolve against
 
     Returns:
         Tuple of (company_name, jobs_saved_count)
     """
-    company_url = urljoin(ROOT, f"/jobs/{company_slug}")
+    company_url = urljoin(root, f"/jobs/{company_slug}")
 
     print(f"→ Scraping {company_slug}...")
-    page.goto(company_url, wait_until="networkidle", timeout=15000)
-    page.wait_for_timeout(1000)
+    # Each company gets its own short-lived page (closed when the harvest ends),
+    # with harvested job rows pruned so long lists don't slow later rounds.
+    harvester = ScrollHarvester(
+        page.context,
+        company_url,
+        lambda html: (
+            (posting_key(job_url), (title, canonical_url(job_url)))
+            for title, job_url in _extract_jobs_from_html(html, root)
+        ),
+        item_selector=".job-list-job",
+        prune_keep=PRUNE_KEEP,
+        recycle_heap_mb=RECYCLE_HEAP_MB,
+        seen=seen_urls,
+        max_rounds=80,
+        stable_checks=4,
+        wait_ms=1500,
+        settle_ms=1000,
+        goto_kwargs={"wait_until": "networkidle", "timeout": COMPANY_TIMEOUT_MS},
+        guard=guard,
+    )
 
-    company_name = extract_company_name(page, company_slug)
+    try:
+        company_name = extract_company_name(harvester.open(), company_slug)
+    except Exception:
+        harvester.close()
+        raise
 
     jobs_saved = 0
-    max_scrolls = 80
-    stable_checks = 4
-    stable_rounds = 0
-    last_jobs_seen = 0  # per company
-
-    for scroll_num in range(max_scrolls):
-        html = page.content()
-        candidate_jobs = _extract_jobs_from_html(html)
-
-        newly_seen = 0
-        for title, job_url in candidate_jobs:
-            if job_url in seen_urls:
-                continue
-            seen_urls.add(job_url)
-
-            # Persist via your existing function
+    for title, job_url in harvester.harvest():
+        # Persist via your existing function
+        with span("store_job"):
             result = store_job(
                 job_url=job_url,
                 company_name=company_name,
                 job_title=title,
             )
-            if isinstance(result, str) and result.startswith("✓"):
-                jobs_saved += 1
-            newly_seen += 1
-
-        total_jobs_seen = last_jobs_seen + newly_seen
-
-        # Stopping condition: if we've seen no new jobs for several scrolls
-        if total_jobs_seen == last_jobs_seen:
-            stable_rounds += 1
-            if stable_rounds >= stable_checks:
-                break
-        else:
-            stable_rounds = 0
-            last_jobs_seen = total_jobs_seen
-
-        # Scroll down for more jobs
-        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        page.wait_for_timeout(1500)
+        if isinstance(result, str) and result.startswith("✓"):
+            jobs_saved += 1
 
     print(f"  ✓ {company_name}: Saved {jobs_saved} jobs\n")
     return company_name, jobs_saved
@@ -248,7 +288,8 @@ def scrape_usv_jobs() -> None:
     total_jobs_saved = 0
     companies_processed: List[Tuple[str, int]] = []
 
-    with sync_playwright() as p:
+    # Change feed: only companies scraped this run are checked for closed postings
+    with CrawlSession("usv", removal_scope="company"), sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         page = browser.new_page()
 
@@ -261,15 +302,30 @@ def scrape_usv_jobs() -> None:
             print("=" * 70)
             print()
 
-            for idx, slug in enumerate(company_slugs, 1):
-                print(f"[{idx}/{len(company_slugs)}] ", end="")
+            guard = VisitGuard(ceiling_ms=COMPANY_TIMEOUT_MS, floor_ms=3000)
+            frontier = Frontier(FRONTIER_QUEUE, lease_seconds=1800)  # one company can take minutes
+            queued = frontier.add_many(company_slugs, revisit_after=REVISIT_AFTER)
+            print(f"Frontier: {queued} companies queued, {frontier.stats()}\n")
+
+            for idx, item in enumerate(frontier.iter_claims(batch=1), 1):
+                slug = item.key
+                print(f"[{idx}] ", end="")
                 try:
-                    company_name, jobs_count = scrape_company_jobs(page, slug, seen_urls)
+                    company_name, jobs_count = scrape_company_jobs(page, slug, seen_urls, guard)
                     total_jobs_saved += jobs_count
                     companies_processed.append((company_name, jobs_count))
+                    frontier.complete(slug)
+                except CircuitOpenError as e:
+                    # Every company page is on the board's host: a tripped circuit
+                    # skips the company, it doesn't count against its attempts
+                    frontier.release(slug, e.retry_in)
+                    print(f"  - Skipped {slug}: {e}\n")
                 except Exception as e:
-                    print(f"  ✗ Error scraping {slug}: {e}\n")
-                    continue
+                    state = frontier.fail(slug, repr(e))
+                    print(f"  ✗ Error scraping {slug} (attempt {item.attempts}, {state}): {e}\n")
+
+            print(f"Frontier: {frontier.stats()}")
+            guard.report()
 
         finally:
             browser.close()
@@ -281,7 +337,7 @@ def scrape_usv_jobs() -> None:
     print("=" * 70)
     print(f"Companies processed: {len(companies_processed)}")
     print(f"Total jobs saved: {total_jobs_saved}")
-    print(f"Unique job URLs: {len(seen_urls)}")
+    print(f"Unique postings: {len(seen_urls)}")
     print("=" * 70)
 
     # Show top companies by job count
@@ -292,6 +348,9 @@ def scrape_usv_jobs() -> None:
             print(f"  • {company}: {count} jobs")
     print()
 
+    # Per-stage timings (only printed when telemetry is enabled)
+    report()
+
 
 if __name__ == "__main__":
     scrape_usv_jobs()
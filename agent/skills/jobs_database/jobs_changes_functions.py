@@ -0,0 +1,391 @@
+"""Change feed: postings added, removed or retitled between crawls of a board.
+
+jobs.jsonl is an append-only log, so "what's new since yesterday" would
+need a full-file diff. Instead every crawl runs in a CrawlSession that
+notes each posting it sees (via a store_job() hook, plus observe() for
+postings seen on a listing), and compares them with the previous crawl
+through an index keyed by the hash of the posting key (url_canon), so one
+posting linked under two URL forms is still one posting:
+
+    jobs_changes.sqlite3        (next to jobs.jsonl)
+        crawls    crawl_id, board, started/finished, counts, status
+        postings  (board, url_hash) -> url, company, title,
+                  first_crawl, last_crawl, removed_crawl
+        changes   (crawl_id, seq) -> added | removed | title_changed
+    jobs_changes.jsonl          the same changes, appended as a JSONL feed
+
+Finishing a crawl touches only the postings it saw plus an index range scan
+for the ones it didn't, and reading the feed since crawl N only reads the
+changes after N. Neither step reads the jobs log.
+
+A posting counts as removed when a finished crawl didn't see it. With
+removal_scope="company" only companies that the crawl saw are considered,
+so a crawl that skipped companies (frontier, failures) doesn't report their
+postings as closed. A crawl that ends with an exception, or one that saw less
+than `min_coverage` of the live postings in scope (the whole board, or the
+companies it saw), reports no removals.
+
+    with CrawlSession("bvp") as crawl:
+        crawl.observe_many(job_urls)         # listing: presence only
+        ...store_job(...)                     # titles/companies via the hook
+    print(crawl.summary)
+
+    for change in iter_changes(since=datetime.now() - timedelta(days=1)):
+        print(change["change"], change["job_url"], change["job_title"])
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from agent.skills.crawling.url_canon import canonical_url, posting_key
+from agent.skills.jobs_database.jobs_database_functions import (
+    add_store_hook,
+    jobs_file_path,
+    remove_store_hook,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawls (
+    crawl_id     INTEGER PRIMARY KEY AUTOINCREMENT,
+    board        TEXT NOT NULL,
+    started_at   REAL NOT NULL,
+    finished_at  REAL,
+    status       TEXT NOT NULL DEFAULT 'running',
+    observed     INTEGER NOT NULL DEFAULT 0,
+    added        INTEGER NOT NULL DEFAULT 0,
+    removed      INTEGER NOT NULL DEFAULT 0,
+    changed      INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS postings (
+    board         TEXT NOT NULL,
+    url_hash      TEXT NOT NULL,
+    job_url       TEXT NOT NULL,
+    company_name  TEXT,
+    job_title     TEXT,
+    first_crawl   INTEGER NOT NULL,
+    last_crawl    INTEGER NOT NULL,
+    removed_crawl INTEGER,
+    PRIMARY KEY (board, url_hash)
+);
+CREATE INDEX IF NOT EXISTS postings_live ON postings (board, removed_crawl, last_crawl);
+CREATE TABLE IF NOT EXISTS changes (
+    crawl_id     INTEGER NOT NULL,
+    seq          INTEGER NOT NULL,
+    change       TEXT NOT NULL,
+    job_url      TEXT NOT NULL,
+    company_name TEXT,
+    job_title    TEXT,
+    old_title    TEXT,
+    PRIMARY KEY (crawl_id, seq)
+);
+"""
+
+CHANGE_KINDS = ("added", "removed", "title_changed")
+
+
+def url_hash(job_url: str) -> str:
+    """Index key of a posting: every URL form of one posting hashes the same."""
+    return hashlib.sha1(posting_key(job_url).encode("utf-8")).hexdigest()[:16]
+
+
+def changes_db_path(jobs_file: Path | None = None) -> Path:
+    jobs_file = Path(jobs_file) if jobs_file else jobs_file_path()
+    return jobs_file.with_name(f"{jobs_file.stem}_changes.sqlite3")
+
+
+def changes_feed_path(jobs_file: Path | None = None) -> Path:
+    jobs_file = Path(jobs_file) if jobs_file else jobs_file_path()
+    return jobs_file.with_name(f"{jobs_file.stem}_changes.jsonl")
+
+
+def _connect(jobs_file: Path | None = None) -> sqlite3.Connection:
+    conn = sqlite3.connect(changes_db_path(jobs_file), timeout=30.0, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class CrawlSession:
+    """
+    One crawl of one board. Records what it sees, and on finish() writes the
+    added / removed / title_changed deltas against the previous crawl.
+
+    Args:
+        board: Board name, e.g. "usv" or "bvp"
+        removal_scope: "board" (anything unseen is removed) or "company"
+            (only postings of companies seen in this crawl)
+        min_coverage: Skip removals if fewer than this fraction of the
+            live postings in scope were seen (a truncated crawl)
+        jobs_file: Database whose change index to use (default jobs_file_path())
+    """
+
+    def __init__(
+        self,
+        board: str,
+        removal_scope: str = "board",
+        min_coverage: float = 0.5,
+        jobs_file: Path | None = None,
+    ):
+        if removal_scope not in ("board", "company"):
+            raise ValueError("removal_scope must be 'board' or 'company'")
+        self.board = board
+        self.removal_scope = removal_scope
+        self.min_coverage = min_coverage
+        self.jobs_file = Path(jobs_file) if jobs_file else jobs_file_path()
+        self.crawl_id: Optional[int] = None
+        self.summary: Dict[str, Any] = {}
+        self._seen: Dict[str, List[Optional[str]]] = {}  # url_hash -> [url, company, title]
+        self._lock = threading.Lock()
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> "CrawlSession":
+        conn = _connect(self.jobs_file)
+        try:
+            cur = conn.execute("INSERT INTO crawls (board, started_at) VALUES (?, ?)", (self.board, time.time()))
+            self.crawl_id = cur.lastrowid
+        finally:
+            conn.close()
+        add_store_hook(self._on_store)
+        return self
+
+    def __enter__(self) -> "CrawlSession":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.finish(complete=exc_type is None)
+        return False
+
+    # -- observing ---------------------------------------------------------
+
+    def observe(self, job_url: str, job_title: str | None = None, company_name: str | None = None) -> None:
+        """Note a posting as present; title/company may be filled in by later calls."""
+        job_url = canonical_url(job_url)
+        key = url_hash(job_url)
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is None:
+                self._seen[key] = [job_url, company_name or None, job_title or None]
+            else:
+                entry[1] = company_name or entry[1]
+                entry[2] = job_title or entry[2]
+
+    def observe_many(self, job_urls: Iterable[str]) -> None:
+        for job_url in job_urls:
+            self.observe(job_url)
+
+    def _on_store(self, job_data: Dict[str, Any]) -> None:
+        self.observe(job_data["job_url"], job_data.get("job_title"), job_data.get("company_name"))
+
+    # -- diff --------------------------------------------------------------
+
+    def finish(self, complete: bool = True) -> Dict[str, Any]:
+        """Write this crawl's deltas. Without `complete`, nothing is reported removed."""
+        remove_store_hook(self._on_store)
+        if self.crawl_id is None:
+            raise RuntimeError("CrawlSession was not started")
+        crawl_id, board = self.crawl_id, self.board
+        with self._lock:
+            seen = [(key, *entry) for key, entry in self._seen.items()]
+
+        conn = _connect(self.jobs_file)
+        changes: List[tuple] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("CREATE TEMP TABLE seen (url_hash TEXT PRIMARY KEY, job_url TEXT, company_name TEXT, job_title TEXT)")
+            conn.executemany("INSERT INTO temp.seen VALUES (?, ?, ?, ?)", seen)
+
+            # New, or back after having been removed
+            changes += [
+                ("added", url, company, title, None)
+                for url, company, title in conn.execute(
+                    "SELECT s.job_url, s.company_name, s.job_title FROM temp.seen s"
+                    " LEFT JOIN postings p ON p.board = ? AND p.url_hash = s.url_hash"
+                    " WHERE p.url_hash IS NULL OR p.removed_crawl IS NOT NULL",
+                    (board,),
+                )
+            ]
+            changes += [
+                ("title_changed", url, company, title, old)
+                for url, company, title, old in conn.execute(
+                    "SELECT s.job_url, COALESCE(s.company_name, p.company_name), s.job_title, p.job_title"
+                    " FROM temp.seen s JOIN postings p ON p.board = ? AND p.url_hash = s.url_hash"
+                    " WHERE p.removed_crawl IS NULL AND s.job_title IS NOT NULL"
+                    " AND p.job_title IS NOT NULL AND s.job_title != p.job_title",
+                    (board,),
+                )
+            ]
+
+            # Removals (and the coverage that gates them) only cover the
+            # companies this crawl looked at when the scope is "company"
+            scope_sql = ""
+            if self.removal_scope == "company":
+                scope_sql = " AND company_name IN (SELECT DISTINCT company_name FROM temp.seen)"
+            live = conn.execute(
+                f"SELECT COUNT(*) FROM postings WHERE board = ? AND removed_crawl IS NULL{scope_sql}", (board,)
+            ).fetchone()[0]
+            coverage = len(seen) / live if live else 1.0
+            check_removals = complete and coverage >= self.min_coverage
+            if complete and not check_removals:
+                print(
+                    f"[changes] {board}: crawl saw {len(seen)} of {live} live postings"
+                    f" (< {self.min_coverage:.0%}), not reporting removals"
+                )
+
+            conn.execute(
+                "INSERT INTO postings (board, url_hash, job_url, company_name, job_title, first_crawl, last_crawl)"
+                " SELECT ?, url_hash, job_url, company_name, job_title, ?, ? FROM temp.seen WHERE true"
+                " ON CONFLICT (board, url_hash) DO UPDATE SET"
+                " company_name = COALESCE(excluded.company_name, company_name),"
+                " job_title = COALESCE(excluded.job_title, job_title),"
+                " first_crawl = CASE WHEN removed_crawl IS NULL THEN first_crawl ELSE excluded.first_crawl END,"
+                " last_crawl = excluded.last_crawl, removed_crawl = NULL",
+                (board, crawl_id, crawl_id),
+            )
+
+            if check_removals:
+                removed = conn.execute(
+                    "SELECT url_hash, job_url, company_name, job_title FROM postings"
+                    f" WHERE board = ? AND removed_crawl IS NULL AND last_crawl < ?{scope_sql}",
+                    (board, crawl_id),
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE postings SET removed_crawl = ? WHERE board = ? AND url_hash = ?",
+                    [(crawl_id, board, key) for key, *_ in removed],
+                )
+                changes += [("removed", url, company, title, None) for _, url, company, title in removed]
+
+            conn.executemany(
+                "INSERT INTO changes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(crawl_id, seq, *change) for seq, change in enumerate(changes)],
+            )
+            counts = {kind: sum(1 for c in changes if c[0] == kind) for kind in CHANGE_KINDS}
+            conn.execute(
+                "UPDATE crawls SET finished_at = ?, status = ?, observed = ?, added = ?, removed = ?, changed = ?"
+                " WHERE crawl_id = ?",
+                (
+                    time.time(),
+                    "complete" if complete else "partial",
+                    len(seen),
+                    counts["added"],
+                    counts["removed"],
+                    counts["title_changed"],
+                    crawl_id,
+                ),
+            )
+            conn.execute("DROP TABLE temp.seen")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        at = datetime.now().isoformat()
+        with open(changes_feed_path(self.jobs_file), "a", encoding="utf-8") as f:
+            for change, url, company, title, old in changes:
+                row = {"crawl_id": crawl_id, "board": board, "change": change, "job_url": url,
+                       "company_name": company, "job_title": title, "at": at}
+                if old is not None:
+                    row["old_title"] = old
+                f.write(json.dumps(row) + "\n")
+
+        self.summary = {"crawl_id": crawl_id, "board": board, "observed": len(seen), **counts}
+        print(
+            f"[changes] {board} crawl {crawl_id}: {len(seen)} seen, {counts['added']} added,"
+            f" {counts['removed']} removed, {counts['title_changed']} retitled"
+        )
+        return self.summary
+
+
+# ---------------------------------------------------------------------------
+# Reading the feed
+# ---------------------------------------------------------------------------
+
+def _since_crawl(conn: sqlite3.Connection, since: datetime | str | float | None) -> int:
+    if since is None:
+        return 0
+    if isinstance(since, datetime):
+        since = since.timestamp()
+    elif isinstance(since, str):
+        since = datetime.fromisoformat(since).timestamp()
+    row = conn.execute("SELECT MIN(crawl_id) FROM crawls WHERE started_at >= ?", (since,)).fetchone()
+    return (row[0] - 1) if row[0] is not None else 1 << 62
+
+
+def iter_changes(
+    since_crawl: int | None = None,
+    since: datetime | str | float | None = None,
+    board: str | None = None,
+    kinds: Iterable[str] | None = None,
+    jobs_file: Path | None = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Changes recorded after crawl `since_crawl` (or by crawls started at/after
+    `since`), oldest first, as dicts like the JSONL feed rows.
+    """
+    conn = _connect(jobs_file)
+    try:
+        after = since_crawl if since_crawl is not None else _since_crawl(conn, since)
+        sql = (
+            "SELECT c.crawl_id, k.board, c.change, c.job_url, c.company_name, c.job_title, c.old_title,"
+            " k.finished_at FROM changes c JOIN crawls k ON k.crawl_id = c.crawl_id WHERE c.crawl_id > ?"
+        )
+        params: List[Any] = [after]
+        if board is not None:
+            sql += " AND k.board = ?"
+            params.append(board)
+        if kinds is not None:
+            kinds = list(kinds)
+            sql += f" AND c.change IN ({','.join('?' * len(kinds))})"
+            params += kinds
+        for crawl_id, brd, change, url, company, title, old, finished in conn.execute(
+            sql + " ORDER BY c.crawl_id, c.seq", params
+        ):
+            row = {"crawl_id": crawl_id, "board": brd, "change": change, "job_url": url,
+                   "company_name": company, "job_title": title,
+                   "at": datetime.fromtimestamp(finished).isoformat() if finished else None}
+            if old is not None:
+                row["old_title"] = old
+            yield row
+    finally:
+        conn.close()
+
+
+def list_crawls(board: str | None = None, limit: int = 20, jobs_file: Path | None = None) -> List[Dict[str, Any]]:
+    """Most recent crawls with their change counts, newest first."""
+    conn = _connect(jobs_file)
+    try:
+        conn.row_factory = sqlite3.Row
+        sql = "SELECT * FROM crawls" + (" WHERE board = ?" if board else "") + " ORDER BY crawl_id DESC LIMIT ?"
+        return [dict(r) for r in conn.execute(sql, ([board] if board else []) + [limit])]
+    finally:
+        conn.close()
+
+
+def snapshot(board: str, crawl_id: int | None = None, jobs_file: Path | None = None) -> Iterator[Dict[str, Any]]:
+    """
+    Postings live on `board` as of crawl `crawl_id` (default: the latest).
+    Postings that were removed and came back later only show from their return.
+    """
+    conn = _connect(jobs_file)
+    try:
+        if crawl_id is None:
+            sql, params = "WHERE board = ? AND removed_crawl IS NULL", [board]
+        else:
+            sql = "WHERE board = ? AND first_crawl <= ? AND (removed_crawl IS NULL OR removed_crawl > ?)"
+            params = [board, crawl_id, crawl_id]
+        for url, company, title in conn.execute(
+            f"SELECT job_url, company_name, job_title FROM postings {sql}", params
+        ):
+            yield {"job_url": url, "company_name": company, "job_title": title}
+    finally:
+        conn.close()
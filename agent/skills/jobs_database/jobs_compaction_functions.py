@@ -0,0 +1,515 @@
+"""Compaction, rotation and compressed segments for the jobs database.
+
+Layout (next to jobs.jsonl):
+
+    jobs.jsonl                      active log; store_job() appends here
+    jobs.jsonl.lock                 rotation lock (writers shared, rotation exclusive)
+    jobs_segments/
+        MANIFEST.json               {"segments": [...], "next_id": N, "merged": [...]},
+                                    swapped atomically
+        seg-000007.jsonl.gz         sorted, deduplicated rows, compressed in blocks
+        seg-000007.idx.json         sparse index: first key + byte range of each block
+        pending-<ns>.jsonl          rotated logs not yet merged (crash leftovers);
+                                    ones listed in the manifest's "merged" are
+                                    already in its segment and only await deletion
+        run-<ns>-<n>.tmp            sorted spill runs, only while compact() runs
+
+`compact()` rotates the active log out of the way (writers immediately start a
+fresh jobs.jsonl), merges it with the existing segments into one new segment
+keyed by posting_key(job_url) (the newest row wins, so one posting saved
+under two URL forms is kept once), swaps the manifest and deletes what it
+replaced. The logs are sorted in bounded memory: runs of `run_rows` rows
+are sorted and spilled to temp files, then merged with the segments. Each block of a segment is an independent gzip member (or zstd
+frame), so a segment is also a valid .gz/.zst file, and `lookup()` only
+decompresses the one block the sparse index points to.
+
+`iter_merged_lines()` gives readers one streaming view over segments,
+pending logs and the active log: the compacted rows (one per posting),
+then every row saved since the last compaction, in write order. Rows saved
+since then are not deduplicated until the next compact(), so a job saved
+twice after it appears twice. Memory use doesn't grow with the database.
+`merged_view()` opens the same snapshot for readers that track their own
+position in the logs, like the Parquet export.
+"""
+
+from __future__ import annotations
+
+import bisect
+import gzip
+import heapq
+import itertools
+import json
+import mmap
+import os
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from agent.skills.crawling.url_canon import posting_key
+from agent.skills.jobs_database.jobs_database_functions import jobs_file_path, rotation_lock
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+DEFAULT_BLOCK_ROWS = 1000
+DEFAULT_RUN_ROWS = 50_000  # log rows sorted in memory at a time by compact()
+MANIFEST = "MANIFEST.json"
+CODEC_SUFFIX = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+_KEY_RE = re.compile(rb'^\{"job_url": "((?:[^"\\]|\\.)*)"')
+
+
+class CompactionInProgress(RuntimeError):
+    """Another process is already compacting this database."""
+
+
+# ---------------------------------------------------------------------------
+# Paths and small helpers
+# ---------------------------------------------------------------------------
+
+def segments_dir(jobs_file: Path | None = None) -> Path:
+    jobs_file = Path(jobs_file) if jobs_file else jobs_file_path()
+    return jobs_file.with_name(f"{jobs_file.stem}_segments")
+
+
+def line_url(line: bytes) -> str:
+    """job_url of a stored row, without a full JSON decode when possible."""
+    match = _KEY_RE.match(line)
+    if match and b"\\" not in match.group(1):
+        return match.group(1).decode("utf-8")
+    try:
+        return str(json.loads(line).get("job_url", ""))
+    except ValueError:
+        return ""
+
+
+def line_key(line: bytes) -> str:
+    """Dedup key of a stored row: the posting key of its job_url."""
+    return posting_key(line_url(line))
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if codec == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=6).compress(data)
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        return gzip.decompress(data)
+    if codec == "zstd":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+def _write_json_atomic(path: Path, data: dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _read_manifest(seg_dir: Path) -> dict:
+    try:
+        return json.loads((seg_dir / MANIFEST).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {"segments": [], "next_id": 1}
+
+
+def _pending_logs(seg_dir: Path, manifest: dict) -> List[Path]:
+    """Rotated logs not yet merged into the manifest's segments, oldest first."""
+    if not seg_dir.exists():
+        return []
+    merged = set(manifest.get("merged", ()))
+    return [p for p in sorted(seg_dir.glob("pending-*.jsonl")) if p.name not in merged]
+
+
+def iter_log_lines(f, start: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """
+    (end offset, line) for the complete, non-empty lines of an open log from
+    byte `start` on, via mmap. The end offset is just past the line's newline.
+    """
+    size = os.fstat(f.fileno()).st_size
+    if size <= start:
+        return
+    with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < size:
+            end = mm.find(b"\n", pos)
+            if end == -1:
+                # Trailing partial line (a writer mid-append); skip it
+                return
+            if end > pos:
+                yield end + 1, mm[pos:end]
+            pos = end + 1
+
+
+def _iter_mapped_lines(f) -> Iterator[bytes]:
+    """Complete, non-empty lines of an open binary file, via mmap."""
+    for _, line in iter_log_lines(f):
+        yield line
+
+
+# ---------------------------------------------------------------------------
+# Segments
+# ---------------------------------------------------------------------------
+
+class Segment:
+    """A sorted, deduplicated, block-compressed run of rows plus its sparse index."""
+
+    def __init__(self, seg_dir: Path, name: str):
+        self.name = name
+        self.index_path = seg_dir / f"{name}.idx.json"
+        self.index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        self.codec = self.index["codec"]
+        self.data_path = seg_dir / f"{name}{CODEC_SUFFIX[self.codec]}"
+        self._first_keys = [block[0] for block in self.index["blocks"]]
+
+    @property
+    def rows(self) -> int:
+        return self.index["rows"]
+
+    def open(self):
+        return open(self.data_path, "rb")
+
+    def iter_lines(self, f=None) -> Iterator[bytes]:
+        """All rows in key order."""
+        own = f is None
+        f = f or self.open()
+        try:
+            for _, offset, length, _ in self.index["blocks"]:
+                f.seek(offset)
+                yield from _decompress(f.read(length), self.codec).splitlines()
+        finally:
+            if own:
+                f.close()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Row for `key`, decompressing only the block that can contain it."""
+        idx = bisect.bisect_right(self._first_keys, key) - 1
+        if idx < 0:
+            return None
+        _, offset, length, _ = self.index["blocks"][idx]
+        with self.open() as f:
+            f.seek(offset)
+            block = _decompress(f.read(length), self.codec)
+        for line in block.splitlines():
+            if line_key(line) == key:
+                return line
+        return None
+
+
+def write_segment(
+    seg_dir: Path,
+    name: str,
+    rows: Iterator[Tuple[str, bytes]],
+    codec: str = "gzip",
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+) -> Segment:
+    """Write key-sorted (key, line) rows as a new segment; files appear atomically."""
+    data_path = seg_dir / f"{name}{CODEC_SUFFIX[codec]}"
+    index_path = seg_dir / f"{name}.idx.json"
+    tmp_data = data_path.with_name(data_path.name + ".tmp")
+
+    blocks: List[list] = []
+    total = 0
+    offset = 0
+    with open(tmp_data, "wb") as out:
+        while True:
+            chunk = list(itertools.islice(rows, block_rows))
+            if not chunk:
+                break
+            payload = _compress(b"".join(line + b"\n" for _, line in chunk), codec)
+            out.write(payload)
+            blocks.append([chunk[0][0], offset, len(payload), len(chunk)])
+            offset += len(payload)
+            total += len(chunk)
+        out.flush()
+        os.fsync(out.fileno())
+
+    os.replace(tmp_data, data_path)
+    _write_json_atomic(index_path, {"codec": codec, "rows": total, "blocks": blocks})
+    return Segment(seg_dir, name)
+
+
+def _keyed(lines: Iterator[bytes], gen: int) -> Iterator[Tuple[str, int, bytes]]:
+    """(key, generation, line) rows for heapq.merge; a newer generation sorts last per key."""
+    for line in lines:
+        yield line_key(line), gen, line
+
+
+# ---------------------------------------------------------------------------
+# Merged read view
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def _snapshot(jobs_file: Path, retries: int = 3):
+    """
+    Open every file of the current view: active log, manifest segments, pending logs.
+
+    A rotation (the active log changes inode) or a compaction (the manifest
+    changes) while the files are being opened would make rows show up twice
+    or not at all, so the snapshot is retried until neither happened. Files
+    deleted by a concurrent compaction between listing and opening also
+    cause a retry. Pending logs the manifest lists as merged are skipped:
+    their rows are already in the segment.
+    """
+    seg_dir = segments_dir(jobs_file)
+    for attempt in range(retries + 1):
+        handles = []
+        try:
+            active = open(jobs_file, "rb") if jobs_file.exists() else None
+            if active:
+                handles.append(active)
+            manifest = _read_manifest(seg_dir)
+            segments = [Segment(seg_dir, name) for name in manifest["segments"]]
+            seg_handles = [seg.open() for seg in segments]
+            handles.extend(seg_handles)
+            pending = [open(p, "rb") for p in _pending_logs(seg_dir, manifest)]
+            handles.extend(pending)
+            stable = _read_manifest(seg_dir) == manifest and (
+                active is None or os.stat(jobs_file).st_ino == os.fstat(active.fileno()).st_ino
+            )
+        except FileNotFoundError:
+            stable = False
+        if not stable:
+            for h in handles:
+                h.close()
+            if attempt == retries:
+                raise RuntimeError(f"{jobs_file} kept changing while opening a read snapshot")
+            time.sleep(0.05)
+            continue
+        try:
+            yield list(zip(segments, seg_handles)), pending, active
+        finally:
+            for h in handles:
+                h.close()
+        return
+
+
+def _segment_lines(segments: List[Tuple[Segment, object]]) -> Iterator[bytes]:
+    """Compacted rows of the snapshot's segments, one per posting key, in key order."""
+    if len(segments) == 1:
+        seg, handle = segments[0]
+        yield from seg.iter_lines(handle)
+    elif segments:
+        # Only after an interrupted compaction; the newest segment wins
+        merged = heapq.merge(*(_keyed(seg.iter_lines(handle), gen) for gen, (seg, handle) in enumerate(segments)))
+        for _, group in itertools.groupby(merged, key=lambda row: row[0]):
+            yield list(group)[-1][2]
+
+
+@contextmanager
+def merged_view(jobs_file: Path | None = None):
+    """
+    The files behind iter_merged_lines(), opened as one consistent snapshot.
+
+    Yields (segment_names, compacted, logs): the manifest's segment names,
+    an iterator over the compacted rows and the open pending and active
+    logs, oldest first (read them with iter_log_lines()).
+    """
+    jobs_file = Path(jobs_file) if jobs_file else jobs_file_path()
+    with _snapshot(jobs_file) as (segments, pending, active):
+        yield [seg.name for seg, _ in segments], _segment_lines(segments), pending + ([active] if active else [])
+
+
+def iter_merged_lines(jobs_file: Path | None = None) -> Iterator[bytes]:
+    """
+    Every stored row of the database as raw JSON lines, streamed.
+
+    Compacted rows (one per posting key) come first in key order, followed by
+    the rows of the pending and active logs in write order, as saved: a job
+    saved again since the last compaction appears once per save.
+    """
+    with merged_view(jobs_file) as (_, compacted, logs):
+        yield from compacted
+        for f in logs:
+            yield from _iter_mapped_lines(f)
+
+
+def lookup(job_url: str, jobs_file: Path | None = None) -> Optional[dict]:
+    """Latest stored row for the posting at `job_url` (any URL form), using the segments' sparse indexes."""
+    jobs_file = Path(jobs_file) if jobs_file else jobs_file_path()
+    key = posting_key(job_url)
+    with _snapshot(jobs_file) as (segments, pending, active):
+        found = None
+        for f in pending + ([active] if active else []):
+            for line in _iter_mapped_lines(f):
+                if line_key(line) == key:
+                    found = line
+        if found is None:
+            for seg, _ in reversed(segments):
+                found = seg.get(key)
+                if found is not None:
+                    break
+    return json.loads(found) if found is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Compaction
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def _compaction_lock(seg_dir: Path):
+    seg_dir.mkdir(parents=True, exist_ok=True)
+    with open(seg_dir / ".compact.lock", "a") as f:
+        if fcntl is not None:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise CompactionInProgress(f"{seg_dir} is already being compacted")
+        yield
+
+
+def rotate_active(jobs_file: Path | None = None) -> Optional[Path]:
+    """
+    Move the active log into the segments dir as a pending log.
+
+    Taken under the exclusive rotation lock, so no store_job() call is
+    mid-append; the next call creates a fresh jobs.jsonl.
+    """
+    jobs_file = Path(jobs_file) if jobs_file else jobs_file_path()
+    seg_dir = segments_dir(jobs_file)
+    seg_dir.mkdir(parents=True, exist_ok=True)
+    with rotation_lock(jobs_file, exclusive=True):
+        if not jobs_file.exists() or jobs_file.stat().st_size == 0:
+            return None
+        target = seg_dir / f"pending-{time.time_ns()}.jsonl"
+        os.replace(jobs_file, target)
+    return target
+
+
+def _iter_log(path: Path) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        yield from _iter_mapped_lines(f)
+
+
+def _spill_runs(sources: List[Iterator[bytes]], seg_dir: Path, run_rows: int) -> Tuple[List[Path], int]:
+    """
+    Sort rows (oldest source first) into key-sorted run files of at most `run_rows` rows.
+
+    Within a run the last row per key wins; runs are returned oldest first.
+    Returns (run paths, rows read).
+    """
+    runs: List[Path] = []
+    chunk: Dict[str, bytes] = {}
+    rows_in = 0
+
+    def spill() -> None:
+        path = seg_dir / f"run-{time.time_ns()}-{len(runs)}.tmp"
+        with open(path, "wb") as out:
+            for key in sorted(chunk):
+                out.write(chunk[key] + b"\n")
+        runs.append(path)
+        chunk.clear()
+
+    for lines in sources:
+        for line in lines:
+            rows_in += 1
+            chunk[line_key(line)] = line
+            if len(chunk) >= run_rows:
+                spill()
+    if chunk:
+        spill()
+    return runs, rows_in
+
+
+def _iter_run(path: Path) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        for line in f:
+            yield line.rstrip(b"\n")
+
+
+def compact(
+    jobs_file: Path | None = None,
+    codec: str = "gzip",
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+    run_rows: int = DEFAULT_RUN_ROWS,
+) -> dict:
+    """
+    Rewrite the database into one sorted, deduplicated, compressed segment.
+
+    At most `run_rows` log rows are held in memory at a time (see _spill_runs).
+
+    Writers keep appending to a fresh active log throughout; readers keep
+    seeing a consistent merged view because the manifest is swapped
+    atomically and replaced files are only deleted afterwards. The manifest
+    names the pending logs the new segment consumed, so readers skip them
+    until they are deleted (or after a crash before that).
+
+    Returns:
+        Stats: rows_in, rows_out, bytes_before, bytes_after, seconds
+    """
+    start = time.perf_counter()
+    jobs_file = Path(jobs_file) if jobs_file else jobs_file_path()
+    seg_dir = segments_dir(jobs_file)
+
+    with _compaction_lock(seg_dir):
+        rotate_active(jobs_file)
+
+        manifest = _read_manifest(seg_dir)
+        for name in manifest.get("merged", ()):
+            (seg_dir / name).unlink(missing_ok=True)  # merged by a compaction that crashed before deleting them
+        old_segments = [Segment(seg_dir, name) for name in manifest["segments"]]
+        pending_paths = _pending_logs(seg_dir, manifest)
+        bytes_before = sum(p.stat().st_size for p in pending_paths) + sum(
+            s.data_path.stat().st_size + s.index_path.stat().st_size for s in old_segments
+        )
+
+        for leftover in seg_dir.glob("run-*.tmp"):
+            leftover.unlink(missing_ok=True)
+        runs, rows_in = _spill_runs([_iter_log(p) for p in pending_paths], seg_dir, run_rows)
+        rows_in += sum(s.rows for s in old_segments)
+        try:
+            # Newer generations sort after older ones for the same key; keep the last
+            sources = [seg.iter_lines() for seg in old_segments] + [_iter_run(run) for run in runs]
+            merged = heapq.merge(*(_keyed(lines, gen) for gen, lines in enumerate(sources)))
+            deduped = ((key, list(group)[-1][2]) for key, group in itertools.groupby(merged, key=lambda row: row[0]))
+
+            name = f"seg-{manifest['next_id']:06d}"
+            new_segment = write_segment(seg_dir, name, deduped, codec=codec, block_rows=block_rows)
+        finally:
+            for run in runs:
+                run.unlink(missing_ok=True)
+
+        _write_json_atomic(
+            seg_dir / MANIFEST,
+            {"segments": [name], "next_id": manifest["next_id"] + 1, "merged": [p.name for p in pending_paths]},
+        )
+
+        for seg in old_segments:
+            seg.data_path.unlink(missing_ok=True)
+            seg.index_path.unlink(missing_ok=True)
+        for path in pending_paths:
+            path.unlink(missing_ok=True)
+
+    bytes_after = new_segment.data_path.stat().st_size + new_segment.index_path.stat().st_size
+    stats = {
+        "segment": name,
+        "rows_in": rows_in,
+        "rows_out": new_segment.rows,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    print(
+        f"✓ Compacted {rows_in} rows into {new_segment.rows} unique jobs "
+        f"({bytes_before / 2**20:.1f} MB -> {bytes_after / 2**20:.1f} MB)"
+    )
+    return stats
+
+
+if __name__ == "__main__":
+    compact()
@@ -1,6 +1,113 @@
 import json
+import os
+import threading
+from contextlib import contextmanager
 from datetime import date, datetime
 from pathlib import Path
+from typing import Iterable
+
+from agent.skills.crawling.url_canon import canonical_url
+
+try:
+    import fcntl
+except ImportError:  # Windows: no rotation lock, compaction must run with scrapers stopped
+    fcntl = None
+
+# Default database location: agent/jobs.jsonl
+DEFAULT_JOBS_FILE = Path(__file__).parent.parent.parent / "jobs.jsonl"
+
+
+def jobs_file_path() -> Path:
+    """Path of the jobs database; JOBS_DB_PATH overrides it (benchmarks, temp runs)."""
+    override = os.environ.get("JOBS_DB_PATH")
+    return Path(override) if override else DEFAULT_JOBS_FILE
+
+
+def fsync_enabled() -> bool:
+    """JOBS_DB_FSYNC=1 makes every write durable (fsync before store_job returns)."""
+    return os.environ.get("JOBS_DB_FSYNC", "") not in ("", "0")
+
+
+_lock_files = threading.local()
+
+# Called with each row after store_job() saves it (e.g. change-feed crawl sessions)
+_store_hooks: list = []
+
+
+def add_store_hook(hook) -> None:
+    """Register hook(job_data) to run after every successful store_job()."""
+    _store_hooks.append(hook)
+
+
+def remove_store_hook(hook) -> None:
+    if hook in _store_hooks:
+        _store_hooks.remove(hook)
+
+
+def _run_store_hooks(row: dict) -> None:
+    # The row is already saved; a failing hook is logged, not raised into the scraper
+    for hook in list(_store_hooks):
+        try:
+            hook(row)
+        except Exception as e:
+            print(f"✗ Store hook {getattr(hook, '__qualname__', hook)} failed for {row['job_url']}: {e}")
+
+
+@contextmanager
+def rotation_lock(jobs_file: Path, exclusive: bool = False):
+    """Writers hold this shared while appending; compaction takes it exclusive to rotate the log."""
+    if fcntl is None:
+        yield
+        return
+    lock_path = str(jobs_file) + ".lock"
+    if exclusive:
+        # Own file description, so it also excludes writer threads of this process
+        with open(lock_path, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            yield
+        return
+    # Writers reuse one descriptor per thread (and per process, after a fork)
+    # to keep store_job() cheap
+    cache = _lock_files.__dict__
+    pid, f = cache.get(lock_path, (None, None))
+    if f is None or pid != os.getpid():
+        f = open(lock_path, "a")
+        cache[lock_path] = (os.getpid(), f)
+    fcntl.flock(f.fileno(), fcntl.LOCK_SH)
+    try:
+        yield
+    finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _job_row(job_url: str, company_name: str, job_title: str, date_posted: date|str|None = None) -> dict:
+    if date_posted is None:
+        date_posted = date.today()
+    return {
+        "job_url": canonical_url(job_url),
+        "company_name": company_name,
+        "job_title": job_title,
+        "date_posted": date_posted.isoformat() if isinstance(date_posted, date) else str(date_posted),
+        "date_saved": datetime.now().isoformat()
+    }
+
+
+def _append(jobs_file: Path, data: bytes, fsync: bool) -> None:
+    """
+    Append with a single write() on an O_APPEND descriptor, so lines from
+    concurrent writers never interleave (buffered files may split big rows
+    into several writes).
+    """
+    fd = os.open(jobs_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
 
 def store_job(job_url: str, company_name: str, job_title: str, date_posted: date|None = None):
     """Store a job posting to the shared jobs database.
@@ -14,23 +121,42 @@ def store_job(job_url: str, company_name: str, job_title: str, date_posted: date
     Returns:
         Success or error message
     """
-    if date_posted is None:
-        date_posted = date.today()
-        
     # Use absolute path from project root
-    jobs_file = Path(__file__).parent.parent.parent / "jobs.jsonl"
+    jobs_file = jobs_file_path()
     
-    job_data = {
-        "job_url": job_url,
-        "company_name": company_name,
-        "job_title": job_title,
-        "date_posted": date_posted.isoformat() if isinstance(date_posted, date) else str(date_posted),
-        "date_saved": datetime.now().isoformat()
-    }
+    job_data = _job_row(job_url, company_name, job_title, date_posted)
     
     try:
-        with open(jobs_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(job_data) + '\n')
-        return f"✓ Job saved: {job_title} at {company_name}"
+        with rotation_lock(jobs_file):
+            _append(jobs_file, (json.dumps(job_data) + '\n').encode('utf-8'), fsync_enabled())
+    except Exception as e:
+        return f"✗ Error saving job: {str(e)}"
+    _run_store_hooks(job_data)
+    return f"✓ Job saved: {job_title} at {company_name}"
+
+
+def store_jobs(jobs: Iterable[dict], fsync: bool | None = None, jobs_file: Path | None = None):
+    """Store many job postings with one append (coordinator batches, bulk imports).
+
+    Args:
+        jobs: Dicts with job_url, company_name, job_title and optionally date_posted
+        fsync: Force (True) or skip (False) an fsync; defaults to JOBS_DB_FSYNC
+        jobs_file: Store to append to (default jobs_file_path())
+
+    Returns:
+        Success or error message
+    """
+    jobs_file = Path(jobs_file) if jobs_file else jobs_file_path()
+    rows = [_job_row(j["job_url"], j["company_name"], j["job_title"], j.get("date_posted")) for j in jobs]
+    if not rows:
+        return "✓ Saved 0 jobs"
+
+    try:
+        with rotation_lock(jobs_file):
+            data = "".join(json.dumps(row) + '\n' for row in rows).encode('utf-8')
+            _append(jobs_file, data, fsync_enabled() if fsync is None else fsync)
     except Exception as e:
-        return f"✗ Error saving job: {str(e)}"
\ No newline at end of file
+        return f"✗ Error saving jobs: {str(e)}"
+    for row in rows:
+        _run_store_hooks(row)
+    return f"✓ Saved {len(rows)} jobs"
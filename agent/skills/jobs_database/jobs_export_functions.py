@@ -0,0 +1,241 @@
+"""Columnar Parquet export of the jobs database for analytics.
+
+Converts saved rows into a hive-partitioned Parquet dataset
+
+    agent/jobs_parquet/saved_month=2025-12/part-<ns>.parquet
+
+with a dictionary-encoded company_name, date32 date_posted and timestamp
+date_saved, so aggregate queries run vectorized instead of re-parsing JSON.
+
+Exports are incremental: _export_state.json remembers, per log file (by
+inode), the byte offset already exported. The next run only reads what was
+appended since. Rotation keeps the inode (jobs.jsonl becomes a pending log),
+so a rotated log is picked up where the last run stopped. Rows that
+compaction merged into a new segment before they were exported are taken
+from the segment: those saved after the newest date_saved exported so far.
+
+The dataset is an append-only record of saves: a job saved twice appears
+twice. Saves that compaction collapsed before they were ever exported
+appear once, as the row it kept, and a row that reached the log late with
+an older date_saved than rows already exported is missed if compaction
+merges it before the next export. Deduplicate on job_url in the query if
+needed.
+
+Requires pyarrow (pip install pyarrow).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from agent.skills.jobs_database.jobs_compaction_functions import iter_log_lines, merged_view
+from agent.skills.jobs_database.jobs_database_functions import jobs_file_path
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+BATCH_ROWS = 100_000
+STATE_FILE = "_export_state.json"
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Parquet export requires pyarrow: pip install pyarrow")
+
+
+def export_dir(jobs_file: Path | None = None) -> Path:
+    jobs_file = Path(jobs_file) if jobs_file else jobs_file_path()
+    return jobs_file.with_name(f"{jobs_file.stem}_parquet")
+
+
+def _schema():
+    return pa.schema(
+        [
+            ("job_url", pa.string()),
+            ("company_name", pa.dictionary(pa.int32(), pa.string())),
+            ("job_title", pa.string()),
+            ("date_posted", pa.date32()),
+            ("date_saved", pa.timestamp("us")),
+            ("saved_month", pa.string()),
+        ]
+    )
+
+
+def _parse_date(value) -> Optional[date]:
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _read_state(out_dir: Path) -> dict:
+    try:
+        return json.loads((out_dir / STATE_FILE).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_state(out_dir: Path, state: dict) -> None:
+    tmp = out_dir / (STATE_FILE + ".tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(tmp, out_dir / STATE_FILE)
+
+
+def _log_head(f) -> str:
+    """Hash of a log's first line; tells a rotated log from a new file that reuses its inode."""
+    for _, line in iter_log_lines(f):
+        return hashlib.sha1(line).hexdigest()
+    return ""
+
+
+def _new_lines(jobs_file: Path, state: dict) -> Iterator[bytes]:
+    """
+    Rows not exported yet, from one merged-view snapshot; updates `state`.
+
+    Each log is read from its exported offset to the end of what the
+    snapshot mapped, and the offset recorded is the end of the last complete
+    line read. Compacted rows are read on the first export, and afterwards
+    only when a new segment appeared (see the module docstring).
+    """
+    first = "logs" not in state
+    exported = state.get("logs", {})
+    watermark = state.get("watermark", "")
+    with merged_view(jobs_file) as (segment_names, compacted, logs):
+        if first or not set(segment_names) <= set(state.get("segments", ())):
+            for line in compacted:
+                if first:
+                    yield line
+                    continue
+                try:
+                    saved = json.loads(line).get("date_saved", "")
+                except ValueError:
+                    continue
+                if saved > watermark:
+                    yield line
+
+        tracked = {}
+        for f in logs:
+            inode, head = str(os.fstat(f.fileno()).st_ino), _log_head(f)
+            known = exported.get(inode)
+            offset = known["offset"] if known and known["head"] == head else 0
+            tracked[inode] = {"head": head, "offset": offset}
+            for end, line in iter_log_lines(f, offset):
+                tracked[inode]["offset"] = end
+                yield line
+    # Logs no longer in the view were merged into a segment (read above)
+    state["logs"] = tracked
+    state["segments"] = segment_names
+
+
+def _write_batch(rows: List[dict], out_dir: Path) -> int:
+    table = pa.Table.from_pydict(
+        {
+            "job_url": [r.get("job_url", "") for r in rows],
+            "company_name": [r.get("company_name", "") for r in rows],
+            "job_title": [r.get("job_title", "") for r in rows],
+            "date_posted": [_parse_date(r.get("date_posted")) for r in rows],
+            "date_saved": [_parse_timestamp(r.get("date_saved")) for r in rows],
+            "saved_month": [str(r.get("date_saved", ""))[:7] or "unknown" for r in rows],
+        },
+        schema=_schema(),
+    )
+    ds.write_dataset(
+        table,
+        out_dir,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([("saved_month", pa.string())]), flavor="hive"),
+        basename_template=f"part-{time.time_ns()}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return table.num_rows
+
+
+def export_parquet(jobs_file: Path | None = None, out_dir: Path | None = None) -> dict:
+    """
+    Export rows saved since the last run into the Parquet dataset.
+
+    Returns:
+        Stats: rows_exported, seconds, out_dir
+    """
+    _require_pyarrow()
+    start = time.perf_counter()
+    jobs_file = Path(jobs_file) if jobs_file else jobs_file_path()
+    out_dir = Path(out_dir) if out_dir else export_dir(jobs_file)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    state = _read_state(out_dir)
+    exported = 0
+    batch: List[dict] = []
+    for line in _new_lines(jobs_file, state):
+        try:
+            row = json.loads(line)
+        except ValueError:
+            continue
+        batch.append(row)
+        state["watermark"] = max(state.get("watermark", ""), str(row.get("date_saved", "")))
+        if len(batch) >= BATCH_ROWS:
+            exported += _write_batch(batch, out_dir)
+            batch = []
+    if batch:
+        exported += _write_batch(batch, out_dir)
+
+    _write_state(out_dir, state)
+
+    stats = {"rows_exported": exported, "seconds": round(time.perf_counter() - start, 3), "out_dir": str(out_dir)}
+    print(f"✓ Exported {exported} rows to {out_dir}")
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Vectorized queries
+# ---------------------------------------------------------------------------
+
+def load_dataset(out_dir: Path | None = None):
+    """The exported Parquet dataset as a pyarrow.dataset.Dataset."""
+    _require_pyarrow()
+    out_dir = Path(out_dir) if out_dir else export_dir()
+    return ds.dataset(out_dir, format="parquet", partitioning="hive", exclude_invalid_files=True)
+
+
+def jobs_per_company(out_dir: Path | None = None, unique: bool = True):
+    """Table of (company_name, jobs) sorted by jobs descending."""
+    table = load_dataset(out_dir).to_table(columns=["job_url", "company_name"])
+    table = table.set_column(1, "company_name", pc.cast(table["company_name"], pa.string()))
+    agg = "count_distinct" if unique else "count"
+    result = table.group_by("company_name").aggregate([("job_url", agg)])
+    return result.rename_columns(["company_name", "jobs"]).sort_by([("jobs", "descending")])
+
+
+def postings_per_month(out_dir: Path | None = None):
+    """Table of (month, postings) by date_posted month."""
+    table = load_dataset(out_dir).to_table(columns=["date_posted"])
+    months = pc.strftime(pc.cast(table["date_posted"], pa.timestamp("s")), format="%Y-%m")
+    result = pa.table({"month": months}).group_by("month").aggregate([("month", "count")])
+    return result.rename_columns(["month", "postings"]).sort_by("month")
+
+
+def title_keyword_counts(keywords: List[str], out_dir: Path | None = None) -> dict:
+    """Number of saved titles containing each keyword (case-insensitive)."""
+    titles = load_dataset(out_dir).to_table(columns=["job_title"])["job_title"]
+    return {kw: pc.sum(pc.match_substring(titles, kw, ignore_case=True)).as_py() or 0 for kw in keywords}
+
+
+if __name__ == "__main__":
+    export_parquet()
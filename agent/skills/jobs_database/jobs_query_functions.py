@@ -0,0 +1,242 @@
+"""Read-side helpers for the jobs database (jobs.jsonl).
+
+Everything here streams over one merged view of the database (compacted
+segments, then every row saved since the last compaction in write order; see
+jobs_compaction_functions), decoded one line at a time, so memory stays
+bounded no matter how many rows it holds. Before the first compaction that
+is simply every save in file order.
+
+- iter_jobs()          -> raw dicts, one per line
+- iter_records()       -> compact JobRecord objects with interned company names
+- filter_jobs()        -> JobRecords matching company / date range
+- count_by_company()   -> Counter of postings per company
+- count_by_date()      -> Counter of postings per date_posted
+- JobTable.load()      -> column arrays (~12 bytes/row) for repeated queries
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from array import array
+from collections import Counter
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from agent.skills.jobs_database.jobs_compaction_functions import iter_merged_lines
+
+DateLike = date | str | None
+
+
+class JobRecord:
+    """One saved posting. Company names are interned, so repeats share one string."""
+
+    __slots__ = ("job_url", "company_name", "job_title", "date_posted", "date_saved")
+
+    def __init__(self, job_url: str, company_name: str, job_title: str, date_posted: str, date_saved: str):
+        self.job_url = job_url
+        self.company_name = sys.intern(company_name)
+        self.job_title = job_title
+        self.date_posted = date_posted
+        self.date_saved = date_saved
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "JobRecord":
+        return cls(
+            data.get("job_url", ""),
+            data.get("company_name", ""),
+            data.get("job_title", ""),
+            data.get("date_posted", ""),
+            data.get("date_saved", ""),
+        )
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"JobRecord({self.job_title!r} at {self.company_name!r}, {self.date_posted})"
+
+
+def _decode(line: bytes) -> Optional[dict]:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def _as_iso(value: DateLike) -> Optional[str]:
+    if value is None:
+        return None
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def iter_jobs(path: Path | None = None) -> Iterator[dict]:
+    """
+    Stream every saved job as a dict: compacted rows (one per posting), then
+    every save since the last compaction, in file order.
+
+    Malformed or partially written lines are skipped.
+    """
+    for line in iter_merged_lines(path):
+        data = _decode(line)
+        if data is not None:
+            yield data
+
+
+def iter_records(path: Path | None = None) -> Iterator[JobRecord]:
+    """Stream every saved job as a compact JobRecord."""
+    for data in iter_jobs(path):
+        yield JobRecord.from_dict(data)
+
+
+def filter_jobs(
+    company: str | None = None,
+    posted_from: DateLike = None,
+    posted_to: DateLike = None,
+    path: Path | None = None,
+) -> Iterator[JobRecord]:
+    """
+    Stream jobs matching all given filters (single pass, bounded memory).
+
+    Args:
+        company: Exact company_name
+        posted_from: Inclusive lower bound on date_posted
+        posted_to: Inclusive upper bound on date_posted
+    """
+    lo, hi = _as_iso(posted_from), _as_iso(posted_to)
+    # Cheap byte-level prefilter: skip JSON decoding for lines that can't match
+    needle = json.dumps(company)[1:-1].encode("utf-8") if company is not None else None
+
+    for line in iter_merged_lines(path):
+        if needle is not None and needle not in line:
+            continue
+        data = _decode(line)
+        if data is None:
+            continue
+        if company is not None and data.get("company_name") != company:
+            continue
+        posted = str(data.get("date_posted", ""))
+        if lo is not None and posted < lo:
+            continue
+        if hi is not None and posted > hi:
+            continue
+        yield JobRecord.from_dict(data)
+
+
+def count_by_company(
+    posted_from: DateLike = None,
+    posted_to: DateLike = None,
+    path: Path | None = None,
+) -> Counter:
+    """Number of saved postings per company, optionally within a date range."""
+    counts: Counter = Counter()
+    for record in filter_jobs(None, posted_from, posted_to, path):
+        counts[record.company_name] += 1
+    return counts
+
+
+def count_by_date(company: str | None = None, path: Path | None = None) -> Counter:
+    """Number of saved postings per date_posted, optionally for one company."""
+    counts: Counter = Counter()
+    for record in filter_jobs(company, path=path):
+        counts[record.date_posted] += 1
+    return counts
+
+
+class JobTable:
+    """
+    Column-oriented, array-backed view of the jobs file for repeated queries.
+
+    Holds per row only: a company id (array 'I'), the date_posted ordinal
+    (array 'i', 0 when unparseable) and the row's position in the merged
+    view (array 'I'). URLs and titles stay on disk; select() decodes the
+    matching rows in one streaming pass. Reload after writes or compaction.
+
+        table = JobTable.load()
+        table.count_by_company().most_common(10)
+        for record in table.select(company="Acme", posted_from=date(2025, 1, 1)):
+            ...
+    """
+
+    def __init__(self, path: Path | None):
+        self.path = path
+        self.companies: List[str] = []
+        self._company_ids: Dict[str, int] = {}
+        self.company_col = array("I")
+        self.posted_col = array("i")
+        self.row_col = array("I")
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> "JobTable":
+        table = cls(path)
+        for row, line in enumerate(iter_merged_lines(path)):
+            data = _decode(line)
+            if data is None:
+                continue
+            table._append(row, data)
+        return table
+
+    def _append(self, row: int, data: dict) -> None:
+        name = data.get("company_name", "")
+        cid = self._company_ids.get(name)
+        if cid is None:
+            cid = self._company_ids[name] = len(self.companies)
+            self.companies.append(sys.intern(name))
+        try:
+            posted = date.fromisoformat(str(data.get("date_posted", ""))[:10]).toordinal()
+        except ValueError:
+            posted = 0
+        self.company_col.append(cid)
+        self.posted_col.append(posted)
+        self.row_col.append(row)
+
+    def __len__(self) -> int:
+        return len(self.row_col)
+
+    def count_by_company(self) -> Counter:
+        counts = Counter(self.company_col)
+        return Counter({self.companies[cid]: n for cid, n in counts.items()})
+
+    def indices(
+        self,
+        company: str | None = None,
+        posted_from: date | None = None,
+        posted_to: date | None = None,
+    ) -> Iterator[int]:
+        """Row indices matching the filters, scanning only the typed columns."""
+        cid = self._company_ids.get(company) if company is not None else None
+        if company is not None and cid is None:
+            return
+        lo = posted_from.toordinal() if posted_from else None
+        hi = posted_to.toordinal() if posted_to else None
+        for i in range(len(self.row_col)):
+            if cid is not None and self.company_col[i] != cid:
+                continue
+            posted = self.posted_col[i]
+            if lo is not None and posted < lo:
+                continue
+            if hi is not None and posted > hi:
+                continue
+            yield i
+
+    def select(
+        self,
+        company: str | None = None,
+        posted_from: date | None = None,
+        posted_to: date | None = None,
+    ) -> Iterator[JobRecord]:
+        """Matching rows as JobRecords, decoded from disk in one pass."""
+        wanted = iter([self.row_col[i] for i in self.indices(company, posted_from, posted_to)])
+        target = next(wanted, None)
+        if target is None:
+            return
+        for row, line in enumerate(iter_merged_lines(self.path)):
+            if row != target:
+                continue
+            data = _decode(line)
+            if data is not None:
+                yield JobRecord.from_dict(data)
+            target = next(wanted, None)
+            if target is None:
+                return
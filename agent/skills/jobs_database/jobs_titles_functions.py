@@ -0,0 +1,333 @@
+"""Title processing: exclusion, normalization and tagging in one scan.
+
+Phrase lists (non-job link texts, abbreviations, function and seniority
+keywords) are compiled into a single regex shaped like a trie over all
+phrases, so scanning a title costs about the same for 10 phrases as for
+10,000. Batches of titles are joined and scanned with one finditer() call:
+
+    engine = default_engine()
+    for info in engine.process(["Sr. Software Engineer", "Product Marketing Manager", "View all jobs"]):
+        print(info.excluded, info.normalized, info.tags)
+    # False  senior software engineer   {'seniority': ['senior'], 'function': ['engineering']}
+    # False  product marketing manager  {'function': ['marketing'], 'seniority': ['manager']}
+    # True   view all jobs              {}
+
+Titles are normalized before matching (NFKC, casefolded, punctuation other
+than + and # becomes a space), and phrases match whole words of that text.
+Matches don't overlap: at each position the longest phrase wins and its words
+aren't matched again, so "account manager" tags sales but not the manager
+seniority. Synonyms are replaced in `normalized` and tagged like their
+replacement ("sr" -> "senior").
+
+Bulk pass over the jobs database:
+
+    python -m agent.skills.jobs_database.jobs_titles_functions             # function/seniority counts
+    python -m agent.skills.jobs_database.jobs_titles_functions --out tags.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+import unicodedata
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from agent.skills.jobs_database.jobs_query_functions import iter_jobs
+
+# Link texts that show up among job rows but aren't postings
+NON_JOB_LINK_TEXT = ("view all", "show more", "view more", "learn more", "share these results", "back to")
+
+# Abbreviation -> replacement (applied to the normalized title)
+TITLE_SYNONYMS = {
+    "sr": "senior", "snr": "senior", "jr": "junior", "mgr": "manager", "dir": "director",
+    "vp": "vice president", "svp": "senior vice president", "evp": "executive vice president",
+    "swe": "software engineer", "sde": "software engineer", "sre": "site reliability engineer",
+    "ml": "machine learning", "eng": "engineering", "dev": "developer", "acct": "account",
+    "exec": "executive", "assoc": "associate", "admin": "administrator", "ops": "operations",
+}
+
+FUNCTION_TAGS = {
+    "engineering": ["engineer", "engineering", "developer", "programmer", "devops", "site reliability",
+                    "software architect", "qa", "quality assurance", "firmware", "frontend", "backend",
+                    "full stack", "fullstack", "mobile developer", "security engineer"],
+    "data": ["data scientist", "data science", "data analyst", "data engineer", "analytics", "machine learning",
+             "business intelligence", "data"],
+    "design": ["designer", "design", "product designer", "ux", "ui", "user experience", "user research", "researcher"],
+    "product": ["product manager", "product management", "product owner", "product lead", "product"],
+    "marketing": ["marketing", "product marketing", "growth", "content", "seo", "brand", "communications",
+                  "demand generation", "social media"],
+    "sales": ["sales", "account executive", "account manager", "business development", "sdr", "bdr",
+              "partnerships", "solutions engineer", "sales engineer"],
+    "customer": ["customer success", "customer support", "customer service", "support", "customer experience",
+                 "implementation", "onboarding"],
+    "operations": ["operations", "office manager", "chief of staff", "program manager", "project manager",
+                   "supply chain", "logistics", "strategy"],
+    "finance": ["finance", "financial", "accountant", "accounting", "controller", "fp a", "payroll", "tax",
+                "treasury"],
+    "people": ["recruiter", "recruiting", "talent", "people", "hr", "human resources", "people operations"],
+    "legal": ["legal", "counsel", "attorney", "paralegal", "compliance", "privacy"],
+}
+
+SENIORITY_TAGS = {
+    "intern": ["intern", "internship", "co op", "apprentice"],
+    "junior": ["junior", "entry level", "new grad", "graduate", "associate"],
+    "senior": ["senior"],
+    "staff": ["staff", "principal", "distinguished"],
+    "lead": ["lead", "tech lead", "team lead"],
+    "manager": ["manager", "management"],
+    "director": ["director", "head of", "senior director"],
+    "vp": ["vice president", "senior vice president", "executive vice president"],
+    "executive": ["chief", "cto", "ceo", "cfo", "coo", "cmo", "cpo", "founder", "co founder", "president"],
+}
+
+_NON_WORD = re.compile(r"[^\w+#]+")
+# Phrases start and end at word edges of the normalized text (words are
+# separated by one space, titles in a batch by a newline)
+_EDGE_BEFORE = r"(?<![^ \n])"
+_EDGE_AFTER = r"(?![^ \n])"
+
+
+def normalize_title(title: str) -> str:
+    """Casefolded title with punctuation (except + and #) collapsed to single spaces."""
+    return _NON_WORD.sub(" ", unicodedata.normalize("NFKC", title).casefold()).strip()
+
+
+def _trie_regex(phrases: Iterable[str]) -> str:
+    """Regex alternation of `phrases` factored into a trie (longest match first)."""
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = []
+        chars = []
+        for ch in sorted(k for k in node if k):
+            child = node[ch]
+            if list(child) == [""]:
+                chars.append(re.escape(ch))
+            else:
+                branches.append(re.escape(ch) + emit(child))
+        if chars:
+            branches.append(chars[0] if len(chars) == 1 else "[" + "".join(chars) + "]")
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = "(?:" + body + ")?"
+        return body
+
+    return emit(trie) if trie else r"(?!)"
+
+
+@dataclass
+class TitleInfo:
+    title: str
+    normalized: str
+    excluded: bool = False
+    tags: Dict[str, List[str]] = field(default_factory=dict)
+
+    def tag(self, group: str) -> Optional[str]:
+        """First tag of `group` (e.g. "seniority"), or None."""
+        values = self.tags.get(group)
+        return values[0] if values else None
+
+
+# What a matched phrase does: exclude, replace with text, and/or add (group, tag)s
+_Action = Tuple[bool, Optional[str], Tuple[Tuple[str, str], ...]]
+
+
+class TitleEngine:
+    """
+    Exclusion, synonym normalization and tagging of titles, compiled into one regex.
+
+    Args:
+        exclude: Phrases that mark a title as excluded (e.g. NON_JOB_LINK_TEXT)
+        synonyms: Phrase -> replacement, applied to `normalized` and tagged like the replacement
+        tags: Group -> tag -> phrases, e.g. {"seniority": SENIORITY_TAGS}
+    """
+
+    def __init__(
+        self,
+        exclude: Iterable[str] = (),
+        synonyms: Mapping[str, str] | None = None,
+        tags: Mapping[str, Mapping[str, Iterable[str]]] | None = None,
+    ):
+        excluded: set = set()
+        tagged: Dict[str, List[Tuple[str, str]]] = {}
+        for phrase in exclude:
+            excluded.add(normalize_title(phrase))
+        for group, by_tag in (tags or {}).items():
+            for tag, phrases in by_tag.items():
+                for phrase in phrases:
+                    pairs = tagged.setdefault(normalize_title(phrase), [])
+                    if (group, tag) not in pairs:
+                        pairs.append((group, tag))
+
+        # A synonym gets the tags its replacement would get
+        tag_scan = re.compile(_EDGE_BEFORE + _trie_regex(tagged) + _EDGE_AFTER)
+        replaced: Dict[str, str] = {}
+        for phrase, replacement in (synonyms or {}).items():
+            phrase, replacement = normalize_title(phrase), normalize_title(replacement)
+            replaced[phrase] = replacement
+            pairs = tagged.setdefault(phrase, [])
+            for m in tag_scan.finditer(replacement):
+                pairs.extend(p for p in tagged.get(m.group(), ()) if p not in pairs)
+
+        def excludes(phrase: str) -> bool:
+            # Only the longest phrase at a position is reported, so a phrase that
+            # starts with an exclude phrase has to exclude as well
+            words = phrase.split(" ")
+            return any(" ".join(words[:k]) in excluded for k in range(1, len(words) + 1))
+
+        self.actions: Dict[str, _Action] = {
+            phrase: (excludes(phrase), replaced.get(phrase), tuple(tagged.get(phrase, ())))
+            for phrase in excluded | tagged.keys() | replaced.keys()
+            if phrase
+        }
+        # Zero-width lookahead: the longest phrase at *every* word start, including
+        # ones inside a longer match, so exclusion never misses an overlapped phrase
+        self.pattern = re.compile(_EDGE_BEFORE + "(?=(" + _trie_regex(self.actions) + ")" + _EDGE_AFTER + ")")
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def _scan(self, normalized: List[str]) -> Iterator[Tuple[int, int, int, _Action]]:
+        """(title index, start, end, action) of the longest phrase at each word start, over one joined batch."""
+        starts = []
+        pos = 0
+        for text in normalized:
+            starts.append(pos)
+            pos += len(text) + 1
+        actions = self.actions
+        for m in self.pattern.finditer("\n".join(normalized)):
+            i = bisect_right(starts, m.start()) - 1
+            yield i, m.start() - starts[i], m.end(1) - starts[i], actions[m.group(1)]
+
+    def process(self, titles: Iterable[str]) -> List[TitleInfo]:
+        """TitleInfo for each title, in order."""
+        titles = list(titles)
+        normalized = [normalize_title(t) for t in titles]
+        infos = [TitleInfo(t, n) for t, n in zip(titles, normalized)]
+        edits: Dict[int, List[Tuple[int, int, str]]] = {}
+        title, taken = -1, 0
+        for i, start, end, (exclude, replacement, pairs) in self._scan(normalized):
+            info = infos[i]
+            if exclude:
+                info.excluded = True
+            if i != title:
+                title, taken = i, 0
+            if start < taken:
+                continue  # inside a longer phrase: counts for exclusion only
+            taken = end
+            if replacement is not None:
+                edits.setdefault(i, []).append((start, end, replacement))
+            for group, tag in pairs:
+                values = info.tags.setdefault(group, [])
+                if tag not in values:
+                    values.append(tag)
+        for i, spans in edits.items():
+            text = normalized[i]
+            for start, end, replacement in reversed(spans):
+                text = text[:start] + replacement + text[end:]
+            infos[i].normalized = text
+        return infos
+
+    def process_one(self, title: str) -> TitleInfo:
+        return self.process([title])[0]
+
+    def excluded(self, titles: Iterable[str]) -> List[bool]:
+        """Whether each title contains an exclude phrase (skips building TitleInfos)."""
+        normalized = [normalize_title(t) for t in titles]
+        flags = [False] * len(normalized)
+        for i, _, _, (exclude, _, _) in self._scan(normalized):
+            if exclude:
+                flags[i] = True
+        return flags
+
+
+@lru_cache(maxsize=1)
+def default_engine() -> TitleEngine:
+    """Engine with NON_JOB_LINK_TEXT, TITLE_SYNONYMS and the function/seniority tags."""
+    return TitleEngine(
+        exclude=NON_JOB_LINK_TEXT,
+        synonyms=TITLE_SYNONYMS,
+        tags={"function": FUNCTION_TAGS, "seniority": SENIORITY_TAGS},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Bulk pass over the jobs database
+# ---------------------------------------------------------------------------
+
+def iter_tagged_jobs(
+    path: Path | None = None,
+    engine: TitleEngine | None = None,
+    batch_size: int = 5000,
+) -> Iterator[Tuple[dict, TitleInfo]]:
+    """(job dict, TitleInfo) for every saved posting, processed in batches."""
+    engine = engine or default_engine()
+    batch: List[dict] = []
+    for job in iter_jobs(path):
+        batch.append(job)
+        if len(batch) >= batch_size:
+            yield from zip(batch, engine.process(j.get("job_title", "") for j in batch))
+            batch = []
+    if batch:
+        yield from zip(batch, engine.process(j.get("job_title", "") for j in batch))
+
+
+def count_tags(
+    groups: Iterable[str] = ("function", "seniority"),
+    path: Path | None = None,
+    engine: TitleEngine | None = None,
+) -> Dict[str, Counter]:
+    """Postings per tag for each group ("(none)" when a title has no tag in it)."""
+    groups = list(groups)
+    counts = {group: Counter() for group in groups}
+    for _, info in iter_tagged_jobs(path, engine):
+        for group in groups:
+            counts[group].update(info.tags.get(group) or ["(none)"])
+    return counts
+
+
+def export_tags(out_path: Path, path: Path | None = None, engine: TitleEngine | None = None) -> int:
+    """Write one JSON line (job_url, normalized title, excluded, tags) per posting; returns the row count."""
+    rows = 0
+    with open(out_path, "w", encoding="utf-8") as f:
+        for job, info in iter_tagged_jobs(path, engine):
+            f.write(json.dumps({"job_url": job.get("job_url", ""), "title": info.normalized,
+                                "excluded": info.excluded, "tags": info.tags}) + "\n")
+            rows += 1
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tag saved job titles by function and seniority.")
+    parser.add_argument("--jobs-file", type=Path, default=None, help="default: the jobs database")
+    parser.add_argument("--out", type=Path, default=None, help="write per-posting tags as JSONL")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.out:
+        rows = export_tags(args.out, args.jobs_file)
+        print(f"✓ Tagged {rows} postings -> {args.out} ({time.perf_counter() - start:.1f}s)")
+        return
+    counts = count_tags(path=args.jobs_file)
+    for group, counter in counts.items():
+        print(f"\n{group}:")
+        for tag, n in counter.most_common(args.top):
+            print(f"  {tag:<20} {n:>8}")
+    print(f"\n({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
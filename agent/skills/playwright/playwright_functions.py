@@ -0,0 +1,619 @@
+"""Helpers for Playwright-based scrapers.
+
+Scroll harvesting
+-----------------
+`ScrollHarvester` runs the usual infinite-scroll loop (snapshot -> extract ->
+scroll -> wait, stop after N stable rounds) but keeps per-round cost flat on
+very long lists: already-harvested nodes can be pruned from the DOM (replaced
+by a spacer of the same height), and the page or context can be recycled
+after N items or M MB of JS heap, resuming from the saved item count or
+scroll height.
+
+Concurrent page visits
+----------------------
+`AsyncPagePool` / `crawl_pages()` visit many URLs (e.g. external ATS
+postings) with a fixed set of reusable async pages, gated per host by the
+crawling skill's adaptive HostScheduler. Both accept a VisitGuard for
+adaptive goto timeouts and per-domain circuit breaking.
+
+HAR record/replay
+-----------------
+`har_context()` opens a BrowserContext that records every network response of
+a board into a HAR archive on the first run, and serves later runs from that
+archive via `route_from_har` - no network, no waiting for the live site. Use
+it while iterating on parsing/extraction code in scratch scripts.
+
+Archives live in agent/workspace/har_cache/<key>.zip with a <key>.json
+sidecar ({"url", "recorded_at", "variant"}). The key is derived from the
+board's host and path (plus an optional variant), and an archive older than
+`max_age_hours` is re-recorded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Literal, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from playwright.sync_api import Browser, BrowserContext, Page
+
+from agent.skills.crawling.host_scheduler import HostScheduler
+from agent.skills.crawling.visit_guard import VisitGuard
+from agent.skills.telemetry.telemetry_functions import span
+
+HAR_CACHE_DIR = Path(__file__).resolve().parents[2] / "workspace" / "har_cache"
+
+HarMode = Literal["auto", "record", "replay", "off"]
+
+
+def har_cache_key(board_url: str, variant: str = "") -> str:
+    """
+    Stable, readable cache key for a board, e.g. 'jobs.bvp.com_jobs-1a2b3c4d'.
+
+    `variant` separates recordings of the same board made with different
+    interactions (e.g. "company-pages" vs "index").
+    """
+    parsed = urlparse(board_url)
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", f"{parsed.netloc}_{parsed.path}").strip("-")[:60]
+    digest = hashlib.sha1(f"{board_url}|{variant}".encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}"
+
+
+def _paths(board_url: str, variant: str, cache_dir: Path) -> tuple[Path, Path]:
+    key = har_cache_key(board_url, variant)
+    return cache_dir / f"{key}.zip", cache_dir / f"{key}.json"
+
+
+def har_is_fresh(
+    board_url: str,
+    variant: str = "",
+    max_age_hours: float = 24.0,
+    cache_dir: Path = HAR_CACHE_DIR,
+) -> bool:
+    """True if a complete recording for this board exists and hasn't expired."""
+    har_path, meta_path = _paths(board_url, variant, cache_dir)
+    if not har_path.exists() or not meta_path.exists():
+        return False
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return time.time() - meta.get("recorded_at", 0) < max_age_hours * 3600
+
+
+def clear_har_cache(board_url: str | None = None, variant: str = "", cache_dir: Path = HAR_CACHE_DIR) -> int:
+    """
+    Delete recordings. With no board_url, clears the whole cache.
+
+    Returns the number of files removed.
+    """
+    if not cache_dir.exists():
+        return 0
+    if board_url is None:
+        targets = list(cache_dir.glob("*.zip")) + list(cache_dir.glob("*.json"))
+    else:
+        targets = [p for p in _paths(board_url, variant, cache_dir) if p.exists()]
+    for path in targets:
+        path.unlink()
+    return len(targets)
+
+
+@contextmanager
+def har_context(
+    browser: Browser,
+    board_url: str,
+    mode: HarMode = "auto",
+    variant: str = "",
+    max_age_hours: float = 24.0,
+    strict: bool = False,
+    cache_dir: Path = HAR_CACHE_DIR,
+    **context_kwargs,
+) -> Iterator[BrowserContext]:
+    """
+    Open a BrowserContext that records to, or replays from, a per-board HAR.
+
+    Args:
+        browser: Launched Playwright browser
+        board_url: Board being scraped; determines the cache key
+        mode: "auto" replays a fresh recording and records otherwise;
+            "record" always re-records; "replay" requires a recording;
+            "off" is a plain context. The HAR_MODE environment variable
+            overrides this argument.
+        variant: Extra cache-key component for different interaction flows
+        max_age_hours: Recordings older than this are treated as expired
+        strict: In replay, abort requests missing from the HAR instead of
+            falling through to the network
+        **context_kwargs: Passed to browser.new_context()
+
+    Yields:
+        The BrowserContext. Create pages from it with context.new_page().
+
+    A recording is only kept once the context closes cleanly, so a crashed
+    run never leaves a half-written archive behind.
+    """
+    mode = os.environ.get("HAR_MODE", mode)  # type: ignore[assignment]
+    har_path, meta_path = _paths(board_url, variant, cache_dir)
+
+    if mode == "auto":
+        mode = "replay" if har_is_fresh(board_url, variant, max_age_hours, cache_dir) else "record"
+    if mode == "replay" and not har_path.exists():
+        raise FileNotFoundError(f"No HAR recording for {board_url} at {har_path}; run once with mode='record'")
+
+    if mode == "off":
+        context = browser.new_context(**context_kwargs)
+        try:
+            yield context
+        finally:
+            context.close()
+        return
+
+    if mode == "replay":
+        print(f"[har] replaying {board_url} from {har_path.name}")
+        context = browser.new_context(**context_kwargs)
+        context.route_from_har(har_path, not_found="abort" if strict else "fallback")
+        try:
+            yield context
+        finally:
+            context.close()
+        return
+
+    if mode != "record":
+        raise ValueError(f"Unknown HAR mode: {mode}")
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = har_path.with_suffix(".recording.zip")
+    print(f"[har] recording {board_url} to {har_path.name}")
+    context = browser.new_context(
+        record_har_path=tmp_path,
+        record_har_mode="full",
+        record_har_content="attach",
+        **context_kwargs,
+    )
+    ok = False
+    try:
+        yield context
+        ok = True
+    finally:
+        # The HAR is only flushed to disk when the context closes
+        context.close()
+        if ok and tmp_path.exists():
+            os.replace(tmp_path, har_path)
+            meta_path.write_text(
+                json.dumps({"url": board_url, "variant": variant, "recorded_at": time.time()}),
+                encoding="utf-8",
+            )
+        elif tmp_path.exists():
+            tmp_path.unlink()
+
+
+# ---------------------------------------------------------------------------
+# Scroll harvesting with DOM pruning and page recycling
+# ---------------------------------------------------------------------------
+
+_PRUNE_JS = """([selector, keep]) => {
+  const nodes = document.querySelectorAll(selector);
+  let spacer = document.querySelector("[data-harvest-spacer]");
+  const excess = nodes.length - keep;
+  if (excess <= 0) return spacer ? Number(spacer.dataset.pruned) : 0;
+  if (!spacer) {
+    spacer = document.createElement("div");
+    spacer.setAttribute("data-harvest-spacer", "");
+    spacer.dataset.pruned = "0";
+    spacer.style.height = "0px";
+    nodes[0].parentNode.insertBefore(spacer, nodes[0]);
+  }
+  let height = parseFloat(spacer.style.height);
+  for (let i = 0; i < excess; i++) {
+    height += nodes[i].getBoundingClientRect().height;
+    nodes[i].remove();
+  }
+  spacer.style.height = height + "px";
+  spacer.dataset.pruned = String(Number(spacer.dataset.pruned) + excess);
+  return Number(spacer.dataset.pruned);
+}"""
+
+_COUNT_JS = """(selector) => {
+  const spacer = document.querySelector("[data-harvest-spacer]");
+  return (spacer ? Number(spacer.dataset.pruned) : 0) + document.querySelectorAll(selector).length;
+}"""
+
+_HEAP_JS = "() => (performance.memory ? performance.memory.usedJSHeapSize : null)"
+
+_SCROLL_JS = "window.scrollTo(0, document.body.scrollHeight)"
+
+
+def prune_harvested(page: Page, item_selector: str, keep_last: int = 20) -> int:
+    """
+    Remove all but the last `keep_last` nodes matching `item_selector`.
+
+    Removed nodes are replaced by one spacer div of the same total height, so
+    the scroll position and the board's "near the bottom" trigger are not
+    disturbed. Only prune nodes you have already extracted.
+
+    Returns the total number of nodes pruned from this page so far.
+    """
+    return page.evaluate(_PRUNE_JS, [item_selector, keep_last])
+
+
+def js_heap_mb(page: Page) -> Optional[float]:
+    """Used JS heap of the page in MB (Chromium only; None elsewhere)."""
+    used = page.evaluate(_HEAP_JS)
+    return None if used is None else used / 2**20
+
+
+class ScrollHarvester:
+    """
+    Infinite-scroll loop with bounded DOM size and periodic page recycling.
+
+    Args:
+        owner: A BrowserContext (pages are recycled) or a Browser (whole
+            contexts are recycled, which also drops cookies/cache)
+        url: Page to harvest
+        extract: html -> iterable of (key, item); items are yielded once per key
+        item_selector: CSS selector of one list item. Required for pruning and
+            for resuming by item count
+        prune_keep: Prune harvested items, keeping this many at the bottom.
+            None disables pruning. Don't prune if the board re-renders its
+            whole list from JS state on every update
+        recycle_after_items: Open a fresh page after this many new items
+        recycle_heap_mb: Open a fresh page once the JS heap exceeds this
+        resume_url: cursor -> URL, for boards that accept an offset/page in
+            the URL. Without it, a recycled page is fast-forwarded by
+            scrolling (and pruning) until the saved cursor is reached
+        seen: Shared set of keys already harvested (e.g. across companies)
+        max_rounds, stable_checks, wait_ms: The usual stability-detection knobs
+        settle_ms: Wait after goto
+        goto_kwargs: Passed to page.goto()
+        guard: VisitGuard that sets the goto timeout from observed latency
+            and refuses domains with an open circuit
+        scroll: Callable(page) that triggers loading more; defaults to
+            scrolling to the bottom
+        on_round: Callable(round_number, items_seen) for progress logging
+        page: Harvest on this existing page instead of opening one. It is
+            navigated to `url` and left open afterwards; a recycle switches
+            to a page the harvester owns
+
+    After harvest(), stats["stop"] says why it ended: "stable" (no new items
+    for `stable_checks` rounds) or "max_rounds".
+
+    Usage:
+        harvester = ScrollHarvester(page.context, url, extract, item_selector=".job-card",
+                                    prune_keep=20, recycle_heap_mb=300)
+        for item in harvester.harvest():
+            ...
+    """
+
+    def __init__(
+        self,
+        owner: BrowserContext | Browser,
+        url: str,
+        extract: Callable[[str], Iterable[Tuple[str, Any]]],
+        *,
+        item_selector: Optional[str] = None,
+        prune_keep: Optional[int] = None,
+        recycle_after_items: Optional[int] = None,
+        recycle_heap_mb: Optional[float] = None,
+        resume_url: Optional[Callable[[int], str]] = None,
+        seen: Optional[Set[str]] = None,
+        max_rounds: int = 200,
+        stable_checks: int = 5,
+        wait_ms: int = 1500,
+        settle_ms: int = 1000,
+        goto_kwargs: Optional[Dict[str, Any]] = None,
+        guard: Optional[VisitGuard] = None,
+        scroll: Optional[Callable[[Page], None]] = None,
+        on_round: Optional[Callable[[int, int], None]] = None,
+        page: Optional[Page] = None,
+    ):
+        if prune_keep is not None and not item_selector:
+            raise ValueError("prune_keep requires item_selector")
+        self.owner = owner
+        self.url = url
+        self.extract = extract
+        self.item_selector = item_selector
+        self.prune_keep = prune_keep
+        self.recycle_after_items = recycle_after_items
+        self.recycle_heap_mb = recycle_heap_mb
+        self.resume_url = resume_url
+        self.seen: Set[str] = seen if seen is not None else set()
+        self.max_rounds = max_rounds
+        self.stable_checks = stable_checks
+        self.wait_ms = wait_ms
+        self.settle_ms = settle_ms
+        self.goto_kwargs = goto_kwargs or {"wait_until": "domcontentloaded", "timeout": 60000}
+        self.guard = guard
+        self.scroll = scroll or (lambda page: page.evaluate(_SCROLL_JS))
+        self.on_round = on_round
+
+        self.page: Optional[Page] = None
+        self._borrowed: Optional[Page] = page
+        self._caller_page: Optional[Page] = page  # never closed by the harvester
+        self._context: Optional[BrowserContext] = None
+        self.cursor = 0            # items loaded so far (pruned + in DOM)
+        self.scroll_height = 0     # fallback resume position without item_selector
+        self._items_since_recycle = 0
+        self.stats = {"rounds": 0, "recycles": 0, "pruned_on_page": 0, "peak_heap_mb": 0.0, "stop": None}
+
+    # -- page lifecycle ----------------------------------------------------
+
+    def open(self) -> Page:
+        """Open (or return) the harvesting page, navigated to `url`."""
+        if self.page is None:
+            if self._borrowed is not None:
+                self.page, self._borrowed = self._borrowed, None
+            else:
+                self.page = self._new_page()
+            self._goto(self.url)
+        return self.page
+
+    def close(self) -> None:
+        if self.page is not None:
+            if self.page is not self._caller_page:
+                self.page.close()
+            self.page = None
+        if self._context is not None:
+            self._context.close()
+            self._context = None
+
+    def _new_page(self) -> Page:
+        if hasattr(self.owner, "new_context"):
+            self._context = self.owner.new_context()  # type: ignore[union-attr]
+            return self._context.new_page()
+        return self.owner.new_page()  # type: ignore[union-attr]
+
+    def _goto(self, url: str) -> None:
+        with span("goto", url=url):
+            if self.guard is not None:
+                self.guard.visit(self.page, url, **self.goto_kwargs)
+            else:
+                self.page.goto(url, **self.goto_kwargs)
+        with span("wait"):
+            self.page.wait_for_timeout(self.settle_ms)
+
+    def _loaded(self) -> int:
+        if self.item_selector:
+            return self.page.evaluate(_COUNT_JS, self.item_selector)
+        return self.page.evaluate("document.body.scrollHeight")
+
+    def _should_recycle(self) -> bool:
+        if self.recycle_after_items and self._items_since_recycle >= self.recycle_after_items:
+            return True
+        if self.recycle_heap_mb:
+            heap = js_heap_mb(self.page)
+            if heap is not None:
+                self.stats["peak_heap_mb"] = max(self.stats["peak_heap_mb"], round(heap, 1))
+                return heap >= self.recycle_heap_mb
+        return False
+
+    def _recycle(self) -> None:
+        target = self.cursor if self.item_selector else self.scroll_height
+        print(f"[harvest] recycling page at cursor={target} (items harvested={len(self.seen)})")
+        self.close()
+        self.page = self._new_page()
+        self._items_since_recycle = 0
+        self.stats["recycles"] += 1
+
+        if self.resume_url is not None:
+            self._goto(self.resume_url(self.cursor))
+            return
+
+        # Fast-forward: scroll (and prune) without snapshotting until we're back
+        self._goto(self.url)
+        stable = 0
+        last = -1
+        while stable < self.stable_checks:
+            loaded = self._loaded()
+            if loaded >= target:
+                return
+            stable = stable + 1 if loaded == last else 0
+            last = loaded
+            if self.prune_keep is not None:
+                prune_harvested(self.page, self.item_selector, self.prune_keep)
+            with span("scroll"):
+                self.scroll(self.page)
+            with span("wait"):
+                self.page.wait_for_timeout(self.wait_ms)
+
+    # -- main loop ---------------------------------------------------------
+
+    def harvest(self) -> Iterator[Any]:
+        """Yield each newly discovered item until the list stops growing."""
+        self.open()
+        self.stats["stop"] = "max_rounds"
+        stable_rounds = 0
+        last_count = len(self.seen)
+        try:
+            for round_num in range(1, self.max_rounds + 1):
+                self.stats["rounds"] += 1
+                with span("content") as sp:
+                    html = self.page.content()
+                    sp.set(bytes=len(html))
+                with span("parse"):
+                    found = list(self.extract(html))
+
+                for key, item in found:
+                    if key in self.seen:
+                        continue
+                    self.seen.add(key)
+                    self._items_since_recycle += 1
+                    yield item
+
+                if self.item_selector:
+                    self.cursor = self._loaded()
+                else:
+                    self.scroll_height = self._loaded()
+                if self.prune_keep is not None:
+                    self.stats["pruned_on_page"] = prune_harvested(self.page, self.item_selector, self.prune_keep)
+
+                count = len(self.seen)
+                if self.on_round is not None:
+                    self.on_round(round_num, count)
+                if count == last_count:
+                    stable_rounds += 1
+                    if stable_rounds >= self.stable_checks:
+                        self.stats["stop"] = "stable"
+                        break
+                else:
+                    stable_rounds = 0
+                    last_count = count
+
+                if self._should_recycle():
+                    self._recycle()
+
+                with span("scroll"):
+                    self.scroll(self.page)
+                with span("wait"):
+                    self.page.wait_for_timeout(self.wait_ms)
+        finally:
+            self.close()
+
+
+# ---------------------------------------------------------------------------
+# Concurrent page visits (async API) gated by the shared HostScheduler
+# ---------------------------------------------------------------------------
+
+class AsyncPagePool:
+    """
+    A fixed number of reusable pages in one async BrowserContext.
+
+    visit() borrows a page, takes a per-host slot from the scheduler for the
+    navigation, and reports the response status (and Retry-After) back to it,
+    so each host's concurrency adapts to how it responds. With a VisitGuard,
+    the goto timeout adapts to the domain's latency and domains with an open
+    circuit fail immediately with CircuitOpenError.
+
+        pool = AsyncPagePool(context, size=6, scheduler=scheduler)
+        async with pool.visit(url, wait_until="domcontentloaded") as page:
+            html = await page.content()
+    """
+
+    def __init__(
+        self,
+        context,
+        size: int = 4,
+        scheduler: Optional[HostScheduler] = None,
+        guard: Optional[VisitGuard] = None,
+    ):
+        self.context = context
+        self.size = size
+        self.scheduler = scheduler or HostScheduler()
+        self.guard = guard
+        self._pages: "asyncio.Queue" = asyncio.Queue()
+        self._created = 0
+
+    async def _borrow(self):
+        if self._pages.empty() and self._created < self.size:
+            self._created += 1
+            return await self.context.new_page()
+        return await self._pages.get()
+
+    @asynccontextmanager
+    async def visit(self, url: str, settle_ms: int = 0, **goto_kwargs):
+        page = None
+        navigated = False
+        if self.guard is not None:
+            self.guard.check(url)  # fail before waiting for a page or a host slot
+        try:
+            page = await self._borrow()
+            async with self.scheduler.aslot(url) as slot:
+                navigated = True
+                if self.guard is not None:
+                    response = await self.guard.avisit(page, url, check=False, **goto_kwargs)
+                else:
+                    response = await page.goto(url, **goto_kwargs)
+                if response is not None:
+                    slot.report(response.status, response.headers.get("retry-after"))
+            if settle_ms:
+                await page.wait_for_timeout(settle_ms)
+            yield page
+        finally:
+            if self.guard is not None and not navigated:
+                # avisit() records every navigation; a visit that never got
+                # there must hand back a half-open probe, or the domain stays blocked
+                self.guard.release(url)
+            if page is not None:
+                self._pages.put_nowait(page)
+
+    async def close(self) -> None:
+        while not self._pages.empty():
+            await self._pages.get_nowait().close()
+
+
+def crawl_pages(
+    urls: Iterable[str],
+    on_page: Callable[[str, str], None],
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+    concurrency: int = 6,
+    scheduler: Optional[HostScheduler] = None,
+    settle_ms: int = 1500,
+    goto_kwargs: Optional[Dict[str, Any]] = None,
+    guard: Optional[VisitGuard] = None,
+) -> Dict[str, Any]:
+    """
+    Visit `urls` concurrently in a headless browser and hand each page's HTML to `on_page`.
+
+    Runs its own async Playwright instance, so call it outside any
+    `sync_playwright()` block. Callbacks run on the event loop thread, one at
+    a time.
+
+    Args:
+        urls: Pages to visit; any iterable, consumed lazily as workers free up
+        on_page: Called as on_page(url, html) for every page that loaded
+        on_error: Called as on_error(url, exception) for failures (default: print)
+        concurrency: Pages open at once (the scheduler may allow fewer per host)
+        scheduler: Shared HostScheduler; a fresh one by default
+        settle_ms: Wait after navigation before reading the DOM
+        goto_kwargs: Passed to page.goto()
+        guard: VisitGuard for adaptive timeouts and circuit breaking; URLs of
+            tripped domains go to on_error with CircuitOpenError
+
+    Returns:
+        {"visited", "failed", "seconds", "hosts": scheduler.snapshot(),
+         "guard": guard.summary() (only with a guard)}
+    """
+    from playwright.async_api import async_playwright
+
+    scheduler = scheduler or HostScheduler()
+    goto_kwargs = goto_kwargs or {"wait_until": "domcontentloaded", "timeout": 60000}
+    stats = {"visited": 0, "failed": 0}
+
+    async def run() -> None:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context()
+            pool = AsyncPagePool(context, size=concurrency, scheduler=scheduler, guard=guard)
+            # Pulled lazily, so `urls` can be a generator (e.g. Frontier.iter_claims)
+            work = iter(urls)
+
+            async def worker() -> None:
+                for url in work:
+                    try:
+                        async with pool.visit(url, settle_ms=settle_ms, **goto_kwargs) as page:
+                            html = await page.content()
+                        on_page(url, html)
+                        stats["visited"] += 1
+                    except Exception as e:
+                        stats["failed"] += 1
+                        if on_error is not None:
+                            on_error(url, e)
+                        else:
+                            print(f"  - error: {url}: {e}")
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            await pool.close()
+            await browser.close()
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    stats["seconds"] = round(time.perf_counter() - start, 2)
+    stats["hosts"] = scheduler.snapshot()
+    if guard is not None:
+        stats["guard"] = guard.summary()
+    return stats
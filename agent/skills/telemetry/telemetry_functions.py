@@ -0,0 +1,202 @@
+"""Lightweight per-stage timing for scrapers.
+
+Disabled by default. Turn it on with `enable()` or by setting the
+SCRAPE_TELEMETRY environment variable (to "1" for the default log file, or to
+a file path). When disabled, `span()` returns a shared no-op context manager
+and `@timed` wrappers do a single flag check, so instrumented code pays
+almost nothing.
+
+When enabled, every span is written as one JSON line:
+    {"ts": ..., "stage": "goto", "ms": 812.4, "ok": true, "url": "..."}
+and `report()` prints p50/p95/max per stage.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+LOG_DIR = Path(__file__).resolve().parents[2] / "workspace" / "logs"
+
+_enabled = False
+_sink: Optional[TextIO] = None
+_lock = threading.Lock()
+_durations: Dict[str, List[float]] = defaultdict(list)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    def set(self, **fields: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("stage", "fields", "start")
+
+    def __init__(self, stage: str, fields: Dict[str, Any]):
+        self.stage = stage
+        self.fields = fields
+        self.start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        ms = (time.perf_counter() - self.start) * 1000.0
+        record(self.stage, ms, ok=exc_type is None, **self.fields)
+        return False
+
+    def set(self, **fields: Any) -> None:
+        """Attach extra fields (e.g. bytes, counts) to the emitted event."""
+        self.fields.update(fields)
+
+
+def enable(path: str | Path | None = None, stream: TextIO | None = None) -> Path | None:
+    """
+    Turn telemetry on.
+
+    Args:
+        path: JSON-lines output file. Defaults to
+            agent/workspace/logs/telemetry_<timestamp>.jsonl
+        stream: Write events to this stream instead of a file (e.g. sys.stderr)
+
+    Returns:
+        The path events are written to, or None when writing to a stream.
+    """
+    global _enabled, _sink
+    out_path: Path | None = None
+    if stream is not None:
+        _sink = stream
+    else:
+        if path is None:
+            LOG_DIR.mkdir(parents=True, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = LOG_DIR / f"telemetry_{timestamp}.jsonl"
+        out_path = Path(path)
+        _sink = open(out_path, "a", encoding="utf-8", buffering=1)
+    _enabled = True
+    return out_path
+
+
+def disable() -> None:
+    global _enabled, _sink
+    _enabled = False
+    if _sink is not None and _sink not in (sys.stdout, sys.stderr):
+        _sink.close()
+    _sink = None
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def span(stage: str, **fields: Any):
+    """
+    Time a block of code as `stage`.
+
+        with span("goto", url=url):
+            page.goto(url)
+    """
+    if not _enabled:
+        return _NOOP
+    return _Span(stage, fields)
+
+
+def timed(stage: str | None = None) -> Callable:
+    """Decorator form of span(); the stage defaults to the function name."""
+
+    def decorator(fn: Callable) -> Callable:
+        name = stage or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record(stage: str, ms: float, ok: bool = True, **fields: Any) -> None:
+    """Record an already-measured duration for `stage`."""
+    if not _enabled:
+        return
+    event = {"ts": time.time(), "stage": stage, "ms": round(ms, 3), "ok": ok}
+    event.update(fields)
+    line = json.dumps(event, default=str)
+    with _lock:
+        _durations[stage].append(ms)
+        if _sink is not None:
+            _sink.write(line + "\n")
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    # Nearest-rank percentile
+    idx = max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[idx]
+
+
+def summary() -> Dict[str, Dict[str, float]]:
+    """Return {stage: {count, total_ms, p50_ms, p95_ms, max_ms}} for this run."""
+    with _lock:
+        snapshot = {stage: sorted(values) for stage, values in _durations.items() if values}
+    return {
+        stage: {
+            "count": len(values),
+            "total_ms": round(sum(values), 1),
+            "p50_ms": round(_percentile(values, 50), 1),
+            "p95_ms": round(_percentile(values, 95), 1),
+            "max_ms": round(values[-1], 1),
+        }
+        for stage, values in snapshot.items()
+    }
+
+
+def report() -> None:
+    """Print the end-of-run summary table and append it to the event log."""
+    stats = summary()
+    if not stats:
+        return
+    print()
+    print(f"{'stage':<24}{'count':>8}{'total_s':>10}{'p50_ms':>10}{'p95_ms':>10}{'max_ms':>10}")
+    for stage, s in sorted(stats.items(), key=lambda kv: kv[1]["total_ms"], reverse=True):
+        print(
+            f"{stage:<24}{s['count']:>8}{s['total_ms'] / 1000:>10.1f}"
+            f"{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['max_ms']:>10.1f}"
+        )
+    with _lock:
+        if _sink is not None:
+            _sink.write(json.dumps({"ts": time.time(), "summary": stats}) + "\n")
+
+
+def reset() -> None:
+    with _lock:
+        _durations.clear()
+
+
+_env = os.environ.get("SCRAPE_TELEMETRY")
+if _env and _env != "0":
+    enable(None if _env == "1" else _env)
@@ -0,0 +1,151 @@
+# agent/tools/fs_tools.py
+"""In-process filesystem tools, a drop-in alternative to the MCP filesystem server.
+
+Same sandbox rule as server-filesystem: every path must resolve (symlinks
+included) inside FS_ROOT, the agent/ directory. Runs in the agent's own
+process, so there is no Node start-up and no JSON-RPC round trip per call.
+Directory listings are cached and revalidated by the directory's mtime.
+"""
+import fnmatch
+import os
+from pathlib import Path
+from langchain_core.tools import tool
+
+# Sandbox root (agent/) and the project root that relative paths start from
+FS_ROOT = Path(__file__).resolve().parents[1]
+PROJECT_ROOT = FS_ROOT.parent
+
+MAX_READ_BYTES = 2_000_000
+MAX_SEARCH_RESULTS = 200
+SKIP_DIRS = {"__pycache__", ".git", "node_modules", ".venv"}
+
+# path -> (mtime_ns, rendered listing)
+_listing_cache: dict[Path, tuple[int, str]] = {}
+
+
+def _resolve(path: str) -> Path:
+    """Resolve `path` inside the sandbox or raise PermissionError.
+
+    Relative paths starting with "agent/" are taken from the project root
+    ("agent/workspace/x.py"), other relative paths from the sandbox root
+    ("workspace/x.py"). There is a single candidate, so a path that
+    normalizes outside the sandbox ("agent/../requirements.txt") is rejected
+    rather than retried under another root.
+    """
+    raw = Path(path).expanduser()
+    if raw.is_absolute():
+        candidate = raw
+    elif raw.parts and raw.parts[0] == FS_ROOT.name:
+        candidate = PROJECT_ROOT / raw
+    else:
+        candidate = FS_ROOT / raw
+    resolved = candidate.resolve()
+    if resolved == FS_ROOT or FS_ROOT in resolved.parents:
+        return resolved
+    raise PermissionError(f"Access denied - path outside allowed directory {FS_ROOT}: {path}")
+
+
+def _invalidate(path: Path) -> None:
+    _listing_cache.pop(path.parent, None)
+
+
+@tool
+def read_file(path: str) -> str:
+    """Read the complete contents of a text file.
+
+    Input:
+        path: file path inside the agent directory, e.g. agent/workspace/scratch1.py
+    Output:
+        The file contents, or an error message.
+    """
+    try:
+        target = _resolve(path)
+        size = target.stat().st_size
+        with open(target, "r", encoding="utf-8", errors="replace") as f:
+            content = f.read(MAX_READ_BYTES)
+        if size > MAX_READ_BYTES:
+            content += f"\n\n[truncated: showing {MAX_READ_BYTES} of {size} bytes]"
+        return content
+    except Exception as e:
+        return f"Error: {e}"
+
+
+@tool
+def write_file(path: str, content: str) -> str:
+    """Create a new file or overwrite an existing file with the given content.
+
+    Parent directories are created as needed.
+
+    Input:
+        path: file path inside the agent directory
+        content: full text to write
+    Output:
+        Confirmation message, or an error message.
+    """
+    try:
+        target = _resolve(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "w", encoding="utf-8") as f:
+            f.write(content)
+        _invalidate(target)
+        return f"Successfully wrote to {path}"
+    except Exception as e:
+        return f"Error: {e}"
+
+
+@tool
+def list_directory(path: str) -> str:
+    """List the files and subdirectories of a directory.
+
+    Input:
+        path: directory path inside the agent directory
+    Output:
+        One entry per line, prefixed with [DIR] or [FILE].
+    """
+    try:
+        target = _resolve(path)
+        mtime = target.stat().st_mtime_ns
+        cached = _listing_cache.get(target)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with os.scandir(target) as entries:
+            lines = sorted(
+                f"[DIR] {entry.name}" if entry.is_dir() else f"[FILE] {entry.name}"
+                for entry in entries
+            )
+        listing = "\n".join(lines) if lines else "(empty directory)"
+        _listing_cache[target] = (mtime, listing)
+        return listing
+    except Exception as e:
+        return f"Error: {e}"
+
+
+@tool
+def search_files(path: str, pattern: str) -> str:
+    """Recursively search for files and directories whose name matches a pattern.
+
+    Input:
+        path: directory to start from, inside the agent directory
+        pattern: case-insensitive glob or substring, e.g. "*.py" or "retrieve_jobs"
+    Output:
+        Matching paths (relative to the project root), one per line.
+    """
+    try:
+        target = _resolve(path)
+        needle = pattern.lower()
+        is_glob = any(ch in needle for ch in "*?[")
+        matches = []
+        for dirpath, dirnames, filenames in os.walk(target):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for name in dirnames + filenames:
+                lower = name.lower()
+                if fnmatch.fnmatch(lower, needle) if is_glob else needle in lower:
+                    matches.append(str((Path(dirpath) / name).relative_to(PROJECT_ROOT)))
+                    if len(matches) >= MAX_SEARCH_RESULTS:
+                        return "\n".join(matches) + f"\n[stopped after {MAX_SEARCH_RESULTS} matches]"
+        return "\n".join(sorted(matches)) if matches else "No matches found"
+    except Exception as e:
+        return f"Error: {e}"
+
+
+FS_TOOLS = [read_file, write_file, list_directory, search_files]
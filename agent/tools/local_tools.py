@@ -9,14 +9,21 @@ import re
 from datetime import datetime
 from pathlib import Path
 
+SCRIPT_TIMEOUT = 300
+PROFILE_MODES = ("sample", "cprofile")
+
 @tool
-def run_python_script(script_file_name: str) -> str:
+def run_python_script(script_file_name: str, profile: str = "") -> str:
     """Run a Python file with the current interpreter.
     
     Execution logs are saved to: agent/workspace/logs/{script_name}_{timestamp}.log
     
     Input:
         script_file_name: name of a script in the workspace folder. i.e. retrieve_jobs.py
+        profile: optional, "sample" (low-overhead sampling, wall-clock time) or
+            "cprofile" (exact call counts). Writes {script_name}_{timestamp}.flame.svg,
+            .collapsed.txt and .profile.txt next to the log and appends the top
+            hot functions to the output. Leave empty for a normal run.
     Output:
         Captured stdout/stderr and the return code.
     """
@@ -34,13 +41,26 @@ def run_python_script(script_file_name: str) -> str:
     
     env = os.environ.copy()
     env['PYTHONPATH'] = str(project_root)
+
+    command = [sys.executable, script_relative]
+    profile_prefix = None
+    if profile:
+        if profile not in PROFILE_MODES:
+            return f"Unknown profile mode {profile!r}; use one of {', '.join(PROFILE_MODES)} or leave it empty"
+        profile_prefix = log_dir / f"{script_name}_{timestamp}"
+        # Stops the script a little before the timeout so the profile still gets written
+        command = [
+            sys.executable, str(project_root / "agent" / "tools" / "profiler.py"),
+            "--mode", profile, "--out", str(profile_prefix),
+            "--deadline", str(SCRIPT_TIMEOUT - 15), str(script_relative),
+        ]
     
     try:
         result = subprocess.run(
-            [sys.executable, script_relative],
+            command,
             capture_output=True,
             text=True,
-            timeout=300,
+            timeout=SCRIPT_TIMEOUT,
             cwd=str(project_root),
             env=env
         )
@@ -49,7 +69,7 @@ def run_python_script(script_file_name: str) -> str:
         log_content = [
             f"=" * 60,
             f"Script: {script_file_name}",
-            f"Script Executed With: python {script_relative}",
+            f"Script Executed With: python {script_relative}" + (f" (profile={profile})" if profile else ""),
             f"Executed: {datetime.now().isoformat()}",
             f"Return Code: {result.returncode}",
             f"=" * 60,
@@ -63,6 +83,17 @@ def run_python_script(script_file_name: str) -> str:
             log_content.append("\n--- STDERR ---")
             log_content.append(result.stderr)
         
+        profile_summary = None
+        if profile_prefix is not None:
+            summary_file = Path(f"{profile_prefix}.profile.txt")
+            if summary_file.exists():
+                profile_summary = (
+                    f"--- PROFILE ({profile}) ---\n{summary_file.read_text()}"
+                    f"Flamegraph: {profile_prefix}.flame.svg\n"
+                    f"Folded stacks: {profile_prefix}.collapsed.txt"
+                )
+                log_content.append("\n" + profile_summary)
+
         # Write to log file
         with open(log_file, 'w') as f:
             f.write('\n'.join(log_content))
@@ -73,6 +104,8 @@ def run_python_script(script_file_name: str) -> str:
             out.append("STDOUT:\n" + result.stdout)
         if result.stderr:
             out.append("STDERR:\n" + result.stderr)
+        if profile_summary:
+            out.append(profile_summary)
         out.append(f"\n📝 Full log saved to: {log_file}")
         
         return "\n".join(out)
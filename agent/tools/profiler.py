@@ -0,0 +1,283 @@
+# agent/tools/profiler.py
+"""Profile a workspace script and write flamegraph artifacts.
+
+Used by run_python_script(profile=...), which runs
+
+    python agent/tools/profiler.py --mode sample|cprofile --out <prefix> <script.py>
+
+instead of `python <script.py>`. The script runs as __main__ exactly as it
+would without profiling. Afterwards these files are written:
+
+    <prefix>.collapsed.txt   folded stacks ("a;b;c 42"), for speedscope / flamegraph.pl
+    <prefix>.flame.svg       flamegraph rendered from the folded stacks
+    <prefix>.profile.txt     top-N functions by self and inclusive time
+    <prefix>.prof            raw pstats dump (cprofile mode only)
+
+Modes:
+    sample    a thread snapshots the main thread's stack every few ms; low
+              overhead, wall-clock time (includes waiting on the browser).
+              Each sample is weighted by the ms elapsed since the previous
+              one, so stacks holding the GIL (sampled less often) are not
+              under-counted
+    cprofile  deterministic cProfile; exact call counts, more overhead on
+              call-heavy code. Folded stacks are rebuilt from the caller graph
+
+If the script is still running at --deadline seconds, it is interrupted so
+the artifacts are still written before the tool's timeout kills the process.
+"""
+import argparse
+import cProfile
+import html
+import os
+import pstats
+import runpy
+import sys
+import threading
+import time
+import _thread
+from collections import Counter, defaultdict
+from pathlib import Path
+
+SAMPLE_INTERVAL = 0.005
+TOP_N = 10
+MAX_DEPTH = 64
+
+# Frames of this runner (not of the profiled script), left out of the stacks
+RUNNER_FRAMES = ("<frozen runpy>", "runpy.py", Path(__file__).name, "<built-in method builtins.exec>")
+
+
+# ---------------------------------------------------------------------------
+# Collectors -> Counter of folded stacks ("root;...;leaf" -> weight)
+# ---------------------------------------------------------------------------
+
+def _is_runner(label: str) -> bool:
+    return any(marker in label for marker in RUNNER_FRAMES)
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class Sampler:
+    """Samples one thread's Python stack from a background thread; weights are ms of wall time."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            # The sampler has to win the GIL to wake up, so during CPU-bound
+            # code the gaps stretch; charge the whole gap to this stack
+            now = time.perf_counter()
+            elapsed_ms, last = (now - last) * 1000, now
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                label = _frame_label(frame.f_code)
+                if not _is_runner(label):
+                    stack.append(label)
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack[:MAX_DEPTH]))] += elapsed_ms
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return Counter({stack: round(ms, 2) for stack, ms in self.stacks.items()})
+
+
+def _pstats_label(func) -> str:
+    filename, line, name = func
+    return f"{name} ({Path(filename).name}:{line})" if line else name
+
+
+def folded_from_pstats(stats: pstats.Stats) -> Counter:
+    """
+    Approximate folded stacks from cProfile's caller graph: each function's
+    time is split over its callers in proportion to their cumulative time.
+    Weights are in microseconds.
+    """
+    raw = stats.stats  # func -> (cc, nc, tt, ct, callers{caller: (cc, nc, tt, ct)})
+    callees = defaultdict(list)
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, caller_stats in callers.items():
+            callees[caller].append((func, caller_stats[3]))
+    roots = [func for func, entry in raw.items() if not entry[4]]
+    folded: Counter = Counter()
+
+    def walk(func, path, share):
+        tt, ct = raw[func][2], raw[func][3]
+        name = _pstats_label(func)
+        label = path if _is_runner(name) else path + [name]
+        frac = share / ct if ct else 0.0
+        self_us = int(tt * frac * 1e6)
+        if self_us and label:
+            folded[";".join(label)] += self_us
+        if len(label) >= MAX_DEPTH:
+            return
+        for child, child_ct in callees.get(func, ()):
+            if child in path_funcs:
+                continue
+            path_funcs.add(child)
+            walk(child, label, child_ct * frac)
+            path_funcs.discard(child)
+
+    path_funcs = set()
+    for root in roots:
+        path_funcs = {root}
+        walk(root, [], raw[root][3])
+    return folded
+
+
+# ---------------------------------------------------------------------------
+# Outputs
+# ---------------------------------------------------------------------------
+
+def write_collapsed(folded: Counter, path: Path) -> None:
+    with open(path, "w") as f:
+        for stack, weight in folded.most_common():
+            f.write(f"{stack} {weight}\n")
+
+
+def _color(name: str) -> str:
+    h = sum(ord(c) for c in name)
+    return f"rgb({205 + h % 50},{80 + h % 120},{40 + h % 40})"
+
+
+def write_flamegraph(folded: Counter, path: Path, title: str, unit: str) -> None:
+    """Minimal standalone flamegraph SVG (hover a frame for its name and share)."""
+    tree: dict = {"children": {}, "value": 0}
+    for stack, weight in folded.items():
+        node = tree
+        node["value"] += weight
+        for frame in stack.split(";"):
+            node = node["children"].setdefault(frame, {"children": {}, "value": 0})
+            node["value"] += weight
+
+    width, row, top = 1200.0, 16, 30
+    total = tree["value"] or 1
+    rects = []
+    depth_max = 0
+
+    def layout(node, x, depth):
+        nonlocal depth_max
+        for name, child in sorted(node["children"].items()):
+            w = width * child["value"] / total
+            if w >= 0.5:
+                depth_max = max(depth_max, depth)
+                rects.append((name, x, depth, w, child["value"]))
+                layout(child, x, depth + 1)
+            x += w
+
+    layout(tree, 0.0, 0)
+    height = top + (depth_max + 1) * row + 10
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height}" font-family="monospace" font-size="11">',
+        f'<text x="6" y="18" font-size="14">{html.escape(title)} ({round(total, 2)} {unit})</text>',
+    ]
+    for name, x, depth, w, value in rects:
+        y = height - 10 - (depth + 1) * row  # root at the bottom
+        label = html.escape(name)
+        chars = int(w / 7)
+        text = label if len(name) <= chars else (html.escape(name[: chars - 2]) + ".." if chars > 3 else "")
+        out.append(
+            f'<g><title>{label} — {round(value, 2)} {unit} ({100 * value / total:.1f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row - 1}" fill="{_color(name)}"/>'
+            f'<text x="{x + 3:.1f}" y="{y + row - 4}">{text}</text></g>'
+        )
+    out.append("</svg>")
+    path.write_text("\n".join(out))
+
+
+def summarize(folded: Counter, unit: str, top_n: int = TOP_N) -> str:
+    """Top-N functions by self time (leaf frames) and inclusive time."""
+    total = sum(folded.values()) or 1
+    self_time: Counter = Counter()
+    incl_time: Counter = Counter()
+    for stack, weight in folded.items():
+        frames = stack.split(";")
+        self_time[frames[-1]] += weight
+        for frame in set(frames):
+            incl_time[frame] += weight
+
+    lines = [f"Total: {round(total, 2)} {unit}", "", f"Top {top_n} by self time:"]
+    for frame, weight in self_time.most_common(top_n):
+        lines.append(f"  {100 * weight / total:5.1f}%  {frame}")
+    lines += ["", f"Top {top_n} by inclusive time:"]
+    for frame, weight in incl_time.most_common(top_n):
+        lines.append(f"  {100 * weight / total:5.1f}%  {frame}")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["sample", "cprofile"], default="sample")
+    parser.add_argument("--out", required=True, help="output path prefix")
+    parser.add_argument("--interval", type=float, default=SAMPLE_INTERVAL)
+    parser.add_argument("--deadline", type=float, default=0, help="interrupt the script after N seconds")
+    parser.add_argument("script")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    opts = parser.parse_args()
+
+    out = Path(opts.out)
+    script = os.path.abspath(opts.script)
+    sys.argv = [script, *opts.args]
+    sys.path[0] = os.path.dirname(script)  # as `python script.py` would
+
+    if opts.deadline:
+        timer = threading.Timer(opts.deadline, _thread.interrupt_main)
+        timer.daemon = True
+        timer.start()
+
+    sampler = profiler = None
+    if opts.mode == "sample":
+        sampler = Sampler(threading.main_thread().ident, opts.interval)
+        sampler.start()
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    code = 0
+    start = time.perf_counter()
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except KeyboardInterrupt:
+        print(f"[profile] interrupted after {time.perf_counter() - start:.0f}s; writing partial profile", file=sys.stderr)
+        code = 124
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+        code = 1
+    finally:
+        if sampler is not None:
+            folded, unit = sampler.stop(), f"ms (sampled every {opts.interval * 1000:.0f}ms)"
+        else:
+            profiler.disable()
+            profiler.dump_stats(str(out) + ".prof")
+            folded, unit = folded_from_pstats(pstats.Stats(profiler)), "us"
+
+        sys.stdout.flush()
+        write_collapsed(folded, Path(str(out) + ".collapsed.txt"))
+        write_flamegraph(folded, Path(str(out) + ".flame.svg"), f"{Path(script).name} [{opts.mode}]", unit)
+        summary = summarize(folded, unit)
+        Path(str(out) + ".profile.txt").write_text(summary + "\n")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
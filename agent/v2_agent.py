@@ -1,10 +1,12 @@
 # agent_langgraph.py
-import asyncio, os 
+import asyncio, os, sys
 from pathlib import Path
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langchain.agents import create_agent
 from langchain_openai import ChatOpenAI  # or Anthropic, etc.
 from tools.local_tools import run_python_script 
+from tools.fs_tools import FS_TOOLS
+from middleware.context_compaction import ContextCompactionMiddleware
 
 openai_api_key = "YOUR OPENAI KEY HERE"
 
@@ -22,23 +24,45 @@ FS_CONFIG = {
     }
 }
 
+# "mcp" (default): the npx server-filesystem configured above.
+# "local": opt-in in-process Python file tools (tools/fs_tools.py), no Node start-up.
+FS_BACKEND = os.environ.get("FS_BACKEND", "mcp")
+
+
+async def get_fs_tools():
+    if FS_BACKEND == "mcp":
+        mcp_client = MultiServerMCPClient(FS_CONFIG) # type: ignore
+        return await mcp_client.get_tools()
+    return list(FS_TOOLS)
+
+
 async def main():
+    # 1) Filesystem tools (MCP or in-process → LangChain tools)
+    tools = await get_fs_tools()
     prompt_path = Path(__file__).parent / "system_prompt_v3.md"
     with open(prompt_path, 'r', encoding='utf-8') as f:
         system_prompt = f.read()
-    # 1) MCP → LangChain tools
-    mcp_client = MultiServerMCPClient(FS_CONFIG) # type: ignore
-    tools = await mcp_client.get_tools()
+    # The prompt names the tools of whichever backend was selected
+    fs_tool_names = ", ".join(f"`{t.name}`" for t in tools)
+    system_prompt = system_prompt.replace("{fs_tool_names}", fs_tool_names)
     # 2) Build an agent that knows how to use them
+    context_middleware = ContextCompactionMiddleware(
+        keep_recent_turns=int(os.environ.get("CONTEXT_KEEP_TURNS", 4)),
+        stale_after_turns=int(os.environ.get("CONTEXT_STALE_TURNS", 2)),
+        max_tool_chars=int(os.environ.get("CONTEXT_MAX_TOOL_CHARS", 4000)),
+    )
     agent = create_agent(
         model=ChatOpenAI(model="gpt-5.2"),  # or "openai:gpt-5.2"
         tools=tools + [run_python_script],
         system_prompt=(system_prompt),
+        # Old tool outputs / script bodies are sent to the model as short digests
+        middleware=[context_middleware],
     )
 
     # 3) Run it like a normal LangGraph agent
     #job_board = "https://jobs.usv.com/jobs"
-    job_board = "https://jobs.bvp.com/jobs"
+    # The recrawl scheduler passes the board to refresh (agent/skills/crawling/recrawl.py)
+    job_board = sys.argv[1] if len(sys.argv) > 1 else "https://jobs.bvp.com/jobs"
     content_string = f"Extract all jobs from {job_board}"
     result = await agent.ainvoke(
         {
@@ -54,5 +78,9 @@ async def main():
     # result["messages"] is the full convo; last message is the assistant
     print(result["messages"])
 
+    total_before = sum(t.tokens_before for t in context_middleware.metrics)
+    total_after = sum(t.tokens_after for t in context_middleware.metrics)
+    print(f"[context] {len(context_middleware.metrics)} model calls, ~{total_before} -> ~{total_after} input tokens")
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,275 @@
+"""
+Parse-time and memory benchmark for the extraction hot loops.
+
+Compares the full-tree BeautifulSoup parse each helper used to do with the
+partial parsing it does now (beautifulsoup skill: SoupStrainer, precompiled
+selectors, tree-free href scan), on snapshots shaped like the real scroll
+rounds: the DOM grows by one page of items per round, under a layer of
+site chrome (nav, filters, footer, inline script).
+
+Cases:
+- usv_company: _extract_jobs_from_html  (company page job rows)
+- usv_board:   _extract_company_slugs    (grouped company headers)
+- bvp_board:   _job_urls_in_html         (external ATS links only)
+- docs:        extract_main_content      (one Playwright docs page)
+
+For each case both variants must return the same result. Per-round time is
+measured without tracing, and peak allocation with tracemalloc in a second
+pass. Results go to benchmarks/results/parsing_<timestamp>.json.
+
+Usage:
+    python -m benchmarks.bench_parsing
+    python -m benchmarks.bench_parsing --rounds 40 --page-size 20 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fixture_boards import PAGE_TEMPLATE, FixtureBoard
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+CHROME = (
+    '<header class="site-header"><nav>'
+    + "".join(f'<a href="/section/{i}" class="nav-link"><span>Section {i}</span></a>' for i in range(120))
+    + "</nav></header>"
+    + '<aside class="filters">'
+    + "".join(
+        f'<label><input type="checkbox" name="f{i}" value="{i}"> Filter option {i} <em>({i * 7})</em></label>'
+        for i in range(200)
+    )
+    + "</aside>"
+)
+FOOTER = (
+    "<footer>"
+    + "".join(f'<p><a href="/legal/{i}">Legal {i}</a> {"Lorem ipsum dolor sit amet. " * 3}</p>' for i in range(60))
+    + "</footer>"
+    + "<script>window.__STATE__ = " + json.dumps({"items": [{"id": i, "label": f"item {i}"} for i in range(500)]}) + ";</script>"
+)
+
+
+# ---------------------------------------------------------------------------
+# The full-tree versions these helpers replaced (kept here as the baseline)
+# ---------------------------------------------------------------------------
+
+def _full_jobs_from_html(html: str, root: str) -> list:
+    soup = BeautifulSoup(html, "html.parser")
+    jobs = []
+    for jc in soup.select(".job-list-job"):
+        a = jc if jc.name == "a" else jc.find("a", href=True)
+        if not a or not isinstance(a.get("href"), str):
+            continue
+        title = a.get_text(" ", strip=True)
+        lower = title.lower()
+        if not title or any(bad in lower for bad in ["view all", "show more", "view more", "learn more",
+                                                    "share these results", "back to"]):
+            continue
+        job_url = urljoin(root, a.get("href").strip())
+        if job_url.endswith("#") or job_url.startswith("javascript:"):
+            continue
+        jobs.append((title, job_url))
+    return jobs
+
+
+def _full_company_slugs(html: str) -> list:
+    soup = BeautifulSoup(html, "html.parser")
+    out = []
+    for group in soup.select("div.grouped-job-result"):
+        a = group.select_one(".grouped-job-result-header a[href^='/jobs/']")
+        if a and isinstance(a.get("href"), str):
+            slug = a.get("href").replace("/jobs/", "").strip().strip("/")
+            if slug:
+                out.append((slug, slug))
+    return out
+
+
+def _full_job_urls(html: str, start_url: str, is_external: Callable[[str], bool]) -> set:
+    soup = BeautifulSoup(html, "html.parser")
+    return {url for a in soup.select("a[href]") if is_external(url := urljoin(start_url, a.get("href")))}
+
+
+def _full_main_content(html: str) -> tuple:
+    soup = BeautifulSoup(html, "html.parser")
+    h1 = soup.find("h1")
+    title = h1.get_text(strip=True) if h1 else "Untitled"
+    main = soup.find("main") or soup.find("article") or soup.body or soup
+    for selector in ["header", "nav", "footer"]:
+        for tag in main.find_all(selector):
+            tag.decompose()
+    return title, str(main)
+
+
+# ---------------------------------------------------------------------------
+# Snapshots
+# ---------------------------------------------------------------------------
+
+def _snapshot(board: FixtureBoard, items: str, header: str = "") -> str:
+    page = PAGE_TEMPLATE.format(title="Jobs", header=CHROME + header, api="/api", page_size=board.page_size)
+    return page.replace('<div id="list"></div>', f'<div id="list">{items}</div>' + FOOTER)
+
+
+def usv_company_rounds(board: FixtureBoard, rounds: int) -> List[str]:
+    header = '<div class="board-company-header"><h1>Careers at Fixture Company 0</h1></div>'
+    return [
+        _snapshot(board, "".join(board._usv_company_jobs(0, off) for off in range(0, (r + 1) * board.page_size, board.page_size)), header)
+        for r in range(rounds)
+    ]
+
+
+def usv_board_rounds(board: FixtureBoard, rounds: int) -> List[str]:
+    return [
+        _snapshot(board, "".join(board._usv_groups(off) for off in range(0, (r + 1) * board.page_size, board.page_size)))
+        for r in range(rounds)
+    ]
+
+
+def bvp_board_rounds(board: FixtureBoard, rounds: int) -> List[str]:
+    return [
+        _snapshot(board, "".join(board._bvp_cards(off) for off in range(0, (r + 1) * board.page_size, board.page_size)))
+        for r in range(rounds)
+    ]
+
+
+def docs_pages(count: int) -> List[str]:
+    sidebar = "<nav class='sidebar'>" + "".join(
+        f"<a href='/python/docs/api/class-{i}'>Class{i}</a>" for i in range(150)
+    ) + "</nav>"
+    pages = []
+    for n in range(count):
+        sections = "".join(
+            f"<h2 id='m{i}'>page.method_{i}</h2><p>{'Explains the method in detail. ' * 12}</p>"
+            f"<pre><code>await page.method_{i}(selector, **kwargs)</code></pre>"
+            f"<ul><li><code>selector</code> str</li><li><code>timeout</code> float</li></ul>"
+            for i in range(60)
+        )
+        pages.append(
+            f"<!doctype html><html><head><title>Class{n}</title></head><body>{sidebar}"
+            f"<main><article><h1>Class{n}</h1>{sections}</article></main>{FOOTER}</body></html>"
+        )
+    return pages
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _measure(fn: Callable[[str], object], snapshots: List[str], repeat: int) -> dict:
+    sink = io.StringIO()
+    times = []
+    with contextlib.redirect_stdout(sink):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for html in snapshots:
+                fn(html)
+            times.append(time.perf_counter() - start)
+        peaks = []
+        tracemalloc.start()
+        for html in snapshots:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            fn(html)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        tracemalloc.stop()
+    best = min(times)
+    return {
+        "ms_per_round": round(best * 1000 / len(snapshots), 3),
+        "total_ms": round(best * 1000, 1),
+        "peak_kb_per_round": round(statistics.mean(peaks) / 1024, 1),
+        "peak_kb_max": round(max(peaks) / 1024, 1),
+    }
+
+
+def run(rounds: int, page_size: int, repeat: int) -> dict:
+    from agent.skills.examples.infinite_scroll_consider import retrieve_jobs as usv
+    from agent.skills.examples.bvp_external_ats import retrieve_jobs as bvp
+    from extract_docs_for_playwrite import extract_main_content
+
+    # Only the renderers are used; the servers are never started
+    usv_company = FixtureBoard(board="usv", jobs=rounds * page_size, jobs_per_company=rounds * page_size, page_size=page_size)
+    usv_board = FixtureBoard(board="usv", jobs=rounds * page_size * 25, page_size=page_size)
+    bvp_board = FixtureBoard(board="bvp", jobs=rounds * page_size, page_size=page_size)
+    for board in (usv_company, usv_board, bvp_board):
+        board._server.server_close()
+
+    cases = {
+        "usv_company": (
+            usv_company_rounds(usv_company, rounds),
+            lambda h: _full_jobs_from_html(h, usv.ROOT),
+            usv._extract_jobs_from_html,
+        ),
+        "usv_board": (usv_board_rounds(usv_board, rounds), _full_company_slugs,
+                      lambda h: list(usv._extract_company_slugs(h))),
+        "bvp_board": (
+            bvp_board_rounds(bvp_board, rounds),
+            lambda h: _full_job_urls(h, bvp.START_URL, bvp._is_external_job_url),
+            bvp._job_urls_in_html,
+        ),
+        "docs": (docs_pages(max(3, rounds // 4)), _full_main_content, extract_main_content),
+    }
+
+    results = {}
+    for name, (snapshots, full, partial) in cases.items():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for html in (snapshots[0], snapshots[-1]):
+                if full(html) != partial(html):
+                    raise AssertionError(f"{name}: partial parse returned a different result")
+        before = _measure(full, snapshots, repeat)
+        after = _measure(partial, snapshots, repeat)
+        results[name] = {
+            "rounds": len(snapshots),
+            "snapshot_kb_last": round(len(snapshots[-1]) / 1024, 1),
+            "full": before,
+            "partial": after,
+            "speedup": round(before["total_ms"] / after["total_ms"], 2) if after["total_ms"] else None,
+            "memory_ratio": round(after["peak_kb_per_round"] / before["peak_kb_per_round"], 3)
+            if before["peak_kb_per_round"] else None,
+        }
+    return {
+        "rounds": rounds,
+        "page_size": page_size,
+        "repeat": repeat,
+        "cases": results,
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=30, help="scroll rounds per case (DOM grows each round)")
+    parser.add_argument("--page-size", type=int, default=20, help="items added per round")
+    parser.add_argument("--repeat", type=int, default=3, help="timing passes; the best is kept")
+    args = parser.parse_args()
+
+    result = run(args.rounds, args.page_size, args.repeat)
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    out_path = RESULTS_DIR / f"parsing_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    out_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+    print()
+    print("=" * 78)
+    print(f"{'case':<13}{'full ms/round':>14}{'partial':>10}{'speedup':>9}{'full KB':>10}{'partial':>10}{'mem':>8}")
+    for name, r in result["cases"].items():
+        print(
+            f"{name:<13}{r['full']['ms_per_round']:>14}{r['partial']['ms_per_round']:>10}{r['speedup']:>8}x"
+            f"{r['full']['peak_kb_per_round']:>10}{r['partial']['peak_kb_per_round']:>10}{r['memory_ratio']:>8}"
+        )
+    print(f"results written to {out_path}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Offline scraper throughput benchmark.
+
+Runs the real scraper functions against a local FixtureBoard and records:
+- jobs saved and jobs/sec (wall clock)
+- peak RSS of the whole process tree (Python + Playwright driver + Chromium)
+- browser time (goto / waits / scroll / page.content()) vs parse time,
+  taken from the telemetry skill's per-stage summary
+
+Results are written to benchmarks/results/<board>_<jobs>_<timestamp>.json.
+Pass --baseline <results.json> to fail (exit 1) when throughput drops or
+peak RSS grows by more than --tolerance percent.
+
+Usage:
+    python -m benchmarks.bench_scrapers --board usv --jobs 1000
+    python -m benchmarks.bench_scrapers --board bvp --jobs 5000 --latency-ms 80 --external-limit 200
+    python -m benchmarks.bench_scrapers --board usv --jobs 50000 --companies-limit 50 --baseline benchmarks/results/usv_50000_....json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from playwright.sync_api import sync_playwright
+
+from agent.skills.telemetry import telemetry_functions as telemetry
+from benchmarks.fixture_boards import FixtureBoard
+
+RESULTS_DIR = Path(__file__).parent / "results"
+BROWSER_STAGES = {"goto", "external_goto", "wait", "scroll", "content"}
+PARSE_STAGES = {"parse", "external_parse"}
+
+
+class TreeRSSSampler:
+    """Samples the summed RSS of this process and all its descendants (Linux /proc)."""
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _tree_rss(self) -> int:
+        parents: dict[int, int] = {}
+        rss: dict[int, int] = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/status") as f:
+                    ppid = 0
+                    vm_rss = 0
+                    for line in f:
+                        if line.startswith("PPid:"):
+                            ppid = int(line.split()[1])
+                        elif line.startswith("VmRSS:"):
+                            vm_rss = int(line.split()[1]) * 1024
+                parents[int(entry)] = ppid
+                rss[int(entry)] = vm_rss
+            except (OSError, ValueError):
+                continue
+
+        root = os.getpid()
+        total = 0
+        for pid in rss:
+            p = pid
+            while p and p != root:
+                p = parents.get(p, 0)
+            if p == root:
+                total += rss[pid]
+        return total
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, self._tree_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "TreeRSSSampler":
+        if os.path.isdir("/proc"):
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if not self.peak_bytes:
+            # No /proc: fall back to the largest single process we can see
+            own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            kids = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+            scale = 1 if sys.platform == "darwin" else 1024
+            self.peak_bytes = max(own, kids) * scale
+
+
+def _run_usv(page, board: FixtureBoard, companies_limit: int | None) -> int:
+    from agent.skills.examples.infinite_scroll_consider import retrieve_jobs as usv
+
+    seen_urls: set[str] = set()
+    saved = 0
+    slugs = usv.discover_all_companies(page, root=board.base_url)
+    for slug in slugs[:companies_limit]:
+        _, count = usv.scrape_company_jobs(page, slug, seen_urls, root=board.base_url)
+        saved += count
+    return saved
+
+
+def _run_bvp(page, board: FixtureBoard, external_limit: int | None) -> int:
+    from agent.skills.examples.bvp_external_ats import retrieve_jobs as bvp
+
+    with telemetry.span("goto", url=board.jobs_url):
+        page.goto(board.jobs_url, wait_until="domcontentloaded", timeout=60000)
+    job_urls = bvp._collect_job_urls(page, start_url=board.jobs_url)
+    return bvp.visit_external_jobs(page, job_urls[:external_limit])
+
+
+def run_benchmark(args: argparse.Namespace) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="scrape_bench_"))
+    jobs_file = workdir / "jobs.jsonl"
+    os.environ["JOBS_DB_PATH"] = str(jobs_file)
+    telemetry.reset()
+    telemetry.enable(workdir / "events.jsonl")
+
+    board = FixtureBoard(
+        board=args.board,
+        jobs=args.jobs,
+        jobs_per_company=args.jobs_per_company,
+        page_size=args.page_size,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+    )
+
+    with board, TreeRSSSampler() as sampler:
+        start = time.perf_counter()
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            page = browser.new_page()
+            try:
+                if args.board == "usv":
+                    saved = _run_usv(page, board, args.companies_limit)
+                else:
+                    saved = _run_bvp(page, board, args.external_limit)
+            finally:
+                browser.close()
+        wall = time.perf_counter() - start
+
+    stages = telemetry.summary()
+    telemetry.disable()
+
+    lines = 0
+    if jobs_file.exists():
+        with open(jobs_file, encoding="utf-8") as f:
+            lines = sum(1 for _ in f)
+
+    return {
+        "board": args.board,
+        "jobs_configured": args.jobs,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "jobs_saved": saved,
+        "lines_written": lines,
+        "wall_s": round(wall, 2),
+        "jobs_per_sec": round(saved / wall, 2) if wall else 0.0,
+        "peak_rss_mb": round(sampler.peak_bytes / 2**20, 1),
+        "browser_time_s": round(sum(s["total_ms"] for k, s in stages.items() if k in BROWSER_STAGES) / 1000, 2),
+        "parse_time_s": round(sum(s["total_ms"] for k, s in stages.items() if k in PARSE_STAGES) / 1000, 2),
+        "stages": stages,
+        "workdir": str(workdir),
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return human-readable regressions of `result` against `baseline`."""
+    problems = []
+    if baseline.get("jobs_per_sec") and result["jobs_per_sec"] < baseline["jobs_per_sec"] * (1 - tolerance / 100):
+        problems.append(f"jobs/sec {result['jobs_per_sec']} < baseline {baseline['jobs_per_sec']}")
+    if baseline.get("peak_rss_mb") and result["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + tolerance / 100):
+        problems.append(f"peak RSS {result['peak_rss_mb']} MB > baseline {baseline['peak_rss_mb']} MB")
+    return problems
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--board", choices=["usv", "bvp"], default="usv")
+    parser.add_argument("--jobs", type=int, default=1000, help="total postings on the fixture board (100 - 50000)")
+    parser.add_argument("--jobs-per-company", type=int, default=25)
+    parser.add_argument("--page-size", type=int, default=20, help="items per lazy-load request")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--companies-limit", type=int, default=None, help="usv: scrape only the first N companies")
+    parser.add_argument("--external-limit", type=int, default=None, help="bvp: visit only the first N ATS pages")
+    parser.add_argument("--baseline", type=Path, default=None, help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="allowed regression in percent")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    result = run_benchmark(args)
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    out_path = RESULTS_DIR / f"{args.board}_{args.jobs}_{timestamp}.json"
+    out_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+    print()
+    print("=" * 70)
+    for key in ("board", "jobs_configured", "jobs_saved", "wall_s", "jobs_per_sec",
+                "peak_rss_mb", "browser_time_s", "parse_time_s"):
+        print(f"{key:<18}{result[key]}")
+    print(f"results written to {out_path}")
+    print("=" * 70)
+
+    if args.baseline:
+        problems = compare(result, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        if problems:
+            print("REGRESSION:")
+            for problem in problems:
+                print(f"  - {problem}")
+            sys.exit(1)
+        print("No regression against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Jobs database write benchmark: store_job / store_jobs under concurrent writers.
+
+Every configuration in the grid
+    writers x batch size x record size x fsync
+runs in a fresh temp directory (JOBS_DB_PATH points there). N writer
+processes start together on a barrier and each stores --jobs-per-writer
+unique rows: batch size 1 calls store_job(), larger batches call
+store_jobs(). The run records:
+- throughput (rows/sec over the wall time of the slowest writer)
+- p50 / p99 / max latency of one call (one row, or one batch)
+- integrity of the resulting jobs.jsonl: torn lines (not valid JSON rows),
+  lost rows, duplicated rows, and a missing final newline
+
+Any integrity problem makes the run exit 1. Results are written to
+benchmarks/results/storage_<timestamp>.json; pass --baseline to compare
+throughput against an earlier run, as bench_scrapers does.
+
+Usage:
+    python -m benchmarks.bench_storage
+    python -m benchmarks.bench_storage --writers 1,8,32 --batch 1,50 --record-bytes 300,20000 --fsync off,on
+    python -m benchmarks.bench_storage --jobs-per-writer 5000 --dir /mnt/ssd/tmp --baseline benchmarks/results/storage_....json
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import multiprocessing as mp
+import os
+import queue
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _int_list(text: str) -> list[int]:
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def _fsync_list(text: str) -> list[bool]:
+    return [x.strip() in ("on", "1", "true") for x in text.split(",") if x.strip()]
+
+
+# ---------------------------------------------------------------------------
+# Writer process
+# ---------------------------------------------------------------------------
+
+def _job(writer: int, seq: int, record_bytes: int) -> dict:
+    url = f"https://bench.example/{writer}/{seq}"
+    # Pad the title so the serialized row is roughly record_bytes long
+    title = f"Engineer {writer}-{seq} " + "x" * max(0, record_bytes - 160)
+    return {"job_url": url, "company_name": f"Company {writer}", "job_title": title}
+
+
+def _writer(writer: int, jobs: int, batch: int, record_bytes: int, barrier, results) -> None:
+    # Imported after JOBS_DB_PATH / JOBS_DB_FSYNC are set by the parent
+    from agent.skills.jobs_database import jobs_database_functions as db
+
+    latencies = []
+    errors = 0
+    barrier.wait()
+    for start in range(0, jobs, batch):
+        rows = [_job(writer, seq, record_bytes) for seq in range(start, min(start + batch, jobs))]
+        t0 = time.perf_counter()
+        if batch == 1:
+            result = db.store_job(**rows[0])
+        else:
+            result = db.store_jobs(rows)
+        latencies.append(time.perf_counter() - t0)
+        if result.startswith("✗"):
+            errors += 1
+    results.put((writer, latencies, errors))
+
+
+# ---------------------------------------------------------------------------
+# One configuration
+# ---------------------------------------------------------------------------
+
+def check_integrity(jobs_file: Path, writers: int, jobs_per_writer: int) -> dict:
+    """Scan jobs.jsonl for torn, lost and duplicated rows."""
+    data = jobs_file.read_bytes() if jobs_file.exists() else b""
+    torn = 0
+    seen: dict[str, int] = {}
+    for line in data.splitlines():
+        try:
+            row = json.loads(line)
+            url = row["job_url"]
+            row["company_name"], row["job_title"], row["date_saved"]
+        except (ValueError, KeyError, TypeError):
+            torn += 1
+            continue
+        seen[url] = seen.get(url, 0) + 1
+    expected = {f"https://bench.example/{w}/{s}" for w in range(writers) for s in range(jobs_per_writer)}
+    return {
+        "rows": sum(seen.values()),
+        "torn_lines": torn,
+        "lost": len(expected - seen.keys()),
+        "duplicated": sum(n - 1 for n in seen.values() if n > 1),
+        "unexpected": len(seen.keys() - expected),
+        "ends_with_newline": data.endswith(b"\n") or not data,
+        "file_mb": round(len(data) / 2**20, 2),
+    }
+
+
+def run_config(base_dir: Path | None, writers: int, batch: int, record_bytes: int, fsync: bool,
+               jobs_per_writer: int) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="storage_bench_", dir=base_dir))
+    jobs_file = workdir / "jobs.jsonl"
+    env_before = {k: os.environ.get(k) for k in ("JOBS_DB_PATH", "JOBS_DB_FSYNC")}
+    os.environ["JOBS_DB_PATH"] = str(jobs_file)
+    os.environ["JOBS_DB_FSYNC"] = "1" if fsync else "0"
+
+    ctx = mp.get_context("spawn")  # clean interpreter per writer, like separate scraper processes
+    barrier = ctx.Barrier(writers + 1)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=_writer, args=(w, jobs_per_writer, batch, record_bytes, barrier, results))
+        for w in range(writers)
+    ]
+    try:
+        for p in procs:
+            p.start()
+        barrier.wait(timeout=120)  # BrokenBarrierError if a writer dies while starting
+        start = time.perf_counter()
+        collected = []
+        while len(collected) < writers:
+            try:
+                collected.append(results.get(timeout=1))
+            except queue.Empty:
+                if sum(p.is_alive() for p in procs) < writers - len(collected):
+                    raise RuntimeError("a writer process died; see its traceback above")
+        wall = time.perf_counter() - start
+        for p in procs:
+            p.join()
+        integrity = check_integrity(jobs_file, writers, jobs_per_writer)
+    finally:
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+        for key, value in env_before.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    latencies = sorted(lat for _, lats, _ in collected for lat in lats)
+    total = writers * jobs_per_writer
+    ok = (
+        integrity["torn_lines"] == 0 and integrity["lost"] == 0 and integrity["duplicated"] == 0
+        and integrity["unexpected"] == 0 and integrity["ends_with_newline"]
+    )
+    return {
+        "writers": writers,
+        "batch": batch,
+        "record_bytes": record_bytes,
+        "fsync": fsync,
+        "rows": total,
+        "wall_s": round(wall, 3),
+        "rows_per_sec": round(total / wall, 1) if wall else 0.0,
+        "call_p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "call_p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 3),
+        "call_max_ms": round(latencies[-1] * 1000, 3),
+        "errors": sum(e for _, _, e in collected),
+        "integrity": integrity,
+        "ok": ok and not any(e for _, _, e in collected),
+    }
+
+
+def compare(runs: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    """Throughput regressions of matching configurations against `baseline`."""
+    key = lambda r: (r["writers"], r["batch"], r["record_bytes"], r["fsync"])  # noqa: E731
+    before = {key(r): r for r in baseline.get("runs", [])}
+    problems = []
+    for run in runs:
+        old = before.get(key(run))
+        if old and run["rows_per_sec"] < old["rows_per_sec"] * (1 - tolerance / 100):
+            problems.append(
+                f"writers={run['writers']} batch={run['batch']} bytes={run['record_bytes']} fsync={run['fsync']}: "
+                f"{run['rows_per_sec']} rows/s < baseline {old['rows_per_sec']}"
+            )
+    return problems
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=_int_list, default=[1, 4, 16], help="writer process counts, e.g. 1,4,16")
+    parser.add_argument("--batch", type=_int_list, default=[1, 25], help="rows per call; 1 = store_job()")
+    parser.add_argument("--record-bytes", type=_int_list, default=[300, 8000], help="approx. serialized row sizes")
+    parser.add_argument("--fsync", type=_fsync_list, default=[False, True], help="off,on")
+    parser.add_argument("--jobs-per-writer", type=int, default=2000)
+    parser.add_argument("--dir", type=Path, default=None, help="parent for the temp dirs (default: system temp)")
+    parser.add_argument("--baseline", type=Path, default=None, help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="allowed regression in percent")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    runs = []
+    grid = list(itertools.product(args.writers, args.batch, args.record_bytes, args.fsync))
+    for i, (writers, batch, record_bytes, fsync) in enumerate(grid, 1):
+        print(f"[{i}/{len(grid)}] writers={writers} batch={batch} bytes={record_bytes} fsync={'on' if fsync else 'off'}")
+        runs.append(run_config(args.dir, writers, batch, record_bytes, fsync, args.jobs_per_writer))
+
+    result = {
+        "jobs_per_writer": args.jobs_per_writer,
+        "dir": str(args.dir or tempfile.gettempdir()),
+        "runs": runs,
+        "timestamp": datetime.now().isoformat(),
+    }
+    RESULTS_DIR.mkdir(exist_ok=True)
+    out_path = RESULTS_DIR / f"storage_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    out_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+    print()
+    print("=" * 86)
+    print(f"{'writers':>7}{'batch':>7}{'bytes':>7}{'fsync':>7}{'rows/s':>11}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'max ms':>9}{'torn':>6}{'lost':>6}{'dup':>6}")
+    for r in runs:
+        integ = r["integrity"]
+        print(f"{r['writers']:>7}{r['batch']:>7}{r['record_bytes']:>7}{'on' if r['fsync'] else 'off':>7}"
+              f"{r['rows_per_sec']:>11}{r['call_p50_ms']:>9}{r['call_p99_ms']:>9}{r['call_max_ms']:>9}"
+              f"{integ['torn_lines']:>6}{integ['lost']:>6}{integ['duplicated']:>6}")
+    print(f"results written to {out_path}")
+    print("=" * 86)
+
+    failed = [r for r in runs if not r["ok"]]
+    if failed:
+        print(f"INTEGRITY FAILURE in {len(failed)} configuration(s)")
+        sys.exit(1)
+    if args.baseline:
+        problems = compare(runs, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        if problems:
+            print("REGRESSION:")
+            for problem in problems:
+                print(f"  - {problem}")
+            sys.exit(1)
+        print("No regression against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Title filtering benchmark: per-phrase loop vs. the compiled TitleEngine.
+
+The scrapers used to drop non-job links with
+    any(bad in lower_title for bad in [...])
+which costs one substring search per phrase per title. TitleEngine
+(jobs_titles_functions) compiles all phrases into one trie-shaped regex
+and scans a whole batch of titles at once, so its per-title cost should
+stay flat as the phrase list grows.
+
+For each phrase count the benchmark builds random 1-3 word phrases from a
+fixed vocabulary and checks that both variants exclude the same titles. It
+then times:
+- loop:     any(" phrase " in " title ") over the normalized titles
+- excluded: TitleEngine(exclude=phrases).excluded(titles), as in the scrapers
+- process:  TitleEngine.process(titles) with the phrases plus the default
+            synonyms and function/seniority tags (exclusion + tags + normalization)
+
+Results go to benchmarks/results/titles_<timestamp>.json.
+
+Usage:
+    python -m benchmarks.bench_titles
+    python -m benchmarks.bench_titles --titles 50000 --phrases 10,1000,100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+
+from agent.skills.jobs_database.jobs_titles_functions import (
+    FUNCTION_TAGS,
+    SENIORITY_TAGS,
+    TITLE_SYNONYMS,
+    TitleEngine,
+    normalize_title,
+)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+WORDS = sorted({w for phrases in (*FUNCTION_TAGS.values(), *SENIORITY_TAGS.values()) for p in phrases for w in p.split()}
+               | {"remote", "platform", "payments", "growth", "infrastructure", "mobile", "web", "cloud", "team",
+                  "new", "york", "london", "berlin", "ii", "iii", "view", "all", "show", "more", "back", "to"})
+
+
+def _int_list(text: str) -> list[int]:
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def make_titles(n: int, rng: random.Random) -> list[str]:
+    titles = []
+    for _ in range(n):
+        words = rng.choices(WORDS, k=rng.randint(2, 7))
+        title = " ".join(w.title() for w in words)
+        if rng.random() < 0.2:
+            title += rng.choice([" - Remote", " (NYC)", ", Sr.", " / Platform"])
+        titles.append(title)
+    return titles
+
+
+def make_phrases(n: int, rng: random.Random) -> list[str]:
+    # Up to 20 two-word phrases that can match; the rest end in a token no
+    # title contains, so longer lists cost the loop more but exclude nothing new
+    phrases = {" ".join(rng.choices(WORDS, k=2)) for _ in range(min(n, 20))}
+    while len(phrases) < n:
+        phrases.add(" ".join(rng.choices(WORDS, k=rng.randint(1, 2))) + f" x{len(phrases)}")
+    return sorted(phrases)
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(n_titles: int, phrase_counts: list[int], repeat: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    titles = make_titles(n_titles, rng)
+    padded_titles = [f" {normalize_title(t)} " for t in titles]
+    tags = {"function": FUNCTION_TAGS, "seniority": SENIORITY_TAGS}
+
+    runs = []
+    for count in phrase_counts:
+        phrases = make_phrases(count, rng)
+        padded = [f" {p} " for p in phrases]
+        start = time.perf_counter()
+        engine = TitleEngine(exclude=phrases, synonyms=TITLE_SYNONYMS, tags=tags)
+        compile_s = time.perf_counter() - start
+        excluder = TitleEngine(exclude=phrases)
+
+        def loop():
+            return [any(p in t for p in padded) for t in padded_titles]
+
+        expected = loop()
+        if excluder.excluded(titles) != expected or [i.excluded for i in engine.process(titles)] != expected:
+            raise AssertionError(f"{count} phrases: TitleEngine excluded different titles than the loop")
+
+        t_loop = _best(loop, repeat)
+        t_excluded = _best(lambda: excluder.excluded(titles), repeat)
+        t_process = _best(lambda: engine.process(titles), repeat)
+        runs.append({
+            "phrases": count,
+            "excluded_titles": sum(expected),
+            "compile_ms": round(compile_s * 1000, 1),
+            "loop_us_per_title": round(t_loop * 1e6 / n_titles, 3),
+            "excluded_us_per_title": round(t_excluded * 1e6 / n_titles, 3),
+            "process_us_per_title": round(t_process * 1e6 / n_titles, 3),
+            "speedup": round(t_loop / t_excluded, 2) if t_excluded else None,
+        })
+    return {"titles": n_titles, "repeat": repeat, "seed": seed, "runs": runs,
+            "timestamp": datetime.now().isoformat()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=int, default=20000)
+    parser.add_argument("--phrases", type=_int_list, default=[6, 100, 1000, 10000], help="phrase list sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="timing passes; the best is kept")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    result = run(args.titles, args.phrases, args.repeat, args.seed)
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    out_path = RESULTS_DIR / f"titles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    out_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+    print()
+    print("=" * 72)
+    print(f"{'phrases':>8}{'excluded':>10}{'compile ms':>12}{'loop us':>10}{'excl us':>10}{'proc us':>10}{'speedup':>10}")
+    for r in result["runs"]:
+        print(f"{r['phrases']:>8}{r['excluded_titles']:>10}{r['compile_ms']:>12}{r['loop_us_per_title']:>10}"
+              f"{r['excluded_us_per_title']:>10}{r['process_us_per_title']:>10}{r['speedup']:>9}x")
+    print(f"results written to {out_path}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""
+Local fixture job boards for offline scraper benchmarks.
+
+Serves synthetic infinite-scroll boards from a background HTTP server so the
+real scraper functions can run without touching jobs.usv.com or jobs.bvp.com:
+
+- "usv": Consider-style grouped board. /jobs lazily loads
+  `.grouped-job-result` groups whose header links to /jobs/<slug>; each
+  company page has a `.board-company-header h1` and lazily loads
+  `.job-list-job` rows.
+- "bvp": aggregator board. /jobs lazily loads job cards linking to external
+  ATS postings on *.greenhouse.io.localhost / *.lever.co.localhost /
+  *.ashbyhq.com.localhost. Chromium resolves *.localhost to loopback, so the
+  stub ATS pages are served by the same server and still pass
+  `_is_external_job_url`.
+
+Every lazy-load request and ATS page can be delayed with `latency_ms` (plus
+random `jitter_ms`) to model a slow origin.
+
+Usage (serve a board for manual poking):
+    python -m benchmarks.fixture_boards --board usv --jobs 1000 --port 8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import html
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TITLES = [
+    "Senior Software Engineer",
+    "Product Manager",
+    "Data Scientist",
+    "Account Executive",
+    "Staff Backend Engineer",
+    "Head of Marketing",
+    "Customer Success Manager",
+    "Machine Learning Engineer",
+    "Recruiter",
+    "Frontend Engineer",
+]
+ATS_HOSTS = ["boards.greenhouse.io.localhost", "jobs.lever.co.localhost", "jobs.ashbyhq.com.localhost"]
+
+PAGE_TEMPLATE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>.grouped-job-result, .job-list-job, .job-card {{ min-height: 80px; }}</style>
+</head><body>
+{header}
+<div id="list"></div>
+<script>
+let offset = 0, loading = false, done = false;
+async function more() {{
+  if (loading || done) return;
+  loading = true;
+  const resp = await fetch("{api}" + (("{api}".includes("?")) ? "&" : "?") + "offset=" + offset);
+  const body = await resp.text();
+  if (body.trim()) {{
+    document.getElementById("list").insertAdjacentHTML("beforeend", body);
+    offset += {page_size};
+  }} else {{
+    done = true;
+  }}
+  loading = false;
+}}
+window.addEventListener("scroll", () => {{
+  if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 400) more();
+}});
+more();
+</script>
+</body></html>
+"""
+
+
+class FixtureBoard:
+    """
+    A synthetic job board served from a local ThreadingHTTPServer.
+
+    Args:
+        board: "usv" or "bvp"
+        jobs: Total number of job postings on the board
+        jobs_per_company: Postings per company (usv grouping, bvp ATS slugs)
+        page_size: Items returned per lazy-load request
+        latency_ms: Delay added to every lazy-load request and ATS page
+        jitter_ms: Random extra delay in [0, jitter_ms]
+        port: Port to bind (0 picks a free one)
+        seed: Seed for jitter so runs are repeatable
+    """
+
+    def __init__(
+        self,
+        board: str = "usv",
+        jobs: int = 1000,
+        jobs_per_company: int = 25,
+        page_size: int = 20,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        port: int = 0,
+        seed: int = 0,
+    ):
+        if board not in ("usv", "bvp"):
+            raise ValueError(f"Unknown fixture board: {board}")
+        self.board = board
+        self.jobs = jobs
+        self.jobs_per_company = max(1, jobs_per_company)
+        self.page_size = max(1, page_size)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.companies = (jobs + self.jobs_per_company - 1) // self.jobs_per_company
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    # -- data --------------------------------------------------------------
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def jobs_url(self) -> str:
+        return f"{self.base_url}/jobs"
+
+    def company_slug(self, idx: int) -> str:
+        return f"company-{idx:05d}"
+
+    def company_name(self, idx: int) -> str:
+        return f"Fixture Company {idx}"
+
+    def company_job_ids(self, idx: int) -> range:
+        start = idx * self.jobs_per_company
+        return range(start, min(start + self.jobs_per_company, self.jobs))
+
+    def job_title(self, job_id: int) -> str:
+        return f"{TITLES[job_id % len(TITLES)]} {job_id}"
+
+    def ats_url(self, job_id: int) -> str:
+        company = job_id // self.jobs_per_company
+        host = ATS_HOSTS[company % len(ATS_HOSTS)]
+        return f"http://{host}:{self.port}/{self.company_slug(company)}/jobs/{job_id}"
+
+    # -- rendering ---------------------------------------------------------
+
+    def _page(self, title: str, api: str, header: str = "") -> str:
+        return PAGE_TEMPLATE.format(title=html.escape(title), header=header, api=api, page_size=self.page_size)
+
+    def _usv_groups(self, offset: int) -> str:
+        out = []
+        for idx in range(offset, min(offset + self.page_size, self.companies)):
+            slug = self.company_slug(idx)
+            rows = "".join(
+                f'<div class="job-list-job"><a href="/jobs/{slug}/{job_id}">{self.job_title(job_id)}</a></div>'
+                for job_id in list(self.company_job_ids(idx))[:3]
+            )
+            out.append(
+                '<div class="grouped-job-result">'
+                f'<div class="grouped-job-result-header"><a href="/jobs/{slug}">{self.company_name(idx)}</a></div>'
+                f"{rows}"
+                f'<a href="/jobs/{slug}">View all jobs</a>'
+                "</div>"
+            )
+        return "".join(out)
+
+    def _usv_company_jobs(self, idx: int, offset: int) -> str:
+        slug = self.company_slug(idx)
+        ids = list(self.company_job_ids(idx))[offset : offset + self.page_size]
+        return "".join(
+            f'<div class="job-list-job"><a href="/jobs/{slug}/{job_id}">{self.job_title(job_id)}</a>'
+            f"<span>Remote</span></div>"
+            for job_id in ids
+        )
+
+    def _bvp_cards(self, offset: int) -> str:
+        return "".join(
+            f'<div class="job-card"><a href="{self.ats_url(job_id)}">{self.job_title(job_id)}</a>'
+            f'<a href="/companies/{self.company_slug(job_id // self.jobs_per_company)}">Company</a>'
+            f"<span>New York, NY</span></div>"
+            for job_id in range(offset, min(offset + self.page_size, self.jobs))
+        )
+
+    def _ats_page(self, company: int, job_id: int) -> str:
+        name = self.company_name(company)
+        title = self.job_title(job_id)
+        return (
+            "<!doctype html><html><head>"
+            f'<meta property="og:site_name" content="{name}">'
+            f'<meta property="og:title" content="{title}">'
+            f"<title>{title} - {name}</title></head>"
+            f"<body><h1>{title}</h1><p>{'Lorem ipsum dolor sit amet. ' * 40}</p></body></html>"
+        )
+
+    def route(self, path: str, query: dict) -> tuple[int, str]:
+        """Return (status, body) for a request path."""
+        offset = int(query.get("offset", ["0"])[0])
+        parts = [p for p in path.split("/") if p]
+
+        if self.board == "usv":
+            if parts == ["jobs"]:
+                return 200, self._page("Jobs", "/api/groups")
+            if parts == ["api", "groups"]:
+                self._delay()
+                return 200, self._usv_groups(offset)
+            if len(parts) == 2 and parts[0] == "jobs":
+                idx = self._company_index(parts[1])
+                if idx is None:
+                    return 404, "not found"
+                header = f'<div class="board-company-header"><h1>Careers at {self.company_name(idx)}</h1></div>'
+                return 200, self._page(self.company_name(idx), f"/api/company/{parts[1]}", header)
+            if len(parts) == 3 and parts[:2] == ["api", "company"]:
+                idx = self._company_index(parts[2])
+                if idx is None:
+                    return 404, "not found"
+                self._delay()
+                return 200, self._usv_company_jobs(idx, offset)
+        else:
+            if parts == ["jobs"]:
+                return 200, self._page("Jobs", "/api/jobs")
+            if parts == ["api", "jobs"]:
+                self._delay()
+                return 200, self._bvp_cards(offset)
+            if len(parts) == 3 and parts[1] == "jobs":
+                idx = self._company_index(parts[0])
+                if idx is None or not parts[2].isdigit():
+                    return 404, "not found"
+                self._delay()
+                return 200, self._ats_page(idx, int(parts[2]))
+
+        return 404, "not found"
+
+    def _company_index(self, slug: str) -> int | None:
+        if not slug.startswith("company-"):
+            return None
+        try:
+            idx = int(slug[len("company-") :])
+        except ValueError:
+            return None
+        return idx if 0 <= idx < self.companies else None
+
+    def _delay(self) -> None:
+        if not self.latency_ms and not self.jitter_ms:
+            return
+        with self._rng_lock:
+            jitter = self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        time.sleep((self.latency_ms + jitter) / 1000.0)
+
+    # -- server ------------------------------------------------------------
+
+    def _handler_class(self):
+        board = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                status, body = board.route(parsed.path, parse_qs(parsed.query))
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FixtureBoard":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FixtureBoard":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic job board locally.")
+    parser.add_argument("--board", choices=["usv", "bvp"], default="usv")
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--jobs-per-company", type=int, default=25)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    board = FixtureBoard(
+        board=args.board,
+        jobs=args.jobs,
+        jobs_per_company=args.jobs_per_company,
+        page_size=args.page_size,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        port=args.port,
+    )
+    print(f"Serving {args.board} fixture board with {args.jobs} jobs at {board.jobs_url} (Ctrl+C to stop)")
+    try:
+        board._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        board._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
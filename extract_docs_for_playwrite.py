@@ -12,18 +12,34 @@ and bundle them into a ZIP archive.
     * Saves as <ClassName>.md in ./playwright_python_classes
 - Finally creates playwright_python_classes.zip in the current directory.
 
+Pages are fetched concurrently over one pooled HTTP client (keep-alive, and
+HTTP/2 when httpx + h2 are installed), throttled by the crawling skill's
+adaptive per-host scheduler (AIMD on latency / 429 / 503, honours
+Retry-After), and the HTML -> Markdown conversion runs in a process pool as
+pages arrive (in completion order). Files are written in the same (sorted
+URL) order as the sequential path, and both paths decode responses the same
+way (declared charset, else UTF-8), so the output is identical.
+
 Usage:
     python scrape_playwright_docs.py
+    python scrape_playwright_docs.py --workers 8 --rate 4
+    python scrape_playwright_docs.py --sequential
 """
 
+import argparse
 import os
 import re
 import time
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin, urlparse
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from agent.skills.beautifulsoup.beautifulsoup_functions import parse_only, tag_strainer
+from agent.skills.crawling.host_scheduler import BACKOFF_STATUSES, HostPolicy, HostScheduler
 
 
 from markdownify import markdownify as html_to_markdown
@@ -35,21 +51,67 @@ START_URL = "https://playwright.dev/python/docs/api/class-playwright"
 OUTPUT_DIR = "playwright_python_classes"
 ZIP_NAME = "playwright_python_classes.zip"
 
+DEFAULT_WORKERS = 8
+DEFAULT_RATE = 4.0  # starting requests per second, replaces the old fixed 0.5s sleep
+MAX_ATTEMPTS = 3     # per page, for 429/503 answers
+MAIN_ONLY = tag_strainer("main")  # docs pages keep the title and content in <main>
+
+
+def make_client(max_connections: int = DEFAULT_WORKERS):
+    """
+    Build a pooled HTTP client shared by all fetches.
+
+    Uses httpx with HTTP/2 if httpx and h2 are installed, otherwise a
+    requests.Session with a keep-alive connection pool sized for the workers.
+    Both expose .get(url, timeout=...) returning a response with
+    .raise_for_status() and .text.
+    """
+    try:
+        import h2  # noqa: F401
+        import httpx
+
+        return httpx.Client(
+            http2=True,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+    except ImportError:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+
+def response_text(resp) -> str:
+    """
+    Decode a response body the same way for requests and httpx.
+
+    Without a charset in Content-Type, requests falls back to ISO-8859-1 and
+    httpx to UTF-8 / detection; use the declared charset, else UTF-8.
+    """
+    match = re.search(r"charset=[\"']?([\w.:-]+)", resp.headers.get("Content-Type", ""), re.I)
+    resp.encoding = match.group(1) if match else "utf-8"
+    return resp.text
+
 
-def fetch(url: str) -> str:
+def fetch(url: str, client=None) -> str:
     """Fetch a URL and return its HTML as text."""
     print(f"GET {url}")
-    resp = requests.get(url, timeout=15)
+    resp = (client or requests).get(url, timeout=15)
     resp.raise_for_status()
-    return resp.text
+    return response_text(resp)
 
 
-def get_class_urls(start_url: str) -> list[str]:
+def get_class_urls(start_url: str, client=None) -> list[str]:
     """
     From the start page, discover all Python API class docs:
     any <a> whose href starts with '/python/docs/api/class-'.
     """
-    html = fetch(start_url)
+    html = fetch(start_url, client)
     soup = BeautifulSoup(html, "html.parser")
 
     links = set()
@@ -83,8 +145,13 @@ def extract_main_content(html: str) -> tuple[str, str]:
 
     - Title: from the first <h1> on the page
     - Content: the <main> element if present, else <article>, else <body>.
+
+    Only <main> is parsed when it holds the title (the usual docs layout);
+    other layouts fall back to parsing the whole page.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_only(html, MAIN_ONLY)
+    if soup.find("main") is None or soup.find("h1") is None:
+        soup = BeautifulSoup(html, "html.parser")
 
     # Title
     h1 = soup.find("h1")
@@ -125,22 +192,24 @@ def sanitize_filename(name: str) -> str:
     return f"{name or 'PlaywrightClass'}.md"
 
 
-def save_markdown_for_url(url: str, out_dir: str) -> str:
+def convert_page(url: str, html: str) -> tuple[str, str]:
     """
-    Download a docs page, convert to markdown, and save it.
+    Convert a downloaded docs page into (filename, markdown).
 
-    Returns the path to the saved file.
+    Pure function so it can run in a worker process.
     """
-    html = fetch(url)
     title, main_html = extract_main_content(html)
     md_body = html_to_markdown(main_html)
 
     filename = sanitize_filename(title)
-    out_path = os.path.join(out_dir, filename)
 
     # Add a simple Markdown header at the top
     md = f"# {title}\n\nSource: {url}\n\n---\n\n{md_body}"
+    return filename, md
 
+
+def write_markdown(out_dir: str, filename: str, md: str) -> str:
+    out_path = os.path.join(out_dir, filename)
     with open(out_path, "w", encoding="utf-8") as f:
         f.write(md)
 
@@ -148,6 +217,76 @@ def save_markdown_for_url(url: str, out_dir: str) -> str:
     return out_path
 
 
+def save_markdown_for_url(url: str, out_dir: str, client=None) -> str:
+    """
+    Download a docs page, convert to markdown, and save it.
+
+    Returns the path to the saved file.
+    """
+    html = fetch(url, client)
+    filename, md = convert_page(url, html)
+    return write_markdown(out_dir, filename, md)
+
+
+def save_markdown_concurrently(
+    urls: list[str],
+    out_dir: str,
+    client,
+    workers: int = DEFAULT_WORKERS,
+    rate: float = DEFAULT_RATE,
+    scheduler: HostScheduler | None = None,
+) -> list[str]:
+    """
+    Fetch `urls` with bounded concurrency and convert them in a process pool.
+
+    Fetches are throttled per host by a HostScheduler (starting at `rate`
+    requests/second, at most `workers` in flight) and retried on 429/503.
+    Each page is handed to the converter as soon as its fetch completes (a slow
+    page doesn't hold up the others), but files are written in the order of
+    `urls` so that duplicate filenames resolve exactly as in the sequential path.
+
+    Returns the paths written.
+    """
+    scheduler = scheduler or HostScheduler(
+        HostPolicy(initial_rate=rate, max_concurrency=workers, initial_concurrency=min(2, workers))
+    )
+
+    def polite_fetch(url: str) -> str:
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            with scheduler.slot(url) as slot:
+                print(f"GET {url}")
+                resp = client.get(url, timeout=15)
+                slot.report(resp.status_code, resp.headers.get("Retry-After"))
+            if resp.status_code not in BACKOFF_STATUSES or attempt == MAX_ATTEMPTS:
+                break
+        resp.raise_for_status()
+        return response_text(resp)
+
+    with ThreadPoolExecutor(max_workers=workers) as io_pool, ProcessPoolExecutor() as cpu_pool:
+        fetches = {io_pool.submit(polite_fetch, url): url for url in urls}
+
+        conversions = {}
+        for fut in as_completed(fetches):
+            url = fetches[fut]
+            try:
+                conversions[url] = cpu_pool.submit(convert_page, url, fut.result())
+            except Exception as e:
+                print(f"!! Error processing {url}: {e}")
+
+        written = []
+        for url in urls:
+            fut = conversions.get(url)
+            if fut is None:
+                continue
+            try:
+                filename, md = fut.result()
+                written.append(write_markdown(out_dir, filename, md))
+            except Exception as e:
+                print(f"!! Error processing {url}: {e}")
+
+    return written
+
+
 def ensure_output_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
@@ -162,17 +301,39 @@ def zip_folder(folder: str, zip_name: str) -> None:
     print(f"Created {zip_name}")
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="concurrent fetches")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="starting requests per second")
+    parser.add_argument("--sequential", action="store_true", help="fetch one page at a time (old behaviour)")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     ensure_output_dir(OUTPUT_DIR)
 
-    class_urls = get_class_urls(START_URL)
-
-    for url in class_urls:
-        try:
-            save_markdown_for_url(url, OUTPUT_DIR)
-            time.sleep(0.5)  # be polite, avoid hammering the server
-        except Exception as e:
-            print(f"!! Error processing {url}: {e}")
+    client = make_client(args.workers)
+    try:
+        class_urls = get_class_urls(START_URL, client)
+
+        if args.sequential:
+            for url in class_urls:
+                try:
+                    save_markdown_for_url(url, OUTPUT_DIR, client)
+                    time.sleep(0.5)  # be polite, avoid hammering the server
+                except Exception as e:
+                    print(f"!! Error processing {url}: {e}")
+        else:
+            save_markdown_concurrently(
+                class_urls,
+                OUTPUT_DIR,
+                client,
+                workers=args.workers,
+                rate=args.rate,
+            )
+    finally:
+        client.close()
 
     zip_folder(OUTPUT_DIR, ZIP_NAME)
     print("Done.")
@@ -5,11 +5,28 @@ Optimize Playwright documentation files for LLM inference by:
 2. Removing version tags
 3. Converting web links to local file references
 4. Fixing escaped underscores
+
+Then build a signature-only digest of all classes (playwright_api_digest.md,
+one line per method / property / event) for quick API lookups. The digest is
+rebuilt incrementally: only files whose content hash changed are re-parsed.
+
+Usage:
+    python optimize_playwright_docs.py                # optimize + digest
+    python optimize_playwright_docs.py --digest-only  # leave the docs as they are
+    python optimize_playwright_docs.py --force        # re-parse every file
 """
 
+import argparse
+import hashlib
+import json
 import re
 from pathlib import Path
 
+DOCS_DIR = Path('agent/skills/playwright/playwright_python_classes')
+DIGEST_PATH = DOCS_DIR.parent / 'playwright_api_digest.md'
+DIGEST_CACHE = DOCS_DIR.parent / '.playwright_api_digest.json'
+DIGEST_VERSION = 1  # bump when the digest format changes, to invalidate the cache
+
 def optimize_markdown(content: str) -> str:
     """Apply optimizations to markdown content."""
     
@@ -113,14 +130,154 @@ def process_file(filepath: Path) -> None:
         print(f"  • Skipped {filepath.name} (already optimized)")
 
 
+# ---------------------------------------------------------------------------
+# Signature digest
+# ---------------------------------------------------------------------------
+
+SECTION_RE = re.compile(r'^(?:## )?(Methods|Properties|Events|Deprecated)(?:\[|\s*$)')
+ENTRY_RE = re.compile(r'^### (.+?)(?:\[|\s|$)')
+ARG_RE = re.compile(r'^\* `([^`]+)`\s*(.*)$')
+LINK_RE = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+
+
+def _clean_type(text: str) -> str:
+    """'[Locator](Locator.md) *(optional)*' -> 'Locator'."""
+    text = LINK_RE.sub(r'\1', text)
+    text = text.replace('*(optional)*', '').replace('`', '').replace('\\_', '_')
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def _entry_line(name: str, kind: str, block: list) -> str:
+    """One digest line for a `### name` entry, from its Arguments/Returns/Type/Event data bullets."""
+    args, options, returns = [], [], ''
+    part, in_code = None, False
+    for line in block:
+        if line.startswith('```'):
+            in_code = not in_code
+            continue
+        if in_code:
+            continue
+        if line.startswith('**') and line.rstrip().endswith('**'):
+            part = line.strip('* \n')
+            continue
+        if not line.startswith('* '):
+            continue  # prose, or nested "+" fields of a dict
+        if part == 'Arguments':
+            m = ARG_RE.match(line)
+            if m:
+                if '*(optional)*' in m.group(2):
+                    options.append(m.group(1))
+                else:
+                    args.append(f'{m.group(1)}: {_clean_type(m.group(2))}')
+        elif part in ('Returns', 'Type', 'Event data') and not returns:
+            returns = _clean_type(line[2:])
+
+    if returns == 'NoneType':
+        returns = ''
+    if kind == 'Properties':
+        line = f'{name} -> {returns or "?"}'
+    elif kind == 'Events' or name.startswith('on('):
+        line = f'{name} -> {returns}' if returns else name
+    else:
+        if options:
+            args.append(f'[{", ".join(options)}]')
+        line = f'{name}({", ".join(args)})' + (f' -> {returns}' if returns else '')
+    return line + (' [deprecated]' if kind == 'Deprecated' else '')
+
+
+def digest_markdown(content: str, class_name: str) -> str:
+    """Signature-only digest of one class page: a '## Class' heading and one line per entry."""
+    lines = content.splitlines()
+    title = next((l[2:].strip() for l in lines if l.startswith('# ')), class_name)
+    out = [f'## {title}']
+    kind, name, block = None, None, []
+
+    def flush():
+        if name and kind:
+            out.append(_entry_line(name, kind, block))
+
+    for line in lines:
+        section = SECTION_RE.match(line)
+        if section:
+            flush()
+            kind, name, block = section.group(1), None, []
+            continue
+        entry = ENTRY_RE.match(line)
+        if entry:
+            flush()
+            name, block = entry.group(1), []
+            continue
+        block.append(line)
+    flush()
+    return '\n'.join(out) + '\n'
+
+
+def build_digest(docs_dir: Path = DOCS_DIR, digest_path: Path = DIGEST_PATH,
+                 cache_path: Path = DIGEST_CACHE, force: bool = False) -> bool:
+    """
+    Write the signature digest for every *.md in docs_dir. Files whose sha256
+    matches the cache reuse their cached digest section. Returns True if the
+    digest file changed.
+    """
+    cache = {}
+    if cache_path.exists() and not force:
+        try:
+            cache = json.loads(cache_path.read_text(encoding='utf-8'))
+        except ValueError:
+            cache = {}
+    if cache.get('version') != DIGEST_VERSION:
+        cache = {}
+    cached_files = cache.get('files', {})
+
+    files, sections = {}, []
+    rebuilt = 0
+    for filepath in sorted(docs_dir.glob('*.md')):
+        content = filepath.read_text(encoding='utf-8')
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        entry = cached_files.get(filepath.name)
+        if entry is None or entry.get('sha256') != digest:
+            entry = {'sha256': digest, 'section': digest_markdown(content, filepath.stem)}
+            rebuilt += 1
+        files[filepath.name] = entry
+        sections.append(entry['section'])
+
+    header = (
+        '# Playwright Python API digest\n\n'
+        'Generated by optimize_playwright_docs.py from playwright_python_classes/*.md; do not edit.\n'
+        'One line per member: `method(arg: type, [optional, kwargs]) -> return`, `property -> type`,\n'
+        '`on("event") -> event data`; no arrow means it returns None.\n'
+        'Sync and async APIs share names (await the async ones).\n'
+        'Option types, defaults and examples: playwright_python_classes/<Class>.md\n'
+    )
+    text = header + '\n' + '\n'.join(sections)
+
+    changed = not digest_path.exists() or digest_path.read_text(encoding='utf-8') != text
+    if changed:
+        digest_path.write_text(text, encoding='utf-8')
+    cache_path.write_text(json.dumps({'version': DIGEST_VERSION, 'files': files}, indent=1), encoding='utf-8')
+
+    removed = len(set(cached_files) - set(files))
+    print(f"Digest: re-parsed {rebuilt}, reused {len(files) - rebuilt}, dropped {removed} "
+          f"-> {digest_path} (~{len(text) // 4} tokens{'' if changed else ', unchanged'})")
+    return changed
+
+
 def main():
-    """Process all markdown files in the playwright_python_classes directory."""
-    docs_dir = Path('agent/skills/playwright/playwright_python_classes')
+    """Process all markdown files in the playwright_python_classes directory, then rebuild the digest."""
+    parser = argparse.ArgumentParser(description='Optimize the Playwright docs and build the API digest.')
+    parser.add_argument('--digest-only', action='store_true', help='only rebuild the signature digest')
+    parser.add_argument('--force', action='store_true', help='ignore the digest cache')
+    args = parser.parse_args()
+    docs_dir = DOCS_DIR
     
     if not docs_dir.exists():
         print(f"Error: Directory not found: {docs_dir}")
         return
     
+    if args.digest_only:
+        build_digest(docs_dir, force=args.force)
+        return
+
     md_files = sorted(docs_dir.glob('*.md'))
     
     if not md_files:
@@ -147,6 +304,8 @@ def main():
     
     print(f"\n✅ Completed! Optimized {optimized_count} files, skipped {skipped_count} files (already optimal).")
 
+    build_digest(docs_dir, force=args.force)
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,94 @@
+"""Readers of the jobs database while compact() runs (or crashes part-way)."""
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from agent.skills.jobs_database import jobs_compaction_functions as jc
+
+
+class Crash(Exception):
+    pass
+
+
+def _append_rows(jobs_file: Path, n: int, keys: int, start: int = 0) -> None:
+    with open(jobs_file, "a", encoding="utf-8") as f:
+        for i in range(start, start + n):
+            row = {"job_url": f"https://example.com/jobs/{i % keys}", "company_name": f"c{i % 7}",
+                   "job_title": f"t{i}", "date_saved": f"2026-01-01T00:00:{i:06d}"}
+            f.write(json.dumps(row) + "\n")
+
+
+def _count(jobs_file: Path) -> int:
+    return sum(1 for _ in jc.iter_merged_lines(jobs_file))
+
+
+def test_reader_between_manifest_swap_and_pending_delete(tmp_path, monkeypatch):
+    jobs_file = tmp_path / "jobs.jsonl"
+    _append_rows(jobs_file, 500, keys=100)
+    counts = []
+    write_json = jc._write_json_atomic
+
+    def swap_then_read(path, data):
+        write_json(path, data)
+        if path.name == jc.MANIFEST:
+            # The new segment is published, the consumed pending log not deleted yet
+            assert list(path.parent.glob("pending-*.jsonl"))
+            counts.append(_count(jobs_file))
+
+    monkeypatch.setattr(jc, "_write_json_atomic", swap_then_read)
+    jc.compact(jobs_file, run_rows=30)
+    assert counts == [100]
+    assert _count(jobs_file) == 100
+
+
+def test_crash_before_pending_delete_leaves_no_duplicates(tmp_path, monkeypatch):
+    jobs_file = tmp_path / "jobs.jsonl"
+    _append_rows(jobs_file, 500, keys=100)
+    unlink = Path.unlink
+
+    def crash_on_pending(self, missing_ok=False):
+        if self.name.startswith("pending-"):
+            raise Crash
+        return unlink(self, missing_ok=missing_ok)
+
+    monkeypatch.setattr(Path, "unlink", crash_on_pending)
+    with pytest.raises(Crash):
+        jc.compact(jobs_file)
+    monkeypatch.undo()
+
+    seg_dir = jc.segments_dir(jobs_file)
+    assert list(seg_dir.glob("pending-*.jsonl"))
+    assert _count(jobs_file) == 100
+
+    _append_rows(jobs_file, 50, keys=200, start=500)  # 50 new jobs (keys 100-149)
+    jc.compact(jobs_file)
+    assert not list(seg_dir.glob("pending-*.jsonl"))
+    assert _count(jobs_file) == 150
+    assert jc.lookup("https://example.com/jobs/99", jobs_file)["job_title"] == "t499"
+
+
+def test_concurrent_reader_sees_either_side_of_compaction(tmp_path):
+    jobs_file = tmp_path / "jobs.jsonl"
+    for round_no in range(4):
+        _append_rows(jobs_file, 2000, keys=300 + 100 * round_no, start=2000 * round_no)
+        before = _count(jobs_file)
+        seen = []
+        done = threading.Event()
+
+        def reader():
+            while not done.is_set():
+                seen.append(_count(jobs_file))
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        try:
+            jc.compact(jobs_file, run_rows=250, block_rows=100)
+        finally:
+            done.set()
+            thread.join()
+        after = _count(jobs_file)
+        assert after == 300 + 100 * round_no
+        assert set(seen) <= {before, after}